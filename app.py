@@ -4,21 +4,33 @@
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS  # Necesario para permitir la comunicación con el front-end (React)
-from flask import send_file, make_response
+from flask import send_file, make_response, Response
 import io
-from copy import deepcopy
 
 # Importamos nuestros módulos de cálculo
 import well_performance
+import ipr_fitting
 import hydraulic_calculations
 import gas_effects
 import equipment_selection
 import engineering_validation
 import tubing_catalog
+import friction_factor
 import pump_coefficients
 from pump_coefficients import PumpCoefficientError, PumpCoefficientValidationError
 import electrical_calculations
 import surface_design
+import design_inputs
+import monte_carlo
+import scenario_executor
+import calculation_graph
+import design_sessions
+import live_updates
+import sensitivity_batch
+import parameter_sweep
+import production_forecast
+import frequency_optimizer
+from fluid_properties import FluidState
 
 app = Flask(__name__)
 # Configuramos CORS para permitir peticiones desde nuestro front-end
@@ -43,210 +55,474 @@ SCENARIO_CONFIG = {
     }
 }
 
+# Nodos memoizados entre requests (IPR, curvas, bomba, punto de operación,
+# eléctrico): cada request recalcula sólo lo que invalidaron sus cambios
+CALCULATION_GRAPH = calculation_graph.CalculationGraph()
+# Deltas pendientes por sesión para el stream SSE (latest-wins)
+LIVE_CHANNELS = live_updates.LiveChannelRegistry()
+# Sesiones de diseño: payload vigente + nodos propios (LRU/TTL acotado); al
+# cerrarse, expirar o desalojarse una sesión se descarta también su canal
+DESIGN_SESSIONS = design_sessions.SessionStore(on_discard=LIVE_CHANNELS.discard)
+
 @app.route('/api/calculate_conditions', methods=['POST'])
 def calculate_conditions():
     """
     Etapa A: Cálculo de Condiciones.
     Recibe los datos del pozo y calcula el IPR, TDH y curva de demanda de presión.
     """
-    try:
-        payload = request.json or {}
+    return _calculate_conditions(request.json or {}, CALCULATION_GRAPH)
 
-        configuracion_pozo = payload.get('configuracion_pozo') or {}
-        motor_config = payload.get('motor_config') or {}
-        cable_config = payload.get('cable_config') or {}
-        pump_config = payload.get('pump_config') or {}
 
-        raw_well_data = payload.get('well_data')
-        if isinstance(raw_well_data, dict):
-            well_data = deepcopy(raw_well_data)
-        else:
-            well_data = deepcopy(payload)
-            # Eliminar secciones extra agregadas en nueva especificación
-            for section_key in ('configuracion_pozo', 'motor_config', 'cable_config', 'pump_config'):
-                well_data.pop(section_key, None)
-
-        sensitivity_overrides = payload.get('sensitivity_overrides')
-        if sensitivity_overrides is None and isinstance(well_data, dict):
-            sensitivity_overrides = well_data.pop('sensitivity_overrides', {}) or {}
-        else:
-            sensitivity_overrides = sensitivity_overrides or {}
-        
-        # Convertir rugosidad de string a valor numérico
-        if 'tubing_roughness' in well_data:
-            roughness_key = well_data['tubing_roughness']
-            roughness_map = tubing_catalog.get_roughness_options()
-            well_data['tubing_roughness_mm'] = roughness_map.get(roughness_key, 0.046)  # Default: acero nuevo
-        
-        def apply_override(target, override_data):
-            if not isinstance(target, dict) or not isinstance(override_data, dict):
-                return target
+def _compute_conditions(payload, graph):
+    """
+    Cálculo de condiciones sobre un payload completo, reutilizando los nodos
+    ya calculados en ``graph`` (global o de una sesión de diseño).
 
-            q_override = override_data.get('q_test')
-            pwf_override = override_data.get('pwf_test')
+    Returns:
+        dict: Cuerpo de la respuesta de /api/calculate_conditions
+    """
+    configuracion_pozo = payload.get('configuracion_pozo') or {}
+    motor_config = payload.get('motor_config') or {}
+    cable_config = payload.get('cable_config') or {}
+    pump_config = payload.get('pump_config') or {}
+
+    raw_well_data = payload.get('well_data')
+    if isinstance(raw_well_data, dict):
+        well_data = dict(raw_well_data)
+    else:
+        well_data = dict(payload)
+        # Eliminar secciones extra agregadas en nueva especificación
+        for section_key in ('configuracion_pozo', 'motor_config', 'cable_config', 'pump_config'):
+            well_data.pop(section_key, None)
+
+    sensitivity_overrides = payload.get('sensitivity_overrides')
+    if sensitivity_overrides is None and isinstance(well_data, dict):
+        sensitivity_overrides = well_data.pop('sensitivity_overrides', {}) or {}
+    else:
+        sensitivity_overrides = sensitivity_overrides or {}
+    
+    # Convertir rugosidad de string a valor numérico
+    if 'tubing_roughness' in well_data:
+        roughness_key = well_data['tubing_roughness']
+        roughness_map = tubing_catalog.get_roughness_options()
+        well_data['tubing_roughness_mm'] = roughness_map.get(roughness_key, 0.046)  # Default: acero nuevo
+    
+    def apply_override(target, override_data):
+        if not isinstance(target, dict) or not isinstance(override_data, dict):
+            return target
 
-            if q_override is not None:
-                target['q_test'] = q_override
-            if pwf_override is not None:
-                target['pwf_test'] = pwf_override
+        q_override = override_data.get('q_test')
+        pwf_override = override_data.get('pwf_test')
+
+        if q_override is not None:
+            target['q_test'] = q_override
+        if pwf_override is not None:
+            target['pwf_test'] = pwf_override
+
+        method = str(target.get('method', '')).lower()
+        if method == 'linear':
+            try:
+                pr_value = float(target.get('presion_reservorio'))
+            except (TypeError, ValueError):
+                pr_value = None
 
-            method = str(target.get('method', '')).lower()
-            if method == 'linear':
+            def to_float(value):
                 try:
-                    pr_value = float(target.get('presion_reservorio'))
+                    return float(value)
                 except (TypeError, ValueError):
-                    pr_value = None
-
-                def to_float(value):
-                    try:
-                        return float(value)
-                    except (TypeError, ValueError):
-                        return None
-
-                q_value = to_float(target.get('q_test'))
-                pwf_value = to_float(target.get('pwf_test'))
-
-                if (
-                    pr_value is not None
-                    and q_value is not None
-                    and pwf_value is not None
-                ):
-                    delta_p = pr_value - pwf_value
-                    if delta_p > 0:
-                        target['pi'] = q_value / delta_p
+                    return None
 
-            return target
+            q_value = to_float(target.get('q_test'))
+            pwf_value = to_float(target.get('pwf_test'))
 
-        def parse_frequency(value, default=None):
-            try:
-                freq = float(value)
-                return freq if freq > 0 else default
-            except (TypeError, ValueError):
-                return default
+            if (
+                pr_value is not None
+                and q_value is not None
+                and pwf_value is not None
+            ):
+                delta_p = pr_value - pwf_value
+                if delta_p > 0:
+                    target['pi'] = q_value / delta_p
 
-        # 1. Calcular IPR (Aporte del pozo)
-        base_well_data = deepcopy(well_data)
+        return target
 
-        ipr_base = well_performance.calculate_ipr(deepcopy(base_well_data))
-        
-        # 2. Calcular TDH (Carga Dinámica Total)
-        system_head_curve = hydraulic_calculations.calculate_system_head_curve(deepcopy(base_well_data))
-
-        # 3. Calcular curva de demanda de presión (Presión vs Caudal)
-        # Pasamos el IPR para usar la presión de intake real en cada caudal
-        pressure_demand_curve = hydraulic_calculations.calculate_pressure_demand_curve(
-            deepcopy(base_well_data),
-            ipr_base
+    def parse_frequency(value, default=None):
+        try:
+            freq = float(value)
+            return freq if freq > 0 else default
+        except (TypeError, ValueError):
+            return default
+
+    # 1. Calcular IPR (Aporte del pozo)
+    # Entradas parseadas y validadas una sola vez (modelo inmutable): las
+    # etapas leen atributos tipados y comparten resultados sin copias
+    base_well_data = design_inputs.WellInput.from_mapping(well_data)
+    # Propiedades del fluido: una sola vez para todo el request
+    base_fluid_state = FluidState.from_well_data(base_well_data)
+
+    # Historial de pruebas (opcional): IPR ajustado por mínimos cuadrados
+    ipr_model = ipr_fitting.model_from_well_data(base_well_data)
+
+    base_freq_hz = parse_frequency(pump_config.get('frequency_hz'), 50.0)
+    motor_id_selected = motor_config.get('motor_id')
+    equipment = {
+        'pump_config': pump_config,
+        'motor_config': motor_config,
+        'cable_config': cable_config,
+        'configuracion_pozo': configuracion_pozo,
+        'motor_id': motor_id_selected,
+        'installation': design_inputs.InstallationInput.from_configs(
+            pump_config, motor_config, cable_config, configuracion_pozo
         )
-        
-        # DEBUG: Imprimir primeros 3 puntos de la curva de demanda
-        print("\n" + "="*80)
-        print("DEBUG API - CURVA DE DEMANDA (primeros 3 puntos enviados al frontend):")
-        print("="*80)
-        for i, point in enumerate(pressure_demand_curve['curve'][:3]):
-            print(f"Punto {i}: Q={point['caudal']:.1f} m3/d, TDH={point['tdh']:.2f} m, PIP={point['pip']:.2f} bar, Nivel={point.get('nivel', 'N/A')}")
-        print("="*80 + "\n")
-
-        base_freq_hz = parse_frequency(pump_config.get('frequency_hz'), 50.0)
-        motor_id_selected = motor_config.get('motor_id')
-        electrical_base = electrical_calculations.calculate_electrical_summary(
-            well_data=deepcopy(base_well_data),
-            pressure_curve=pressure_demand_curve,
-            pump_config=pump_config,
-            motor_config=motor_config,
-            cable_config=cable_config,
-            configuracion_pozo=configuracion_pozo,
-            freq_hz=base_freq_hz or 50.0,
-            motor_id=motor_id_selected
+    }
+
+    # Caso base: IPR, TDH (misma malla de caudales que el IPR), curva de
+    # demanda (PIP real de cada caudal) y resumen eléctrico
+    tasks = [scenario_executor.ScenarioTask(
+        key='base',
+        well_data=base_well_data,
+        fluid_state=base_fluid_state,
+        freq_hz=base_freq_hz or 50.0,
+        ipr_model=ipr_model,
+        include_system_head=True,
+        **equipment
+    )]
+
+    # 4. Construir escenarios de sensibilidad (optimista / conservador / pesimista)
+    scenario_definitions = {}
+    for key in SCENARIO_ORDER:
+        config = SCENARIO_CONFIG.get(key, {})
+        scenario_definitions[key] = {
+            'label': config.get('label', key.title()),
+            'description': config.get('description'),
+            'color': config.get('color')
+        }
+
+        override_data = sensitivity_overrides.get(key, {}) or {}
+
+        if override_data:
+            scenario_definitions[key]['overrides'] = {
+                k: override_data.get(k)
+                for k in ('q_test', 'pwf_test', 'frequency_hz')
+                if override_data.get(k) is not None
+            }
+        has_ipr_override = any(
+            override_data.get(field) is not None for field in ('q_test', 'pwf_test')
         )
 
-        # 4. Construir escenarios de sensibilidad (optimista / conservador / pesimista)
+        if has_ipr_override:
+            scenario_input = design_inputs.WellInput.from_mapping(
+                apply_override(dict(base_well_data), override_data)
+            )
+            scenario_fluid_state = FluidState.from_well_data(scenario_input)
+            scenario_model = None
+        else:
+            scenario_input = base_well_data
+            scenario_fluid_state = base_fluid_state
+            scenario_model = ipr_model
+
+        scenario_freq = parse_frequency(override_data.get('frequency_hz'), base_freq_hz)
+        tasks.append(scenario_executor.ScenarioTask(
+            key=key,
+            well_data=scenario_input,
+            fluid_state=scenario_fluid_state,
+            freq_hz=scenario_freq or base_freq_hz or 50.0,
+            ipr_model=scenario_model,
+            **equipment
+        ))
+
+    # Escenarios independientes: las etapas con entradas idénticas (hash de
+    # contenido, incluida la frecuencia) se calculan una vez y se comparten,
+    # también entre requests; el resto se evalúa en paralelo y se combina
+    # en SCENARIO_ORDER
+    results = scenario_executor.run_scenarios(tasks, graph=graph)
+
+    base_result = results['base']
+    ipr_base = base_result['ipr']
+    system_head_curve = base_result['system_head_curve']
+    pressure_demand_curve = base_result['pressure_demand_curve']
+    electrical_base = base_result['electrical_data']
+    
+    # DEBUG: Imprimir primeros 3 puntos de la curva de demanda
+    print("\n" + "="*80)
+    print("DEBUG API - CURVA DE DEMANDA (primeros 3 puntos enviados al frontend):")
+    print("="*80)
+    for i, point in enumerate(pressure_demand_curve['curve'][:3]):
+        print(f"Punto {i}: Q={point['caudal']:.1f} m3/d, TDH={point['tdh']:.2f} m, PIP={point['pip']:.2f} bar, Nivel={point.get('nivel', 'N/A')}")
+    print("="*80 + "\n")
+
+    ipr_scenarios = {}
+    pressure_demand_scenarios = {}
+    scenario_electrical = {}
+
+    if ipr_base:
+        for key in SCENARIO_ORDER:
+            scenario_result = results[key]
+            ipr_scenarios[key] = {
+                'ipr': scenario_result['ipr'],
+                'pressure_demand_curve': scenario_result['pressure_demand_curve'],
+                'electrical_data': scenario_result['electrical_data']
+            }
+            pressure_demand_scenarios[key] = scenario_result['pressure_demand_curve']
+            scenario_electrical[key] = scenario_result['electrical_data']
+    else:
         scenario_definitions = {}
-        ipr_scenarios = {}
-        pressure_demand_scenarios = {}
-        scenario_electrical = {}
-
-        if ipr_base:
-            for key in SCENARIO_ORDER:
-                config = SCENARIO_CONFIG.get(key, {})
-                scenario_definitions[key] = {
-                    'label': config.get('label', key.title()),
-                    'description': config.get('description'),
-                    'color': config.get('color')
-                }
-
-                override_data = sensitivity_overrides.get(key, {}) or {}
-
-                if override_data:
-                    scenario_definitions[key]['overrides'] = {
-                        k: override_data.get(k)
-                        for k in ('q_test', 'pwf_test', 'frequency_hz')
-                        if override_data.get(k) is not None
-                    }
-                has_ipr_override = any(
-                    override_data.get(field) is not None for field in ('q_test', 'pwf_test')
-                )
-
-                scenario_well_data = base_well_data
-                if has_ipr_override:
-                    scenario_input = deepcopy(base_well_data)
-                    apply_override(scenario_input, override_data)
-                    scenario_ipr = well_performance.calculate_ipr(deepcopy(scenario_input))
-                    scenario_pressure_demand = hydraulic_calculations.calculate_pressure_demand_curve(
-                        deepcopy(scenario_input),
-                        scenario_ipr
-                    )
-                    scenario_well_data = scenario_input
-                else:
-                    scenario_ipr = deepcopy(ipr_base)
-                    scenario_pressure_demand = deepcopy(pressure_demand_curve)
-
-                scenario_freq = parse_frequency(override_data.get('frequency_hz'), base_freq_hz)
-                scenario_electrical_data = electrical_calculations.calculate_electrical_summary(
-                    well_data=deepcopy(scenario_well_data),
-                    pressure_curve=scenario_pressure_demand,
-                    pump_config=pump_config,
-                    motor_config=motor_config,
-                    cable_config=cable_config,
-                    configuracion_pozo=configuracion_pozo,
-                    freq_hz=scenario_freq or base_freq_hz or 50.0,
-                    motor_id=motor_id_selected
-                )
-
-                ipr_scenarios[key] = {
-                    'ipr': scenario_ipr,
-                    'pressure_demand_curve': scenario_pressure_demand,
-                    'electrical_data': scenario_electrical_data
-                }
-                pressure_demand_scenarios[key] = scenario_pressure_demand
-                scenario_electrical[key] = scenario_electrical_data
-
-        # 5. Aplicar correcciones por gas si es necesario
-        gas_corrections = gas_effects.get_gas_corrections(well_data)
 
-        return jsonify({
-            "success": True,
-            "ipr_data": ipr_base,
-            "system_head_curve": system_head_curve,
-            "pressure_demand_curve": pressure_demand_curve,
-            "electrical_data": electrical_base,
-            "gas_corrections": gas_corrections,
-            "ipr_scenarios": ipr_scenarios,
-            "pressure_demand_scenarios": pressure_demand_scenarios,
-            "electrical_scenarios": scenario_electrical,
-            "scenario_definitions": scenario_definitions,
-            "scenario_order": SCENARIO_ORDER
-        }), 200
+    # 5. Aplicar correcciones por gas si es necesario
+    gas_corrections = gas_effects.get_gas_corrections(well_data)
+
+    return {
+        "success": True,
+        "ipr_data": ipr_base,
+        "system_head_curve": system_head_curve,
+        "pressure_demand_curve": pressure_demand_curve,
+        "electrical_data": electrical_base,
+        "gas_corrections": gas_corrections,
+        "ipr_scenarios": ipr_scenarios,
+        "pressure_demand_scenarios": pressure_demand_scenarios,
+        "electrical_scenarios": scenario_electrical,
+        "scenario_definitions": scenario_definitions,
+        "scenario_order": SCENARIO_ORDER,
+        "recalculated_nodes": {key: result['recalculated'] for key, result in results.items()}
+    }
 
+
+def _calculate_conditions(payload, graph, session_id=None):
+    """Respuesta HTTP de ``_compute_conditions`` (errores de entrada → 400)."""
+    try:
+        response = _compute_conditions(payload, graph)
+        if session_id is not None:
+            response["session_id"] = session_id
+        return jsonify(response), 200
+
+    except (ipr_fitting.IPRFittingError, design_inputs.DesignInputError) as exc:
+        return jsonify({"success": False, "error": str(exc)}), 400
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/design_sessions', methods=['POST'])
+def create_design_session():
+    """
+    Crea una sesión de diseño con el payload completo de calculate_conditions
+    y devuelve el resultado junto con el 'session_id'.
+    """
+    session = DESIGN_SESSIONS.create(request.json or {})
+    return _calculate_conditions(session.payload, session.graph, session.session_id)
+
+
+@app.route('/api/design_sessions/<session_id>', methods=['PATCH'])
+def update_design_session(session_id):
+    """
+    Aplica sólo los campos modificados (JSON merge patch; null elimina) y
+    recalcula reutilizando las etapas cacheadas de la sesión.
+    """
+    try:
+        session = DESIGN_SESSIONS.update(session_id, request.json or {})
+    except design_sessions.SessionNotFoundError:
+        return jsonify({"success": False, "error": "Sesión inexistente o expirada."}), 404
+    return _calculate_conditions(session.payload, session.graph, session.session_id)
+
+
+@app.route('/api/design_sessions/<session_id>', methods=['DELETE'])
+def close_design_session(session_id):
+    """Cierra la sesión y libera sus resultados intermedios."""
+    if not DESIGN_SESSIONS.close(session_id):
+        return jsonify({"success": False, "error": "Sesión inexistente o expirada."}), 404
+    return jsonify({"success": True}), 200
+
+
+@app.route('/api/design_sessions/<session_id>/deltas', methods=['POST'])
+def push_design_delta(session_id):
+    """
+    Encola un cambio de parámetros para el stream en vivo de la sesión.
+    Responde de inmediato; los deltas que llegan durante un cálculo se combinan.
+    """
+    try:
+        DESIGN_SESSIONS.get(session_id)
+    except design_sessions.SessionNotFoundError:
+        return jsonify({"success": False, "error": "Sesión inexistente o expirada."}), 404
+    version = LIVE_CHANNELS.get(session_id).push(request.json or {})
+    return jsonify({"success": True, "version": version}), 202
+
+
+@app.route('/api/design_sessions/<session_id>/stream', methods=['GET'])
+def stream_design_session(session_id):
+    """
+    Stream SSE con el punto de operación y el resumen eléctrico actualizados.
+    Un solo stream por sesión: un segundo stream concurrente recibe 409.
+    """
+    try:
+        DESIGN_SESSIONS.get(session_id)
+    except design_sessions.SessionNotFoundError:
+        return jsonify({"success": False, "error": "Sesión inexistente o expirada."}), 404
+    channel = LIVE_CHANNELS.get(session_id)
+    token = channel.attach()
+    if token is None:
+        return jsonify({"success": False, "error": "La sesión ya tiene un stream conectado."}), 409
+    events = live_updates.stream_updates(DESIGN_SESSIONS, session_id, channel, _compute_conditions)
+    response = Response(events, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Se libera al cerrar la respuesta, aunque el cliente corte antes de iterar
+    response.call_on_close(lambda: channel.detach(token))
+    return response
+
+
+@app.route('/api/design_sessions/stats', methods=['GET'])
+def design_session_stats():
+    """Ocupación del store de sesiones y estadísticas de desalojo."""
+    return jsonify({"success": True, "stats": DESIGN_SESSIONS.stats()}), 200
+
+
+def _parse_analysis_payload(payload):
+    """
+    Entradas comunes de los análisis por lotes: ``well_data`` validado (con la
+    rugosidad de tubing resuelta), configuraciones de equipo y frecuencia.
+
+    Returns:
+        tuple: (well_input, pump_config, motor_config, cable_config,
+                configuracion_pozo, freq_hz)
+    """
+    well_data = dict(payload.get('well_data') or {})
+    pump_config = payload.get('pump_config') or {}
+
+    if 'tubing_roughness' in well_data:
+        roughness_map = tubing_catalog.get_roughness_options()
+        well_data['tubing_roughness_mm'] = roughness_map.get(well_data['tubing_roughness'], 0.046)
+
+    try:
+        freq_hz = float(payload.get('frequency_hz') or pump_config.get('frequency_hz') or 50.0)
+    except (TypeError, ValueError):
+        freq_hz = 50.0
+
+    return (
+        design_inputs.WellInput.from_mapping(well_data),
+        pump_config,
+        payload.get('motor_config') or {},
+        payload.get('cable_config') or {},
+        payload.get('configuracion_pozo') or {},
+        freq_hz
+    )
+
+
+def _analysis_response(compute, validation_error):
+    """Respuesta JSON de un análisis: 400 si la entrada es inválida, 500 ante cualquier otro error."""
+    try:
+        return jsonify({"success": True, "result": compute()}), 200
+    except (validation_error, design_inputs.DesignInputError) as exc:
+        return jsonify({"success": False, "error": str(exc)}), 400
+    except Exception as exc:
+        return jsonify({"success": False, "error": str(exc)}), 500
+
+
+@app.route('/api/monte_carlo', methods=['POST'])
+def monte_carlo_analysis():
+    """
+    Análisis probabilístico del punto de operación (P10/P50/P90 de caudal,
+    potencia de superficie y carga de motor).
+    """
+    def compute():
+        payload = request.json or {}
+        *inputs, freq_hz = _parse_analysis_payload(payload)
+        return monte_carlo.run_monte_carlo(
+            *inputs,
+            payload.get('distribuciones') or {},
+            n_realizations=payload.get('n_realizaciones', monte_carlo.DEFAULT_REALIZATIONS),
+            freq_hz=freq_hz,
+            seed=payload.get('semilla')
+        )
+
+    return _analysis_response(compute, monte_carlo.MonteCarloError)
+
+
+@app.route('/api/sensitivity', methods=['POST'])
+def sensitivity_analysis():
+    """
+    Sensibilidades de N escenarios (tornado / spider) evaluadas por lotes.
+    Devuelve una tabla compacta con el punto de operación de cada escenario.
+    """
+    def compute():
+        payload = request.json or {}
+        *inputs, freq_hz = _parse_analysis_payload(payload)
+        return sensitivity_batch.run_sensitivity(
+            *inputs,
+            {key: payload.get(key) for key in ('escenarios', 'tornado', 'spider')},
+            freq_hz=freq_hz,
+            salida=payload.get('salida') or 'q_m3d'
+        )
+
+    return _analysis_response(compute, sensitivity_batch.SensitivityError)
+
+
+@app.route('/api/parameter_sweep', methods=['POST'])
+def parameter_sweep_analysis():
+    """
+    Barrido 2-D de dos parámetros (mapas de calor de caudal, potencia de
+    superficie y carga de motor) evaluado por lotes sobre la grilla completa.
+    """
+    def compute():
+        payload = request.json or {}
+        *inputs, freq_hz = _parse_analysis_payload(payload)
+        return parameter_sweep.run_sweep(
+            *inputs,
+            payload.get('eje_x'),
+            payload.get('eje_y'),
+            freq_hz=freq_hz,
+            salidas=payload.get('salidas')
+        )
+
+    return _analysis_response(compute, parameter_sweep.SweepError)
+
+
+@app.route('/api/production_forecast', methods=['POST'])
+def production_forecast_analysis():
+    """
+    Pronóstico mensual de producción, energía (kWh) y costo con declinación
+    de presión de reservorio y corte de agua, a frecuencia fija o con VSD.
+    """
+    def compute():
+        payload = request.json or {}
+        *inputs, freq_hz = _parse_analysis_payload(payload)
+        return production_forecast.run_forecast(
+            *inputs,
+            {key: payload.get(key) for key in (
+                'meses', 'paso_meses', 'declinacion', 'control', 'tarifa_kwh', 'disponibilidad'
+            )},
+            freq_hz=freq_hz
+        )
+
+    return _analysis_response(compute, production_forecast.ForecastError)
+
+
+@app.route('/api/frequency_optimizer', methods=['POST'])
+def frequency_optimizer_analysis():
+    """
+    Frecuencia (o programa de frecuencias) que minimiza kWh/m³ cumpliendo el
+    caudal requerido, el rango operativo de la bomba y la carga de motor.
+    """
+    def compute():
+        payload = request.json or {}
+        *inputs, _ = _parse_analysis_payload(payload)
+        return frequency_optimizer.run_optimizer(
+            *inputs,
+            {key: payload.get(key) for key in (
+                'periodos', 'caudal_requerido', 'duracion_dias', 'freq_min', 'freq_max', 'carga_motor_max'
+            )}
+        )
+
+    return _analysis_response(compute, frequency_optimizer.FrequencyOptimizationError)
+
+
 @app.route('/api/surface-design', methods=['POST'])
 def calculate_surface_design():
     """Calcula el diseño estático de equipos de superficie (TAP / VSD)."""
     try:
         payload = request.json or {}
+        catalogo = payload.get('catalogo_equipos')
+        if isinstance(catalogo, dict):
+            payload = dict(payload, catalogo_equipos=_resolve_surface_equipment(catalogo))
         result = surface_design.calcular_diseno_superficie(payload)
         return jsonify({"success": True, "result": result}), 200
     except surface_design.SurfaceDesignError as exc:
@@ -254,6 +530,48 @@ def calculate_surface_design():
     except Exception as exc:
         return jsonify({"success": False, "error": str(exc)}), 500
 
+
+def _resolve_surface_equipment(catalogo):
+    """Completa las entradas de catalogo_equipos que sólo indican 'id' con el catálogo de superficie."""
+    resolved = dict(catalogo)
+    for key, tipo in (('transformador', 'transformadores'), ('filtro_lc', 'filtros_lc'), ('vsd', 'vsds')):
+        entry = catalogo.get(key)
+        if not isinstance(entry, dict) or not entry.get('id'):
+            continue
+        specs = equipment_selection.get_surface_equipment_specs(tipo, entry['id'])
+        if specs is None:
+            raise surface_design.SurfaceDesignError(f"Equipo '{entry['id']}' no encontrado en '{tipo}'.")
+        resolved[key] = {**specs, **entry}
+    return resolved
+
+
+@app.route('/api/surface-design/ranking', methods=['POST'])
+def rank_surface_design():
+    """
+    Evalúa todas las combinaciones transformador × filtro LC × VSD del
+    catálogo de superficie y devuelve la lista corta de combinaciones factibles.
+    """
+    try:
+        payload = request.json or {}
+        catalogo = payload.get('catalogo_superficie') or equipment_selection.get_surface_equipment_catalog()
+        try:
+            max_resultados = int(payload.get('max_resultados') or surface_design.DEFAULT_MAX_RESULTADOS)
+        except (TypeError, ValueError):
+            max_resultados = surface_design.DEFAULT_MAX_RESULTADOS
+        result = surface_design.rankear_equipos_superficie(
+            payload,
+            catalogo,
+            max_resultados=max_resultados,
+            margen_kva_porc=payload.get('margen_kva_porc') or 0.0
+        )
+        return jsonify({"success": True, "result": result}), 200
+    except surface_design.SurfaceDesignError as exc:
+        return jsonify({"success": False, "error": str(exc)}), 400
+    except FileNotFoundError as exc:
+        return jsonify({"success": False, "error": str(exc)}), 404
+    except Exception as exc:
+        return jsonify({"success": False, "error": str(exc)}), 500
+
 @app.route('/api/validate_design', methods=['POST'])
 def validate_design():
     """
@@ -266,22 +584,20 @@ def validate_design():
         well_data = data.get('well_data')
         selected_equipment = data.get('selected_equipment') # IDs de bomba, motor, cable, etc.
 
-        # 1. Validar el diseño completo
+        # 1. Validar el diseño completo (curvas y registros se calculan una vez por request)
+        context = engineering_validation.ValidationContext()
         validation_results = engineering_validation.validate_full_design(
             well_data, 
-            selected_equipment
+            selected_equipment,
+            context
         )
 
         # 2. Obtener curvas de rendimiento del equipo seleccionado
-        pump_curves = equipment_selection.get_pump_performance_curves(
-            selected_equipment.get('pump_id')
-        )
+        pump_curves = context.pump_curves(selected_equipment.get('pump_id'))
         if isinstance(pump_curves, dict) and 'error' in pump_curves:
             return jsonify({"success": False, "error": pump_curves['error']}), 404
 
-        motor_curves = equipment_selection.get_motor_performance_curves(
-            selected_equipment.get('motor_id')
-        )
+        motor_curves = context.motor_curves(selected_equipment.get('motor_id'))
         if isinstance(motor_curves, dict) and 'error' in motor_curves:
             return jsonify({"success": False, "error": motor_curves['error']}), 404
 
@@ -435,6 +751,17 @@ def get_power_cable_catalog():
         return jsonify({"success": False, "error": str(exc)}), 500
 
 
+@app.route('/api/catalogos/superficie', methods=['GET'])
+def get_surface_equipment_catalog():
+    """Devuelve el catálogo de transformadores, filtros LC y VSDs."""
+    try:
+        return jsonify(equipment_selection.get_surface_equipment_catalog()), 200
+    except FileNotFoundError as exc:
+        return jsonify({"success": False, "error": str(exc)}), 404
+    except Exception as exc:
+        return jsonify({"success": False, "error": str(exc)}), 500
+
+
 @app.route('/api/tubing-catalog', methods=['GET'])
 def get_tubing_catalog():
     """
@@ -507,6 +834,8 @@ if __name__ == '__main__':
     # Cargamos los catálogos en memoria al iniciar la app
     equipment_selection.load_catalogs()
     print("Catálogos de equipos cargados.")
+    # Tablas de fricción (Colebrook) para todas las combinaciones tubing/rugosidad del catálogo
+    friction_factor.precompute_catalog_tables()
     # Ejecutamos la app en modo debug (para desarrollo)
     app.run(debug=True, port=5000)
 
@@ -0,0 +1,351 @@
+"""Evaluación por lotes de la cadena IPR → demanda → punto de operación → eléctrico.
+
+Evalúa R realizaciones (combinaciones de parámetros de pozo y frecuencia) a
+la vez sobre matrices (realizaciones × puntos de caudal). Los catálogos se
+resuelven una sola vez en ``BatchContext`` (picklable), de modo que los
+lotes pueden repartirse entre procesos sin que cada worker cargue catálogos.
+
+Simplificaciones frente a ``calculate_conditions``:
+- La curva de bomba se evalúa directamente con el polinomio (leyes de
+  afinidad) en lugar de la tabla de 21 puntos.
+- La demanda usa el modelo de tubing único (sin survey ni multifásico).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+import equipment_selection
+import hydraulic_calculations
+from design_inputs import InstallationInput, WellInput
+from electrical_calculations import ElectricalComputationError, calculate_electrical_arrays
+from fluid_properties import FluidState
+from well_performance import resolve_ipr_model, resolve_ipr_model_batch
+
+# Parámetros de instalación / fluido que pueden variar por realización sin
+# cambiar bomba, motor, cable ni tubing
+INSTALLATION_PARAMETERS = (
+    'presion_superficie',
+    'presion_casing',
+    'viscosidad',
+    'gravedad_especifica_agua',
+)
+
+# Parámetros del pozo que pueden variar por realización
+BATCH_PARAMETERS = (
+    'presion_reservorio',
+    'pi',
+    'q_test',
+    'pwf_test',
+    'presion_burbuja',
+    'n_exponent',
+    'agua_porcentaje',
+    'grado_api',
+) + INSTALLATION_PARAMETERS
+
+DEFAULT_BATCH_POINTS = 50
+# Refinamiento del cruce bomba-demanda sobre la inversa cerrada del IPR
+REFINE_ITERATIONS = 12
+CROSSING_TOLERANCE_M3D = 1e-6
+
+
+# Defaults de la hidráulica para las claves que el pozo no informa
+_WELL_DEFAULTS = WellInput.from_mapping({})
+
+
+class BatchEvaluationError(ValueError):
+    """Error de configuración para la evaluación por lotes."""
+
+
+@dataclass(frozen=True)
+class BatchContext:
+    """Datos fijos del diseño (equipo, cable, instalación) para todo el lote."""
+
+    well_data: Mapping[str, Any]
+    pump: equipment_selection.PumpModel
+    stages: int
+    motor_id: str
+    motor_specs: Mapping[str, Any]
+    installation: InstallationInput
+    profundidad_intake: float
+    n_points: int = DEFAULT_BATCH_POINTS
+
+
+def build_batch_context(
+    well_data: Dict[str, Any],
+    pump_config: Dict[str, Any],
+    motor_config: Dict[str, Any],
+    cable_config: Dict[str, Any],
+    configuracion_pozo: Dict[str, Any],
+    n_points: Optional[int] = None
+) -> BatchContext:
+    """Resuelve bomba, motor y cables una sola vez para el lote."""
+    if well_data.get('survey') or well_data.get('tubing_string'):
+        raise BatchEvaluationError('La evaluación por lotes no soporta survey/tubing_string; use el cálculo puntual.')
+    if str(well_data.get('modelo_flujo') or 'monofasico').lower() != 'monofasico':
+        raise BatchEvaluationError('La evaluación por lotes sólo soporta flujo monofásico en el tubing.')
+
+    pump_id = pump_config.get('pump_id')
+    if not pump_id:
+        raise BatchEvaluationError('No se proporcionó pump_id.')
+    pump = equipment_selection.get_pump_model(pump_id)
+    if pump is None:
+        raise BatchEvaluationError(f"Bomba con id '{pump_id}' no encontrada.")
+
+    try:
+        stages = int(pump_config.get('stages') or pump_config.get('stages_count') or 0)
+    except (TypeError, ValueError):
+        stages = 0
+    if stages <= 0:
+        raise BatchEvaluationError('La cantidad de etapas debe ser mayor a cero.')
+
+    motor_id = motor_config.get('motor_id')
+    motor_specs = equipment_selection.get_motor_specs(motor_id) if motor_id else None
+    if not motor_specs:
+        raise BatchEvaluationError('Motor no encontrado en catálogo.')
+
+    profundidad_intake = float(well_data.get('profundidad_intake') or 0.0)
+    installation = InstallationInput.from_configs(pump_config, motor_config, cable_config, configuracion_pozo)
+    try:
+        # Valida datos de placa y cables (resistencias) antes de evaluar el lote
+        calculate_electrical_arrays(motor_specs, installation, 0.0, 50.0, profundidad_intake)
+    except ElectricalComputationError as exc:
+        raise BatchEvaluationError(str(exc)) from exc
+
+    return BatchContext(
+        well_data=dict(well_data),
+        pump=pump,
+        stages=stages,
+        motor_id=str(motor_id),
+        motor_specs=dict(motor_specs),
+        installation=installation,
+        profundidad_intake=profundidad_intake,
+        n_points=int(n_points or well_data.get('n_points') or DEFAULT_BATCH_POINTS)
+    )
+
+
+def _column(values: Mapping[str, Any], well_data: Mapping[str, Any], key: str, default, size: int) -> np.ndarray:
+    fallback = well_data.get(key)
+    if fallback is None:
+        fallback = np.nan if default is None else default
+    value = values.get(key)
+    if value is None:
+        value = fallback
+    column = np.broadcast_to(np.asarray(value, dtype=float), (size,)).reshape(size, 1)
+    # NaN en una fila = sin valor propio (p. ej. otro escenario del lote sobrescribe la clave)
+    return np.where(np.isnan(column), np.asarray(fallback, dtype=float), column)
+
+
+def override_samples(rows: Sequence[Mapping[str, float]]) -> Dict[str, np.ndarray]:
+    """
+    Arreglos por fila de las claves que alguna fila sobrescribe. Las filas que
+    no sobrescriben una clave quedan en NaN y toman el valor del pozo (o el
+    default) al evaluar el lote.
+    """
+    keys = sorted({key for row in rows for key in row})
+    return {
+        key: np.array([np.nan if row.get(key) is None else float(row[key]) for row in rows])
+        for key in keys
+    }
+
+
+def _sampled(samples: Mapping[str, Any], key: str, size: int) -> np.ndarray:
+    """Máscara (R, 1) de las filas con un valor propio de ``key`` en las muestras."""
+    value = samples.get(key)
+    if value is None:
+        return np.zeros((size, 1), dtype=bool)
+    return np.isfinite(np.broadcast_to(np.asarray(value, dtype=float), (size,)).reshape(size, 1))
+
+
+def _darcy_pi(well_data: Mapping[str, Any], viscosidad: np.ndarray) -> np.ndarray:
+    """J de Darcy por realización (una resolución del IPR puntual por viscosidad distinta)."""
+    values, rows = np.unique(viscosidad, return_inverse=True)
+    pis = np.array([resolve_ipr_model(dict(well_data, viscosidad=mu), 'darcy').j for mu in values])
+    return pis[rows].reshape(viscosidad.shape)
+
+
+def _first_crossing(diff: np.ndarray):
+    """Primer cruce bomba-demanda por fila (mismo criterio que `_find_operating_point`)."""
+    d1 = diff[:, :-1]
+    d2 = diff[:, 1:]
+    crossing = (d1 == 0) | (d1 * d2 < 0)
+    found = crossing.any(axis=1)
+    idx = np.argmax(crossing, axis=1)
+    return found, idx
+
+
+def _refine_crossing(residual, q1, q2, d1, d2, iterations=REFINE_ITERATIONS):
+    """
+    Refina el cruce dentro del intervalo [q1, q2] por falsa posición (Illinois).
+
+    ``residual(q)`` devuelve cabeza de bomba menos demanda en caudales
+    arbitrarios. Las filas sin cambio de signo devuelven q1 (el llamador las
+    descarta con la máscara 'found').
+    """
+    q_low, q_high, f_low, f_high = q1, q2, d1, d2
+    q_root = q1
+    active = (f_low * f_high) < 0
+
+    for _ in range(iterations):
+        if not active.any():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            q_new = q_low - f_low * (q_high - q_low) / (f_high - f_low)
+        q_new = np.where(active, q_new, q_root)
+        f_new = residual(q_new)
+        q_root = np.where(active, q_new, q_root)
+
+        keep_high = active & (f_new * f_low > 0)
+        keep_low = active & (f_new * f_low < 0)
+        # Illinois: el extremo que se conserva reduce su residuo a la mitad
+        q_low, f_low = np.where(keep_high, q_new, q_low), np.where(keep_high, f_new, np.where(keep_low, f_low * 0.5, f_low))
+        q_high, f_high = np.where(keep_low, q_new, q_high), np.where(keep_low, f_new, np.where(keep_high, f_high * 0.5, f_high))
+        active = (keep_high | keep_low) & (np.abs(q_high - q_low) > CROSSING_TOLERANCE_M3D)
+
+    return q_root
+
+
+def batch_operating_points(context: BatchContext, samples: Mapping[str, Any], freq_hz) -> Dict[str, np.ndarray]:
+    """
+    Punto de operación por realización.
+
+    Args:
+        context: Datos fijos del diseño (`build_batch_context`)
+        samples: Arreglos de longitud R para cualquiera de BATCH_PARAMETERS
+                 y 'stages' (los no informados se toman de well_data / contexto)
+        freq_hz: Frecuencia escalar o arreglo de longitud R
+
+    Returns:
+        dict: Arreglos (R,) 'q_m3d', 'head_m', 'pump_bhp_hp', 'pip_bar',
+              'pwf_bar', 'freq_hz' y máscara 'found'
+    """
+    well_data = context.well_data
+    sizes = [np.size(v) for v in samples.values() if v is not None] + [np.size(freq_hz)]
+    size = max(sizes) if sizes else 1
+
+    pr = _column(samples, well_data, 'presion_reservorio', 150, size)
+    agua = _column(samples, well_data, 'agua_porcentaje', 0, size)
+    api = _column(samples, well_data, 'grado_api', 30, size)
+    freq = np.broadcast_to(np.asarray(freq_hz, dtype=float), (size,)).reshape(size, 1)
+    stages = _column(samples, {}, 'stages', context.stages, size)
+    viscosidad = _column(samples, well_data, 'viscosidad', 1.0, size)
+
+    # Un IP muestreado reemplaza al derivado de la prueba (salvo que la fila
+    # también informe q_test) y al de Darcy
+    sampled_pi = _sampled(samples, 'pi', size)
+    without_test = sampled_pi & ~_sampled(samples, 'q_test', size)
+    pi = _column(samples, well_data, 'pi', 5.0, size)
+
+    method = str(well_data.get('method', 'linear')).lower()
+    if method == 'darcy':
+        pi = np.where(sampled_pi, pi, _darcy_pi(well_data, viscosidad))
+        method = 'linear'
+
+    pb_default = None if method != 'vogel' else well_data.get('presion_burbuja')
+    pb = _column(samples, well_data, 'presion_burbuja', pb_default, size)
+    pb = np.where(np.isnan(pb), pr * 0.8, pb)
+
+    model = resolve_ipr_model_batch(
+        method,
+        pr,
+        pi,
+        pb=pb,
+        q_test=np.where(without_test, np.nan, _column(samples, well_data, 'q_test', None, size)),
+        pwf_test=np.where(without_test, np.nan, _column(samples, well_data, 'pwf_test', None, size)),
+        n_exponent=_column(samples, well_data, 'n_exponent', 1.0, size)
+    )
+
+    # IPR sobre Pwf de pr a 0 (caudal creciente)
+    steps = np.arange(context.n_points + 1) / context.n_points
+    pwf = np.maximum(pr * (1 - steps), 0.0)
+    caudal = model.flow(pwf)
+
+    fluid = FluidState.from_values(
+        grado_api=api,
+        agua_porcentaje=agua,
+        gravedad_especifica_agua=_column(samples, well_data, 'gravedad_especifica_agua', 1.0, size),
+        viscosidad_cp=viscosidad
+    )
+    demand_well = dict(well_data)
+    for key in ('presion_superficie', 'presion_casing'):
+        if samples.get(key) is not None:
+            demand_well[key] = _column(samples, well_data, key, getattr(_WELL_DEFAULTS, key), size)
+    demand = hydraulic_calculations.compute_pressure_demand_arrays(
+        demand_well,
+        caudal,
+        pwf,
+        fluid_state=fluid,
+        installation=context.installation
+    )
+
+    speed = context.pump.speed_ratio(freq, context.motor_specs.get('tipo_motor'))
+    pump_head = context.pump.head(caudal, speed, stages)
+    found, idx = _first_crossing(pump_head - demand['tdh'])
+
+    rows = np.arange(size)
+    diff = pump_head - demand['tdh']
+    q_op = _refine_crossing(
+        lambda q: (context.pump.head(q, speed, stages)
+                   - hydraulic_calculations.compute_demand_at_flow(
+                       demand_well, model, q, fluid_state=fluid, installation=context.installation)['tdh']),
+        caudal[rows, idx].reshape(size, 1),
+        caudal[rows, idx + 1].reshape(size, 1),
+        diff[rows, idx].reshape(size, 1),
+        diff[rows, idx + 1].reshape(size, 1)
+    )
+
+    # Pwf y PIP exactos en el caudal de operación (inversa cerrada del IPR)
+    at_op = hydraulic_calculations.compute_demand_at_flow(
+        demand_well, model, q_op, fluid_state=fluid, installation=context.installation
+    )
+    q_op = q_op[:, 0]
+    pwf_op = at_op['pwf'][:, 0]
+    pip_op = at_op['pip'][:, 0]
+    speed_row = speed[:, 0]
+
+    nan = np.nan
+    return {
+        'found': found,
+        'freq_hz': freq[:, 0],
+        'q_m3d': np.where(found, q_op, nan),
+        'head_m': np.where(found, context.pump.head(q_op, speed_row, stages[:, 0]), nan),
+        'pump_bhp_hp': np.where(found, context.pump.bhp_hp(q_op, speed_row, stages[:, 0]), nan),
+        'pwf_bar': np.where(found, pwf_op, nan),
+        'pip_bar': np.where(found, pip_op, nan),
+        'gravedad_especifica': fluid.gravedad_especifica[:, 0]
+    }
+
+
+def evaluate_batch(context: BatchContext, samples: Mapping[str, Any], freq_hz=50.0) -> Dict[str, np.ndarray]:
+    """
+    Cadena completa por lote: punto de operación y resultados eléctricos.
+
+    Returns:
+        dict: Arreglos (R,) del punto de operación más los de
+              ``calculate_electrical_arrays`` (NaN donde no hay punto de operación)
+    """
+    result = batch_operating_points(context, samples, freq_hz)
+    try:
+        electrical = calculate_electrical_arrays(
+            context.motor_specs,
+            context.installation,
+            result['pump_bhp_hp'],
+            result['freq_hz'],
+            context.profundidad_intake,
+            q_m3d=result['q_m3d'],
+            head_m=result['head_m'],
+            gravedad_especifica=result['gravedad_especifica']
+        )
+    except ElectricalComputationError as exc:
+        raise BatchEvaluationError(str(exc)) from exc
+    result.update(electrical)
+    return result
+
+
+def evaluate_chunk(args) -> Dict[str, np.ndarray]:
+    """Punto de entrada picklable para pools de procesos: (context, samples, freq_hz)."""
+    context, samples, freq_hz = args
+    return evaluate_batch(context, samples, freq_hz)
@@ -0,0 +1,60 @@
+"""Claves de contenido y estructuras de solo lectura para etapas de cálculo.
+
+``content_hash`` identifica las entradas efectivas de una etapa (datos del
+pozo, modelo IPR, fluido, equipo, frecuencia): dos etapas con el mismo hash
+producen el mismo resultado, que se calcula una vez y se comparte por
+referencia. ``freeze`` envuelve los dicts de entrada en vistas de solo
+lectura en lugar de tomar copias defensivas con ``deepcopy``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import numpy as np
+
+
+def _canonical(value: Any) -> Any:
+    """Convierte valores no JSON (dataclasses, numpy, vistas) a tipos básicos."""
+    # Modelos de entrada que ya conocen su clave de contenido (WellInput, ...)
+    cache_key = getattr(value, 'cache_key', None)
+    if isinstance(cache_key, str):
+        return cache_key
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def content_hash(*parts: Any) -> str:
+    """Hash SHA-1 estable del contenido de ``parts`` (orden de claves irrelevante)."""
+    payload = json.dumps(parts, sort_keys=True, default=_canonical, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def freeze(mapping: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Vista de solo lectura (nivel superior) de un dict de entradas. Los
+    modelos ya inmutables (p. ej. ``design_inputs.WellInput``) se devuelven tal cual.
+    """
+    if isinstance(mapping, MappingProxyType) or isinstance(getattr(mapping, 'cache_key', None), str):
+        return mapping
+    return MappingProxyType(dict(mapping or {}))
+
+
+def thaw(mapping: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Versión picklable de una vista congelada (dict superficial); el resto tal cual."""
+    if isinstance(mapping, MappingProxyType):
+        return dict(mapping)
+    return mapping
@@ -0,0 +1,230 @@
+"""Grafo de dependencias con memoización por nodo para ``calculate_conditions``.
+
+La cadena se modela como nodos con dependencias explícitas::
+
+    entradas ─► ipr ─┬─► system_head_curve
+                     └─► pressure_demand_curve ─┐
+    equipo ──────────────► pump_curves ─────────┴─► operating_point ─► electrical
+
+La clave de cada nodo es el hash de sus entradas directas más las claves de
+los nodos de los que depende, de modo que un cambio invalida sólo los nodos
+aguas abajo: cambiar ``frequency_hz`` recalcula curva de bomba, punto de
+operación y eléctrico, pero reutiliza IPR y curvas de demanda; cambiar el
+cable recalcula sólo el resumen eléctrico.
+
+``CalculationGraph`` guarda los resultados en un LRU acotado y compartido
+entre requests. Los resultados se comparten por referencia y no deben
+modificarse.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import calc_cache
+import electrical_calculations
+import equipment_selection
+import hydraulic_calculations
+import well_performance
+from design_inputs import InstallationInput, as_well_input
+
+NODES = (
+    'ipr',
+    'system_head_curve',
+    'pressure_demand_curve',
+    'pump_curves',
+    'operating_point',
+    'electrical',
+)
+CURVE_NODES = ('ipr', 'system_head_curve', 'pressure_demand_curve')
+DEFAULT_MAX_ENTRIES = 512
+
+
+def catalog_signature() -> tuple:
+    """
+    Versión de los catálogos cargados (cambia al recargarlos).
+
+    Es un contador y no la identidad de los objetos: los workers de un pool
+    adoptan la versión del proceso principal, de modo que sus claves
+    coinciden aunque carguen sus propias copias de los catálogos.
+    """
+    return ('catalogos', equipment_selection.catalog_version())
+
+
+def node_keys(task) -> Dict[str, str]:
+    """
+    Claves de contenido de cada nodo para un ``scenario_executor.ScenarioTask``.
+
+    ``system_head_curve`` sólo se incluye si la tarea lo pide.
+    """
+    ipr_key = calc_cache.content_hash('ipr', task.well_data, task.fluid_state, task.ipr_model)
+    demand_key = calc_cache.content_hash('pressure_demand_curve', ipr_key, _demand_temperatures(task))
+    pump_key = calc_cache.content_hash(
+        'pump_curves',
+        task.pump_config.get('pump_id'),
+        task.pump_config.get('stages') or task.pump_config.get('stages_count'),
+        task.freq_hz,
+        task.motor_id,
+        catalog_signature()
+    )
+    operating_key = calc_cache.content_hash('operating_point', demand_key, pump_key)
+    keys = {
+        'ipr': ipr_key,
+        'pressure_demand_curve': demand_key,
+        'pump_curves': pump_key,
+        'operating_point': operating_key,
+        'electrical': calc_cache.content_hash(
+            'electrical',
+            operating_key,
+            task.installation,
+            task.pump_config,
+            task.motor_config,
+            task.cable_config,
+            task.configuracion_pozo,
+            task.motor_id
+        ),
+    }
+    if task.include_system_head:
+        keys['system_head_curve'] = calc_cache.content_hash('system_head_curve', ipr_key)
+    return keys
+
+
+def _installation(task) -> InstallationInput:
+    return task.installation or InstallationInput.from_configs(
+        task.pump_config, task.motor_config, task.cable_config, task.configuracion_pozo
+    )
+
+
+def _demand_temperatures(task) -> Optional[Tuple[float, float]]:
+    """Perfil de temperatura que usa la curva de demanda (sólo el traverse multifásico)."""
+    if as_well_input(task.well_data).modelo_flujo == 'monofasico':
+        return None
+    installation = _installation(task)
+    return (installation.temp_superficie_grad, installation.gradiente_temp)
+
+
+def _pump_curves(task) -> Optional[Dict[str, Any]]:
+    installation = _installation(task)
+    if not installation.pump_id:
+        return None
+    try:
+        return equipment_selection.get_pump_performance_curves(
+            installation.pump_id,
+            freq_hz=task.freq_hz,
+            stages=installation.stages,
+            motor_id=task.motor_id
+        )
+    except Exception:
+        # El resumen eléctrico vuelve a intentarlo y reporta el error como warning
+        return None
+
+
+def _run_node(name: str, task, values: Mapping[str, Any]) -> Any:
+    if name == 'ipr':
+        return well_performance.calculate_ipr(task.well_data, task.fluid_state, task.ipr_model)
+    if name == 'system_head_curve':
+        return hydraulic_calculations.calculate_system_head_curve(
+            task.well_data, values['ipr'], fluid_state=task.fluid_state
+        )
+    if name == 'pressure_demand_curve':
+        return hydraulic_calculations.calculate_pressure_demand_curve(
+            task.well_data, values['ipr'], fluid_state=task.fluid_state, installation=_installation(task)
+        )
+    if name == 'pump_curves':
+        return _pump_curves(task)
+    if name == 'operating_point':
+        if values['pump_curves'] is None:
+            return None
+        return electrical_calculations.operating_point_from_curves(
+            values['pump_curves'], values['pressure_demand_curve']
+        )
+    if name == 'electrical':
+        return electrical_calculations.calculate_electrical_summary(
+            well_data=task.well_data,
+            pressure_curve=values['pressure_demand_curve'],
+            pump_config=task.pump_config,
+            motor_config=task.motor_config,
+            cable_config=task.cable_config,
+            configuracion_pozo=task.configuracion_pozo,
+            freq_hz=task.freq_hz,
+            motor_id=task.motor_id,
+            fluid_state=task.fluid_state,
+            installation=task.installation,
+            pump_curves=values['pump_curves'],
+            operating_point=values['operating_point'] if values['pump_curves'] is not None else None
+        )
+    raise KeyError(name)
+
+
+class CalculationGraph:
+    """Nodos memoizados por clave de contenido (LRU acotado, thread-safe)."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._store: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def _get(self, key: str):
+        with self._lock:
+            if key not in self._store:
+                return False, None
+            self._store.move_to_end(key)
+            return True, self._store[key]
+
+    def _put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._store[key] = value
+            self._store.move_to_end(key)
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+
+    def missing(self, task, nodes=NODES) -> List[str]:
+        """Nodos de ``nodes`` que la tarea necesita y no están en caché."""
+        keys = node_keys(task)
+        with self._lock:
+            return [name for name in nodes if name in keys and keys[name] not in self._store]
+
+    def evaluate(self, task) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Resuelve los nodos de la tarea en orden topológico.
+
+        Returns:
+            tuple: ({nodo: resultado}, nodos recalculados en esta llamada)
+        """
+        keys = node_keys(task)
+        values: Dict[str, Any] = {}
+        ran: List[str] = []
+        for name in NODES:
+            if name not in keys:
+                continue
+            hit, value = self._get(keys[name])
+            if not hit:
+                value = _run_node(name, task, values)
+                self._put(keys[name], value)
+                ran.append(name)
+            values[name] = value
+        return values, ran
+
+    def export(self, tasks) -> Dict[str, Any]:
+        """Entradas de caché de los nodos de ``tasks`` (para devolver desde un worker)."""
+        with self._lock:
+            return {
+                key: self._store[key]
+                for task in tasks
+                for key in node_keys(task).values()
+                if key in self._store
+            }
+
+    def merge(self, entries: Mapping[str, Any]) -> None:
+        """Incorpora entradas calculadas en otro proceso."""
+        for key, value in entries.items():
+            self._put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
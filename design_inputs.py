@@ -0,0 +1,265 @@
+"""Modelos de entrada validados e inmutables (pozo e instalación).
+
+``WellInput`` se construye una sola vez en el borde de la API a partir del
+dict ``well_data``: convierte y valida los campos numéricos y expone los
+valores como atributos tipados (con los mismos defaults que usan los
+módulos de cálculo). Los bucles de cálculo leen atributos en lugar de
+repetir ``well_data.get(...)`` y conversiones de tipo.
+
+``WellInput`` también es un ``Mapping`` de solo lectura con las claves
+recibidas, de modo que puede pasarse a cualquier función que espere el
+dict ``well_data``. Su ``cache_key`` (hash del contenido) es la clave de
+memoización de las etapas posteriores.
+
+``InstallationInput`` agrupa lo que ``calculate_electrical_summary`` lee de
+``pump_config``, ``motor_config``, ``cable_config`` y ``configuracion_pozo``
+(con la misma tolerancia: valores inválidos toman el default).
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+import calc_cache
+from friction_factor import DEFAULT_FRICTION_MODEL
+from multiphase_flow import MULTIPHASE_MODELS
+
+DEFAULT_PUMP_DEPTH_M = 1500.0
+FLOW_MODELS = ('monofasico',) + MULTIPHASE_MODELS
+CABLE_KEYS = ('mle_tipo_id', 'mle_longitud', 'fondo_tipo_id', 'superficie_tipo_id', 'superficie_longitud')
+
+
+class DesignInputError(ValueError):
+    """Dato de entrada inválido (tipo o valor)."""
+
+
+def _parse_number(key: str, value: Any):
+    """Valor numérico del mapping: conserva int/float/arreglos, convierte strings."""
+    if value is None or isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, str) and not value.strip():
+        return None  # Campo vacío del formulario: se usa el default
+    if isinstance(value, bool):
+        raise DesignInputError(f"'{key}' debe ser numérico.")
+    if isinstance(value, (int, float, np.number)):
+        if not math.isfinite(value):
+            raise DesignInputError(f"'{key}' debe ser finito.")
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError) as exc:
+        raise DesignInputError(f"'{key}' debe ser numérico (recibido: {value!r}).") from exc
+    if not math.isfinite(number):
+        raise DesignInputError(f"'{key}' debe ser finito.")
+    return number
+
+
+def _as_float(value, default):
+    if value is None:
+        return default
+    if isinstance(value, np.ndarray):
+        return value
+    return float(value)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class WellInput(Mapping):
+    """Datos del pozo e instalación de fondo, parseados y de solo lectura."""
+
+    method: str = 'linear'
+    presion_reservorio: float = 150.0
+    pi: float = 5.0
+    presion_burbuja: Optional[float] = None
+    q_test: Optional[float] = None
+    pwf_test: Optional[float] = None
+    n_exponent: float = 1.0
+    permeabilidad: float = 100.0
+    espesor: float = 15.0
+    radio_drenaje: float = 300.0
+    radio_pozo: float = 0.15
+    factor_volumen: float = 1.2
+    skin: float = 0.0
+    grado_api: float = 30.0
+    agua_porcentaje: float = 0.0
+    gravedad_especifica_agua: float = 1.0
+    viscosidad: float = 1.0
+    gor: float = 100.0
+    gravedad_gas: float = 0.65
+    profundidad_intake: Optional[float] = None
+    nivel_fluido_dinamico: float = 500.0
+    presion_superficie: float = 10.0
+    presion_casing: float = 1.0
+    tubing_id_mm: float = 62.0
+    tubing_roughness_mm: float = 0.046
+    q_max_estimate: float = 500.0
+    n_points: int = 50
+    modelo_friccion: str = DEFAULT_FRICTION_MODEL
+    modelo_flujo: str = 'monofasico'
+    _data: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}), repr=False)
+    # Hash del contenido recibido (clave de memoización), calculado en from_mapping
+    cache_key: str = field(default='', repr=False)
+
+    @classmethod
+    def from_mapping(cls, well_data: Optional[Mapping[str, Any]]) -> 'WellInput':
+        """
+        Parsea y valida ``well_data``.
+
+        Raises:
+            DesignInputError: Si un campo numérico no es convertible o no es
+                finito, o si ``modelo_flujo`` no es un modelo soportado
+        """
+        if isinstance(well_data, WellInput):
+            return well_data
+
+        data = dict(well_data or {})
+        values: Dict[str, Any] = {}
+        for name in _NUMERIC_FIELDS:
+            if name in data:
+                data[name] = _parse_number(name, data[name])
+                if data[name] is None:
+                    # Campo vacío: la clave se descarta para que el mapping use el mismo default
+                    del data[name]
+                else:
+                    values[name] = _as_float(data[name], _DEFAULTS[name])
+
+        if 'n_points' in data:
+            n_points = _parse_number('n_points', data.pop('n_points'))
+            if n_points is not None:
+                if n_points < 1:
+                    raise DesignInputError("'n_points' debe ser mayor a cero.")
+                data['n_points'] = n_points
+                values['n_points'] = int(n_points)
+
+        for name in WELL_TEXT_FIELDS:
+            if data.get(name):
+                values[name] = str(data[name]).lower()
+        if values.get('modelo_flujo', 'monofasico') not in FLOW_MODELS:
+            raise DesignInputError(
+                f"'modelo_flujo' desconocido: {data['modelo_flujo']!r} (use {', '.join(FLOW_MODELS)})."
+            )
+
+        return cls(**values, _data=MappingProxyType(data), cache_key=calc_cache.content_hash('well_input', data))
+
+    # --- Mapping de solo lectura (compatibilidad con funciones que reciben well_data) ---
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # --- Identidad por contenido ---
+    def __eq__(self, other) -> bool:
+        if isinstance(other, WellInput):
+            return self.cache_key == other.cache_key
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.cache_key)
+
+    def __reduce__(self):
+        # La vista de solo lectura no es picklable: se reconstruye desde las claves recibidas
+        return WellInput.from_mapping, (dict(self._data),)
+
+    @property
+    def profundidad_bomba(self) -> float:
+        """Profundidad de la bomba para hidráulica (1500 m si no se informó)."""
+        if self.profundidad_intake is None:
+            return DEFAULT_PUMP_DEPTH_M
+        return self.profundidad_intake
+
+    def replace(self, **changes: Any) -> 'WellInput':
+        """Nuevo WellInput con claves modificadas (p. ej. overrides de escenario)."""
+        data = dict(self._data)
+        data.update(changes)
+        return WellInput.from_mapping(data)
+
+
+_DEFAULTS = {
+    f.name: f.default for f in fields(WellInput) if not f.name.startswith('_') and f.name != 'cache_key'
+}
+# Campos de WellInput (los que los módulos de cálculo leen de well_data)
+WELL_INPUT_FIELDS = tuple(_DEFAULTS)
+WELL_TEXT_FIELDS = ('method', 'modelo_friccion', 'modelo_flujo')
+_NUMERIC_FIELDS = tuple(
+    name for name in _DEFAULTS if name not in WELL_TEXT_FIELDS and name != 'n_points'
+)
+
+
+def as_well_input(well_data: Mapping[str, Any]) -> WellInput:
+    """Devuelve ``well_data`` si ya es un WellInput; si no, lo parsea."""
+    if isinstance(well_data, WellInput):
+        return well_data
+    return WellInput.from_mapping(well_data)
+
+
+def _lenient_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _lenient_int(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True, slots=True)
+class InstallationInput:
+    """Equipo, cable y condiciones térmicas usados por el cálculo eléctrico."""
+
+    pump_id: Optional[str] = None
+    stages: int = 0
+    motor_id: Optional[str] = None
+    temp_superficie_grad: float = 15.0
+    gradiente_temp: float = 0.0425
+    temp_ambiente_superficie: float = 25.0
+    mle_tipo_id: Optional[str] = None
+    mle_longitud: float = 0.0
+    fondo_tipo_id: Optional[str] = None
+    superficie_tipo_id: Optional[str] = None
+    superficie_longitud: float = 0.0
+    missing_cable_keys: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_configs(
+        cls,
+        pump_config: Optional[Mapping[str, Any]] = None,
+        motor_config: Optional[Mapping[str, Any]] = None,
+        cable_config: Optional[Mapping[str, Any]] = None,
+        configuracion_pozo: Optional[Mapping[str, Any]] = None
+    ) -> 'InstallationInput':
+        pump_config = pump_config or {}
+        motor_config = motor_config or {}
+        cable_config = cable_config or {}
+        configuracion_pozo = configuracion_pozo or {}
+
+        return cls(
+            pump_id=pump_config.get('pump_id') or None,
+            stages=_lenient_int(pump_config.get('stages') or pump_config.get('stages_count'), 0),
+            motor_id=motor_config.get('motor_id') or None,
+            temp_superficie_grad=_lenient_float(configuracion_pozo.get('temp_superficie_grad'), 15.0),
+            gradiente_temp=_lenient_float(configuracion_pozo.get('gradiente_temp'), 0.0425),
+            temp_ambiente_superficie=_lenient_float(configuracion_pozo.get('temp_ambiente_superficie'), 25.0),
+            mle_tipo_id=cable_config.get('mle_tipo_id'),
+            mle_longitud=_lenient_float(cable_config.get('mle_longitud'), 0.0),
+            fondo_tipo_id=cable_config.get('fondo_tipo_id'),
+            superficie_tipo_id=cable_config.get('superficie_tipo_id'),
+            superficie_longitud=_lenient_float(cable_config.get('superficie_longitud'), 0.0),
+            missing_cable_keys=tuple(key for key in CABLE_KEYS if key not in cable_config)
+        )
+
+    @property
+    def cache_key(self) -> str:
+        return calc_cache.content_hash('installation', {f.name: getattr(self, f.name) for f in fields(self)})
@@ -0,0 +1,191 @@
+"""Sesiones de diseño del lado del servidor.
+
+El frontend reenvía el payload completo de ``calculate_conditions`` en cada
+movimiento de slider. Con una sesión, la primera llamada guarda el payload y
+devuelve un ``session_id``; las siguientes envían sólo los campos
+modificados (JSON merge patch, RFC 7396: ``null`` elimina una clave) y
+reutilizan los nodos ya calculados (IPR, curvas de demanda, curvas de bomba,
+...) del grafo propio de la sesión.
+
+Memoria acotada:
+- cada sesión guarda a lo sumo ``max_entries_per_session`` nodos (LRU del
+  ``CalculationGraph``);
+- el store guarda a lo sumo ``max_sessions`` sesiones (se desaloja la menos
+  usada) y descarta las inactivas por más de ``ttl_seconds``.
+
+``stats()`` expone sesiones activas, aciertos/fallos y desalojos por TTL y
+por capacidad. ``on_discard(session_id)`` se invoca por cada sesión que deja
+el store (TTL, capacidad o cierre), para liberar recursos asociados.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from calculation_graph import CalculationGraph
+
+DEFAULT_TTL_SECONDS = 1800.0
+DEFAULT_MAX_SESSIONS = 100
+DEFAULT_MAX_ENTRIES_PER_SESSION = 64
+
+
+class SessionNotFoundError(KeyError):
+    """La sesión no existe o expiró."""
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """
+    Aplica un JSON merge patch (RFC 7396) y devuelve un objeto nuevo.
+
+    Los dicts se combinan recursivamente, ``None`` elimina la clave y
+    cualquier otro valor (incluidas listas) reemplaza al anterior.
+    """
+    if not isinstance(patch, Mapping):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, Mapping) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+@dataclass
+class DesignSession:
+    """Payload vigente y nodos memoizados de una sesión."""
+
+    session_id: str
+    payload: Dict[str, Any]
+    graph: CalculationGraph
+    created_at: float
+    last_access: float
+    requests: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class SessionStore:
+    """Sesiones en un LRU con expiración por inactividad (thread-safe)."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        max_entries_per_session: int = DEFAULT_MAX_ENTRIES_PER_SESSION,
+        clock: Callable[[], float] = time.monotonic,
+        on_discard: Optional[Callable[[str], None]] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_entries_per_session = max_entries_per_session
+        self._clock = clock
+        self._on_discard = on_discard
+        self._sessions: 'OrderedDict[str, DesignSession]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'closed': 0}
+
+    def _expire(self, now: float) -> List[str]:
+        # El orden LRU coincide con el de último acceso: basta mirar el inicio
+        expired = []
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.ttl_seconds:
+                break
+            expired.append(self._sessions.popitem(last=False)[0])
+            self._stats['expired'] += 1
+        return expired
+
+    def _discarded(self, session_ids: List[str]) -> None:
+        # Fuera del lock del store: el callback puede tomar sus propios locks
+        if self._on_discard is not None:
+            for session_id in session_ids:
+                self._on_discard(session_id)
+
+    def create(self, payload: Mapping[str, Any]) -> DesignSession:
+        """Crea una sesión con el payload completo inicial."""
+        now = self._clock()
+        session = DesignSession(
+            session_id=uuid.uuid4().hex,
+            payload=merge_patch({}, payload),
+            graph=CalculationGraph(self.max_entries_per_session),
+            created_at=now,
+            last_access=now,
+            requests=1
+        )
+        with self._lock:
+            discarded = self._expire(now)
+            self._sessions[session.session_id] = session
+            self._stats['created'] += 1
+            while len(self._sessions) > self.max_sessions:
+                discarded.append(self._sessions.popitem(last=False)[0])
+                self._stats['evicted'] += 1
+        self._discarded(discarded)
+        return session
+
+    def get(self, session_id: str) -> DesignSession:
+        """
+        Sesión vigente (renueva su TTL).
+
+        Raises:
+            SessionNotFoundError: Si no existe, expiró o fue desalojada
+        """
+        now = self._clock()
+        with self._lock:
+            discarded = self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_access = now
+                self._stats['hits'] += 1
+            else:
+                self._stats['misses'] += 1
+        self._discarded(discarded)
+        if session is None:
+            raise SessionNotFoundError(session_id)
+        return session
+
+    def contains(self, session_id: str) -> bool:
+        """Si la sesión sigue vigente (sin renovar su TTL)."""
+        with self._lock:
+            discarded = self._expire(self._clock())
+            present = session_id in self._sessions
+        self._discarded(discarded)
+        return present
+
+    def update(self, session_id: str, patch: Mapping[str, Any]) -> DesignSession:
+        """Aplica los campos modificados al payload de la sesión."""
+        session = self.get(session_id)
+        with session.lock:
+            session.payload = merge_patch(session.payload, patch or {})
+            session.requests += 1
+        return session
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            removed = self._sessions.pop(session_id, None) is not None
+            if removed:
+                self._stats['closed'] += 1
+        if removed:
+            self._discarded([session_id])
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores del store y ocupación actual."""
+        with self._lock:
+            discarded = self._expire(self._clock())
+            stats = dict(
+                self._stats,
+                active=len(self._sessions),
+                cached_nodes=sum(len(session.graph) for session in self._sessions.values()),
+                max_sessions=self.max_sessions,
+                max_entries_per_session=self.max_entries_per_session,
+                ttl_seconds=self.ttl_seconds
+            )
+        self._discarded(discarded)
+        return stats
@@ -5,7 +5,10 @@ from __future__ import annotations
 import math
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-import hydraulic_calculations
+import numpy as np
+
+from design_inputs import InstallationInput, WellInput
+from fluid_properties import FluidState, resolve_fluid_state
 
 from equipment_selection import (
     get_cable_specs,
@@ -174,7 +177,13 @@ def _calculate_motor_section(
     p_motor_kw = (pump_bhp_hp / motor_eff) * 0.7457
     i_motor = (p_motor_kw * 1000.0) / (v_op * cos_fi * SQRT_3)
     p_motor_desarrollada_hp = motor_hp_nom * fef
-    motor_load_percent = (pump_bhp_hp / p_motor_desarrollada_hp) * 100.0 if p_motor_desarrollada_hp else None
+    if isinstance(p_motor_desarrollada_hp, np.ndarray):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            motor_load_percent = np.where(
+                p_motor_desarrollada_hp != 0, (pump_bhp_hp / p_motor_desarrollada_hp) * 100.0, np.nan
+            )
+    else:
+        motor_load_percent = (pump_bhp_hp / p_motor_desarrollada_hp) * 100.0 if p_motor_desarrollada_hp else None
 
     s_motor_kva = p_motor_kw / cos_fi
 
@@ -205,6 +214,8 @@ def _calculate_cable_losses(
         r_20c = float(specs['r_ohm_km_20c'])
         temp_coeff = float(specs['temp_coeff'])
         r_oper = r_20c * (1 + temp_coeff * (temp_c - 20.0))
+        if isinstance(length_m, np.ndarray):
+            return (r_oper / 1000.0) * np.maximum(length_m, 0.0)
         return (r_oper / 1000.0) * max(length_m, 0.0)
 
     r_mle = resistance_for_segment(cable_config['mle_tipo_id'], cable_config['mle_longitud'], temps['intake'])
@@ -229,9 +240,15 @@ def _calculate_surface_section(
     pf_motor: float
 ) -> Dict[str, Optional[float]]:
     p_superficie_kw = p_motor_kw + p_perdida_kw
-    q_superficie_kvar = math.sqrt(max(s_motor_kva ** 2 - p_motor_kw ** 2, 0.0)) if s_motor_kva else 0.0
-    s_superficie_kva = math.sqrt(p_superficie_kw ** 2 + q_superficie_kvar ** 2)
-    pf_superficie = p_superficie_kw / s_superficie_kva if s_superficie_kva else None
+    if isinstance(p_superficie_kw, np.ndarray):
+        q_superficie_kvar = np.sqrt(np.maximum(s_motor_kva ** 2 - p_motor_kw ** 2, 0.0))
+        s_superficie_kva = np.sqrt(p_superficie_kw ** 2 + q_superficie_kvar ** 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pf_superficie = np.where(s_superficie_kva != 0, p_superficie_kw / s_superficie_kva, np.nan)
+    else:
+        q_superficie_kvar = math.sqrt(max(s_motor_kva ** 2 - p_motor_kw ** 2, 0.0)) if s_motor_kva else 0.0
+        s_superficie_kva = math.sqrt(p_superficie_kw ** 2 + q_superficie_kvar ** 2)
+        pf_superficie = p_superficie_kw / s_superficie_kva if s_superficie_kva else None
 
     return {
         'P_superficie_kW': p_superficie_kw,
@@ -241,26 +258,136 @@ def _calculate_surface_section(
     }
 
 
+def _hydraulic_efficiency(q_m3d, tdh_m, sg, p_superficie_kw):
+    """Potencia hidráulica / potencia de superficie (escalares o arreglos; NaN si P <= 0)."""
+    p_hidraulica_kw = q_m3d * tdh_m * sg * HYDRAULIC_POWER_CONSTANT
+    if isinstance(p_hidraulica_kw, np.ndarray) or isinstance(p_superficie_kw, np.ndarray):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(p_superficie_kw > 0, p_hidraulica_kw / p_superficie_kw, np.nan)
+    return p_hidraulica_kw / p_superficie_kw if p_superficie_kw else None
+
+
 def _calculate_system_efficiency(
     well_data: Dict,
     operating_point: Dict[str, float],
-    p_superficie_kw: float
+    p_superficie_kw: float,
+    fluid_state: Optional[FluidState] = None
 ) -> Optional[float]:
-    if not operating_point or p_superficie_kw is None or p_superficie_kw <= 0:
+    if not operating_point or p_superficie_kw is None:
         return None
 
-    fluid_props = hydraulic_calculations.calculate_fluid_properties(well_data)
-    sg = fluid_props['densidad'] / 1000.0 if fluid_props else 1.0
-
     q_m3d = operating_point.get('q_m3d')
     tdh_m = operating_point.get('head_m')
 
     if q_m3d is None or tdh_m is None:
         return None
 
-    p_hidraulica_kw = q_m3d * tdh_m * sg * HYDRAULIC_POWER_CONSTANT
+    if not isinstance(p_superficie_kw, np.ndarray) and p_superficie_kw <= 0:
+        return None
 
-    return p_hidraulica_kw / p_superficie_kw if p_superficie_kw else None
+    sg = resolve_fluid_state(well_data, fluid_state).gravedad_especifica
+    return _hydraulic_efficiency(q_m3d, tdh_m, sg, p_superficie_kw)
+
+
+def calculate_electrical_arrays(
+    motor_specs: Dict,
+    installation: InstallationInput,
+    pump_bhp_hp,
+    freq_hz,
+    profundidad_intake,
+    q_m3d=None,
+    head_m=None,
+    gravedad_especifica=None
+) -> Dict[str, np.ndarray]:
+    """
+    Secciones motor → cable → superficie para arreglos de puntos de operación.
+
+    Motor y cables se resuelven una sola vez; BHP, frecuencia y profundidad de
+    intake pueden ser arreglos (se combinan por broadcasting). Filas con BHP
+    NaN (sin punto de operación) dan NaN.
+
+    Args:
+        motor_specs: Datos de placa (``get_motor_specs``)
+        installation: Cables y condiciones térmicas (``InstallationInput``)
+        q_m3d, head_m, gravedad_especifica: Opcionales, para 'Eff_Sistema'
+            y 'Energy_Index'
+
+    Returns:
+        dict: Arreglos 'P_motor_kW', 'I_motor', 'V_op', 'Motor_Load_Percent',
+              'S_motor_kVA', 'R_total', 'P_perdida_kW', 'V_superficie',
+              'P_superficie_kW', 'P_superficie_kVA', 'PF_superficie' y, si se
+              informa el caudal, 'Eff_Sistema' y 'Energy_Index'
+
+    Raises:
+        ElectricalComputationError: Datos de motor o cable faltantes
+    """
+    if installation.missing_cable_keys:
+        raise ElectricalComputationError(
+            'Faltan parámetros de cable: ' + ', '.join(installation.missing_cable_keys)
+        )
+
+    pump_bhp_hp = np.asarray(pump_bhp_hp, dtype=float)
+    freq_hz = np.asarray(freq_hz, dtype=float)
+    depth = np.asarray(profundidad_intake, dtype=float)
+
+    motor_section = _calculate_motor_section(installation.motor_id, motor_specs, pump_bhp_hp, freq_hz)
+
+    temps = {
+        'intake': installation.temp_superficie_grad + installation.gradiente_temp * depth,
+        'superficie': installation.temp_ambiente_superficie
+    }
+    cable_lengths = {
+        'mle_tipo_id': installation.mle_tipo_id,
+        'mle_longitud': installation.mle_longitud,
+        'fondo_tipo_id': installation.fondo_tipo_id,
+        'fondo_longitud': np.maximum(depth - installation.mle_longitud, 0.0),
+        'superficie_tipo_id': installation.superficie_tipo_id,
+        'superficie_longitud': installation.superficie_longitud
+    }
+    cable_section = _calculate_cable_losses(cable_lengths, temps, motor_section['I_motor'])
+
+    surface_section = _calculate_surface_section(
+        motor_section['P_motor_kW'],
+        cable_section['P_perdida_kW'],
+        motor_section['S_motor_kVA'],
+        motor_section['PF_motor']
+    )
+
+    result = {
+        'P_motor_kW': motor_section['P_motor_kW'],
+        'I_motor': motor_section['I_motor'],
+        'V_op': motor_section['V_op'],
+        'Motor_Load_Percent': motor_section['Motor_Load_Percent'],
+        'S_motor_kVA': motor_section['S_motor_kVA'],
+        'R_total': cable_section['R_total'],
+        'P_perdida_kW': cable_section['P_perdida_kW'],
+        'V_superficie': motor_section['V_op'] + cable_section['V_perdida_cable'],
+        'P_superficie_kW': surface_section['P_superficie_kW'],
+        'P_superficie_kVA': surface_section['P_superficie_kVA'],
+        'PF_superficie': surface_section['PF_superficie'],
+    }
+
+    if q_m3d is not None and head_m is not None:
+        q_m3d = np.asarray(q_m3d, dtype=float)
+        sg = 1.0 if gravedad_especifica is None else np.asarray(gravedad_especifica, dtype=float)
+        p_superficie_kw = surface_section['P_superficie_kW']
+        result['Eff_Sistema'] = _hydraulic_efficiency(q_m3d, np.asarray(head_m, dtype=float), sg, p_superficie_kw)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result['Energy_Index'] = np.where(
+                (q_m3d > 0) & (depth > 0), (p_superficie_kw / q_m3d / depth) * 1000.0, np.nan
+            )
+
+    return result
+
+
+def operating_point_from_curves(pump_curves: Dict, pressure_curve) -> Optional[Dict[str, float]]:
+    """Cruce de la curva de bomba (tabla de puntos) con la curva de demanda."""
+    return _find_operating_point(
+        pump_curves.get('head', []),
+        pressure_curve.get('curve', []) if isinstance(pressure_curve, dict) else pressure_curve,
+        pump_curves.get('bhp', []),
+        pump_curves.get('efficiency', [])
+    )
 
 
 def calculate_electrical_summary(
@@ -271,8 +398,24 @@ def calculate_electrical_summary(
     cable_config: Dict,
     configuracion_pozo: Dict,
     freq_hz: float,
-    motor_id: Optional[str] = None
+    motor_id: Optional[str] = None,
+    fluid_state: Optional[FluidState] = None,
+    installation: Optional[InstallationInput] = None,
+    pump_curves: Optional[Dict] = None,
+    operating_point: Optional[Dict] = None
 ) -> Dict[str, Optional[float]]:
+    """
+    Resumen eléctrico en el punto de operación (motor, cable y superficie).
+
+    ``installation`` (opcional) son las entradas de equipo ya parseadas; si no
+    se pasa se construye desde ``pump_config``/``motor_config``/``cable_config``
+    y ``configuracion_pozo``. ``pump_curves`` y ``operating_point`` permiten
+    reutilizar la curva de bomba y el punto de operación ya calculados
+    (``calculation_graph``); el punto de operación recibido no se modifica.
+    """
+    if installation is None:
+        installation = InstallationInput.from_configs(pump_config, motor_config, cable_config, configuracion_pozo)
+
     result: Dict[str, Optional[float]] = {
         'P_motor_kW': None,
         'I_motor': None,
@@ -288,54 +431,41 @@ def calculate_electrical_summary(
         'warnings': []
     }
 
-    def _float_or_default(value, default=0.0):
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return default
-
-    def _int_or_default(value, default=0):
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return default
-
     def _optional_float(value) -> Optional[float]:
         try:
             return float(value)
         except (TypeError, ValueError):
             return None
 
-    pump_id = pump_config.get('pump_id')
-    stages = _int_or_default(pump_config.get('stages') or pump_config.get('stages_count'), 0)
+    pump_id = installation.pump_id
+    stages = installation.stages
     if not pump_id:
         result['warnings'].append('No se proporcionó pump_id, se omiten cálculos eléctricos.')
         return result
 
-    try:
-        pump_curves = get_pump_performance_curves(
-            pump_id,
-            freq_hz=freq_hz,
-            stages=stages,
-            motor_id=motor_id
-        )
-    except Exception as exc:
-        result['warnings'].append(f'Error obteniendo curvas de bomba: {exc}')
-        return result
-
-    operating_point = _find_operating_point(
-        pump_curves.get('head', []),
-        pressure_curve.get('curve', []) if isinstance(pressure_curve, dict) else pressure_curve,
-        pump_curves.get('bhp', []),
-        pump_curves.get('efficiency', [])
-    )
+    if pump_curves is None:
+        try:
+            pump_curves = get_pump_performance_curves(
+                pump_id,
+                freq_hz=freq_hz,
+                stages=stages,
+                motor_id=motor_id
+            )
+        except Exception as exc:
+            result['warnings'].append(f'Error obteniendo curvas de bomba: {exc}')
+            return result
+
+    if operating_point is None:
+        operating_point = operating_point_from_curves(pump_curves, pressure_curve)
+    elif operating_point:
+        operating_point = dict(operating_point)
 
     if not operating_point:
         result['warnings'].append('No se encontró punto de operación bomba vs demanda.')
         return result
 
     pump_bhp_hp = operating_point.get('pump_bhp_hp')
-    motor_id = motor_id or motor_config.get('motor_id')
+    motor_id = motor_id or installation.motor_id
     motor_specs = get_motor_specs(motor_id) if motor_id else None
 
     if not motor_specs:
@@ -351,35 +481,36 @@ def calculate_electrical_summary(
         result['warnings'].append(str(exc))
         return result
 
-    profundidad_intake_value = _optional_float(well_data.get('profundidad_intake'))
+    if isinstance(well_data, WellInput):
+        profundidad_intake_value = well_data.profundidad_intake
+    else:
+        profundidad_intake_value = _optional_float(well_data.get('profundidad_intake'))
     profundidad_intake = profundidad_intake_value if profundidad_intake_value is not None else 0.0
-    t_superficie = _float_or_default(configuracion_pozo.get('temp_superficie_grad'), 15.0)
-    gradiente_temp = _float_or_default(configuracion_pozo.get('gradiente_temp'), 0.0425)
-    t_ambiente_superficie = _float_or_default(configuracion_pozo.get('temp_ambiente_superficie'), 25.0)
+    t_superficie = installation.temp_superficie_grad
+    gradiente_temp = installation.gradiente_temp
+    t_ambiente_superficie = installation.temp_ambiente_superficie
 
     temps = {
         'intake': t_superficie + gradiente_temp * profundidad_intake,
         'superficie': t_ambiente_superficie
     }
 
-    required_cable_keys = ['mle_tipo_id', 'mle_longitud', 'fondo_tipo_id', 'superficie_tipo_id', 'superficie_longitud']
-    missing_cable_keys = [key for key in required_cable_keys if key not in cable_config]
-    if missing_cable_keys:
+    if installation.missing_cable_keys:
         result['warnings'].append(
-            'Faltan parámetros de cable: ' + ', '.join(missing_cable_keys)
+            'Faltan parámetros de cable: ' + ', '.join(installation.missing_cable_keys)
         )
         return result
 
-    mle_longitud = _float_or_default(cable_config.get('mle_longitud'), 0.0)
-    superficie_longitud = _float_or_default(cable_config.get('superficie_longitud'), 0.0)
+    mle_longitud = installation.mle_longitud
+    superficie_longitud = installation.superficie_longitud
     fondo_longitud = max(profundidad_intake - mle_longitud, 0.0)
 
     cable_lengths = {
-        'mle_tipo_id': cable_config.get('mle_tipo_id'),
+        'mle_tipo_id': installation.mle_tipo_id,
         'mle_longitud': mle_longitud,
-        'fondo_tipo_id': cable_config.get('fondo_tipo_id'),
+        'fondo_tipo_id': installation.fondo_tipo_id,
         'fondo_longitud': fondo_longitud,
-        'superficie_tipo_id': cable_config.get('superficie_tipo_id'),
+        'superficie_tipo_id': installation.superficie_tipo_id,
         'superficie_longitud': superficie_longitud
     }
 
@@ -416,7 +547,8 @@ def calculate_electrical_summary(
     eff_sistema = _calculate_system_efficiency(
         well_data,
         operating_point,
-        surface_section['P_superficie_kW']
+        surface_section['P_superficie_kW'],
+        fluid_state
     )
 
     energy_index = None
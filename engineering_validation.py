@@ -2,7 +2,7 @@
 # Módulo de Validación de Ingeniería (Ejes, Voltaje, Temp.)
 # ---------------------------------------------------------
 
-def validate_full_design(well_data, selected_equipment):
+def validate_full_design(well_data, selected_equipment, context=None):
     """
     Orquestador principal de todas las validaciones de ingeniería.
     Toma los datos del pozo y el equipo seleccionado y ejecuta
@@ -11,6 +11,7 @@ def validate_full_design(well_data, selected_equipment):
     Args:
         well_data (dict): Datos del pozo.
         selected_equipment (dict): IDs del equipo seleccionado.
+        context (ValidationContext): Memoización del request (se crea si no se pasa).
     
     Returns:
         dict: Un reporte de validación con el estado de cada chequeo.
@@ -18,14 +19,15 @@ def validate_full_design(well_data, selected_equipment):
     print(f"Validando diseño con equipo: {selected_equipment}")
     
     results = {}
+    context = context or ValidationContext()
     
     # --- Aquí se llamarían a todas las funciones de validación ---
     
-    results['shaft_stress'] = validate_shaft_stress(selected_equipment)
-    results['protector_thrust'] = validate_protector_thrust(selected_equipment)
-    results['voltage_drop'] = calculate_voltage_drop(well_data, selected_equipment)
+    results['shaft_stress'] = validate_shaft_stress(selected_equipment, context)
+    results['protector_thrust'] = validate_protector_thrust(selected_equipment, context)
+    results['voltage_drop'] = calculate_voltage_drop(well_data, selected_equipment, context)
     results['motor_cooling'] = calculate_motor_cooling(well_data, selected_equipment)
-    results['motor_temperature'] = calculate_motor_temperature(well_data, selected_equipment)
+    results['motor_temperature'] = calculate_motor_temperature(well_data, selected_equipment, context)
     
     # Chequeo general
     all_ok = all(result['status'] == 'OK' for result in results.values())
@@ -40,16 +42,41 @@ import equipment_selection
 
 def _find_motor_data(motor_id):
     """Busca la fila del motor en el catálogo y la retorna como dict (o None)."""
-    motors = equipment_selection.get_motor_catalog()
-    for m in motors:
-        # Buscar por la columna detectada o por claves comunes
-        mid = m.get(equipment_selection.COL_MOTOR_ID) or m.get('Tipo motor') or m.get('Descripción')
-        if mid == motor_id:
-            return m
-    return None
+    return equipment_selection.get_motor_record(motor_id)
 
 
-def validate_shaft_stress(selected_equipment):
+class ValidationContext:
+    """
+    Memoización por request de los artefactos que comparten las validaciones:
+    curvas de bomba y motor y registros de motor.
+
+    Cada artefacto se calcula una sola vez por validación; los resultados se
+    comparten por referencia y no deben modificarse. ``computed`` cuenta los
+    cálculos efectivamente realizados por tipo.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self.computed = {}
+
+    def _memo(self, kind, key, build):
+        cache_key = (kind, key)
+        if cache_key not in self._cache:
+            self._cache[cache_key] = build()
+            self.computed[kind] = self.computed.get(kind, 0) + 1
+        return self._cache[cache_key]
+
+    def pump_curves(self, pump_id):
+        return self._memo('pump_curves', pump_id, lambda: equipment_selection.get_pump_performance_curves(pump_id))
+
+    def motor_curves(self, motor_id):
+        return self._memo('motor_curves', motor_id, lambda: equipment_selection.get_motor_performance_curves(motor_id))
+
+    def motor_record(self, motor_id):
+        return self._memo('motor_record', motor_id, lambda: _find_motor_data(motor_id))
+
+
+def validate_shaft_stress(selected_equipment, context=None):
     """
     Estima el esfuerzo torsional en el eje basándose en la potencia requerida por la bomba
     y la potencia nominal del motor. Regresa dict con status: OK / ADVERTENCIA / ERROR.
@@ -62,9 +89,10 @@ def validate_shaft_stress(selected_equipment):
     """
     pump_id = selected_equipment.get('pump_id')
     motor_id = selected_equipment.get('motor_id')
+    context = context or ValidationContext()
 
     try:
-        pump_curves = equipment_selection.get_pump_performance_curves(pump_id)
+        pump_curves = context.pump_curves(pump_id)
         if isinstance(pump_curves, dict) and 'error' in pump_curves:
             return {"status": "ERROR", "mensaje": pump_curves['error']}
 
@@ -76,7 +104,7 @@ def validate_shaft_stress(selected_equipment):
         mid_idx = len(bhp_points) // 2
         required_bhp = float(bhp_points[mid_idx]['valor'] or 0)
 
-        motor_data = _find_motor_data(motor_id)
+        motor_data = context.motor_record(motor_id)
         motor_hp = None
         motor_rpm = None
         shaft_diameter = None
@@ -135,14 +163,15 @@ def validate_shaft_stress(selected_equipment):
         return {"status": "ERROR", "mensaje": str(e)}
 
 
-def validate_protector_thrust(selected_equipment):
+def validate_protector_thrust(selected_equipment, context=None):
     """
     Estima el empuje axial aproximado usando la altura (head) de la bomba y el caudal.
     Regresa ADVERTENCIA si se excede un umbral conservador.
     """
     pump_id = selected_equipment.get('pump_id')
+    context = context or ValidationContext()
     try:
-        pump_curves = equipment_selection.get_pump_performance_curves(pump_id)
+        pump_curves = context.pump_curves(pump_id)
         if isinstance(pump_curves, dict) and 'error' in pump_curves:
             return {"status": "ERROR", "mensaje": pump_curves['error']}
 
@@ -164,11 +193,12 @@ def validate_protector_thrust(selected_equipment):
         return {"status": "ERROR", "mensaje": str(e)}
 
 
-def calculate_voltage_drop(well_data, equipment):
+def calculate_voltage_drop(well_data, equipment, context=None):
     """
     Calcula una estimación de caída de voltaje en base a la corriente estimada, longitud de cable
     y resistencia por km del conductor. Retorna un dict con status.
     """
+    context = context or ValidationContext()
     try:
         cable_length_m = float(well_data.get('cable_length_m', 1000))
         # Resistividad típica por km para cobre ~ 0.018 ohm/km por mm2 depende; usamos ejemplo de 0.2 ohm/km
@@ -176,7 +206,7 @@ def calculate_voltage_drop(well_data, equipment):
 
         # Obtener corriente estimada desde curva del motor (último punto)
         motor_id = equipment.get('motor_id')
-        motor_curves = equipment_selection.get_motor_performance_curves(motor_id)
+        motor_curves = context.motor_curves(motor_id)
         amps = None
         if isinstance(motor_curves, dict) and 'amperaje' in motor_curves:
             amps_list = motor_curves['amperaje']
@@ -187,7 +217,7 @@ def calculate_voltage_drop(well_data, equipment):
             # Valor por defecto conservador
             amps = float(well_data.get('estimated_current_a', 100))
 
-        motor_data = _find_motor_data(motor_id)
+        motor_data = context.motor_record(motor_id)
         voltage = None
         if motor_data:
             voltage = motor_data.get(equipment_selection.COL_MOTOR_VOLTAGE) or motor_data.get('VOLT NOM')
@@ -220,17 +250,18 @@ def calculate_motor_cooling(well_data, equipment):
         return {"status": "ERROR", "mensaje": str(e)}
 
 
-def calculate_motor_temperature(well_data, equipment):
+def calculate_motor_temperature(well_data, equipment, context=None):
     """
     Estima la temperatura de operación del motor usando la temperatura de fondo y la carga.
     """
+    context = context or ValidationContext()
     try:
         temp_fondo = float(well_data.get('temp_reservorio', well_data.get('temp_fondo', 100)))
         # Estimamos carga a partir de la relación BHP/motor HP si es posible
         pump_id = equipment.get('pump_id')
         motor_id = equipment.get('motor_id')
-        pump_curves = equipment_selection.get_pump_performance_curves(pump_id)
-        motor = _find_motor_data(motor_id)
+        pump_curves = context.pump_curves(pump_id)
+        motor = context.motor_record(motor_id)
         motor_hp = float(motor.get(equipment_selection.COL_MOTOR_HP) or motor.get('HP NOM') or 100)
 
         bhp_points = pump_curves.get('bhp', []) if isinstance(pump_curves, dict) or pump_curves else []
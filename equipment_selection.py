@@ -5,6 +5,7 @@
 import json
 import logging
 import os
+from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 import numpy as np  # Importamos numpy para manejo de tipos
@@ -34,6 +35,8 @@ PUMP_SHEET_CANDIDATES = ['Bombas', 'BOMBA', 'Bomba', 'Bombas ']
 MOTOR_SHEET_CANDIDATES = ['Motor', 'MOTOR', 'Motor ', 'MOTOR']
 
 CABLE_CATALOG_PATH = os.path.join('data', 'cable_catalog.json')
+SURFACE_EQUIPMENT_CATALOG_PATH = os.path.join('data', 'surface_equipment_catalog.json')
+SURFACE_EQUIPMENT_TYPES = ('transformadores', 'filtros_lc', 'vsds')
 
 REQUIRED_MOTOR_COLUMNS = [
     'descripción',
@@ -128,6 +131,7 @@ MOTOR_VOLTAGE_CANDIDATES = ['VOLT NOM', 'VOLT', 'voltaje', 'VOLTAGE']
 PUMP_CATALOG = None
 MOTOR_CATALOG = None
 CABLE_CATALOG = None
+SURFACE_EQUIPMENT_CATALOG = None
 PUMP_SHEET_NAME = None
 MOTOR_SHEET_NAME = None
 
@@ -549,6 +553,7 @@ def load_catalogs(force: bool = False, source: Optional[str] = None, excel_path:
         try:
             _load_catalogs_from_db()
             load_cable_catalog(force=force, source='db')
+            catalog_version()
             return
         except DatabaseConfigError as exc:
             if explicit:
@@ -564,6 +569,7 @@ def load_catalogs(force: bool = False, source: Optional[str] = None, excel_path:
     if resolved_source == 'excel':
         _load_catalogs_from_excel(excel_path)
         load_cable_catalog(force=force, source='file')
+        catalog_version()
         return
 
     raise ValueError(f"Fuente de catálogos desconocida: {source}")
@@ -589,42 +595,95 @@ def get_cable_catalog():
     return list(CABLE_CATALOG)
 
 
-def get_motor_specs(motor_id: str) -> Optional[dict]:
-    """Obtiene los datos de placa de un motor específico."""
-    if not motor_id:
-        return None
+# --- Versión de catálogos ---
+# Contador que aumenta cada vez que cambia el objeto de algún catálogo. Se
+# guardan referencias a los catálogos vigentes y se comparan por identidad,
+# de modo que un id() reutilizado tras una recarga nunca pasa por vigente.
+_CATALOG_VERSION = 0
+_VERSIONED_CATALOGS: tuple = ()
 
-    if MOTOR_CATALOG is None or not MOTOR_COLUMN_MAP:
-        load_catalogs()
 
-    catalog = MOTOR_CATALOG
-    id_column = MOTOR_COLUMN_MAP.get('descripcion') or COL_MOTOR_ID
+def _current_catalogs() -> tuple:
+    return (PUMP_CATALOG, MOTOR_CATALOG, CABLE_CATALOG)
 
-    try:
-        series = catalog[id_column]
-    except KeyError:
-        return None
 
-    target = str(motor_id).strip()
-    if not target:
-        return None
+def catalog_version() -> int:
+    """Versión de los catálogos cargados (cambia al recargarlos o reemplazarlos)."""
+    global _CATALOG_VERSION, _VERSIONED_CATALOGS
+    current = _current_catalogs()
+    if len(_VERSIONED_CATALOGS) != len(current) or any(
+        loaded is not seen for loaded, seen in zip(current, _VERSIONED_CATALOGS)
+    ):
+        _CATALOG_VERSION += 1
+        _VERSIONED_CATALOGS = current
+    return _CATALOG_VERSION
 
-    normalized_series = series.astype(str).str.strip().str.casefold()
-    target_normalized = target.casefold()
-    matches = catalog[normalized_series == target_normalized]
 
-    if matches.empty:
-        return None
+def set_catalog_version(version: int) -> None:
+    """
+    Adopta ``version`` para los catálogos cargados en este proceso.
+
+    Lo usan los workers de un pool, que cargan sus propias copias de los
+    catálogos del proceso principal y deben compartir sus claves de caché.
+    """
+    global _CATALOG_VERSION, _VERSIONED_CATALOGS
+    _CATALOG_VERSION = int(version)
+    _VERSIONED_CATALOGS = _current_catalogs()
+
+
+# --- Índices por clave primaria ---
+# Se construyen una vez por catálogo cargado y se reconstruyen solos si cambia
+# el objeto del catálogo o la columna de ID (recarga, cambio de mapeo).
+_CATALOG_INDEXES: Dict[str, tuple] = {}
+
 
-    row = matches.iloc[0]
+def _normalize_id(value) -> str:
+    """Clave de búsqueda de un ID de equipo (sin espacios, sin distinguir mayúsculas)."""
+    return str(value).strip().casefold()
 
+
+def _catalog_index(name: str, catalog, signature: tuple, build) -> Dict[Any, Any]:
+    """Devuelve el índice ``name`` de ``catalog``, reconstruyéndolo si cambió la firma."""
+    cached = _CATALOG_INDEXES.get(name)
+    if cached is not None and cached[0] is catalog and cached[1] == signature:
+        return cached[2]
+    index = build()
+    _CATALOG_INDEXES[name] = (catalog, signature, index)
+    return index
+
+
+def _build_pump_index() -> Dict[str, int]:
+    """Posición de la primera fila de cada bomba (KeyError si falta la columna ID)."""
+    index: Dict[str, int] = {}
+    for position, value in enumerate(PUMP_CATALOG[COL_PUMP_ID].tolist()):
+        if not _is_missing(value):
+            index.setdefault(_normalize_id(value), position)
+    return index
+
+
+def _find_pump_row(pump_id):
+    """
+    Fila del catálogo de bombas para ``pump_id``.
+
+    Raises:
+        KeyError: Si la columna ID de bomba no existe
+        IndexError: Si la bomba no está en el catálogo
+    """
+    index = _catalog_index('pump', PUMP_CATALOG, (COL_PUMP_ID,), _build_pump_index)
+    position = index.get(_normalize_id(pump_id))
+    if position is None:
+        raise IndexError(pump_id)
+    return PUMP_CATALOG.iloc[position]
+
+
+def _motor_specs_from_row(row: Dict[str, Any], id_column: str) -> dict:
     tipo = row.get(MOTOR_COLUMN_MAP.get('tipo_motor'))
     if isinstance(tipo, str):
         tipo_normalized = tipo.strip().upper()
     else:
         tipo_normalized = tipo
 
-    specs = {
+    return {
         'id': row.get(id_column),
         'hp_nom': _to_float(row.get(MOTOR_COLUMN_MAP.get('hp_nom'))),
         'volt_nom': _to_float(row.get(MOTOR_COLUMN_MAP.get('volt_nom'))),
@@ -636,7 +695,70 @@ def get_motor_specs(motor_id: str) -> Optional[dict]:
         'is_complete': bool(row.get('__is_complete', True))
     }
 
-    return specs
+
+def _build_motor_specs_index(id_column: str) -> Dict[str, dict]:
+    """Datos de placa ya parseados de cada motor, por ID normalizado."""
+    if id_column not in MOTOR_CATALOG.columns:
+        return {}
+    index: Dict[str, dict] = {}
+    for row in MOTOR_CATALOG.to_dict(orient='records'):
+        index.setdefault(_normalize_id(row.get(id_column)), _motor_specs_from_row(row, id_column))
+    return index
+
+
+def _build_motor_record_index() -> Dict[str, dict]:
+    """Filas crudas del catálogo de motores por ID (columna detectada o claves comunes)."""
+    index: Dict[str, dict] = {}
+    for row in MOTOR_CATALOG.to_dict(orient='records'):
+        motor_id = row.get(COL_MOTOR_ID) or row.get('Tipo motor') or row.get('Descripción')
+        if not _is_missing(motor_id):
+            index.setdefault(_normalize_id(motor_id), row)
+    return index
+
+
+def get_motor_specs(motor_id: str) -> Optional[dict]:
+    """Obtiene los datos de placa de un motor específico."""
+    if not motor_id:
+        return None
+
+    if MOTOR_CATALOG is None or not MOTOR_COLUMN_MAP:
+        load_catalogs()
+
+    target = str(motor_id).strip()
+    if not target:
+        return None
+
+    id_column = MOTOR_COLUMN_MAP.get('descripcion') or COL_MOTOR_ID
+    index = _catalog_index(
+        'motor_specs',
+        MOTOR_CATALOG,
+        (id_column, tuple(sorted(MOTOR_COLUMN_MAP.items()))),
+        lambda: _build_motor_specs_index(id_column)
+    )
+    specs = index.get(target.casefold())
+    return dict(specs) if specs is not None else None
+
+
+def get_motor_record(motor_id) -> Optional[dict]:
+    """Fila completa del catálogo de motores para ``motor_id`` (o None)."""
+    if motor_id is None or (isinstance(motor_id, str) and not motor_id.strip()):
+        return None
+
+    if MOTOR_CATALOG is None:
+        load_catalogs()
+
+    index = _catalog_index('motor_records', MOTOR_CATALOG, (COL_MOTOR_ID,), _build_motor_record_index)
+    record = index.get(_normalize_id(motor_id))
+    return dict(record) if record is not None else None
+
+
+def _build_cable_index() -> Dict[str, dict]:
+    index: Dict[str, dict] = {}
+    for entry in CABLE_CATALOG:
+        cable_id = entry.get('id')
+        if not _is_missing(cable_id):
+            index.setdefault(_normalize_id(cable_id), entry)
+    return index
 
 
 def get_cable_specs(cable_id: str) -> Optional[dict]:
@@ -647,10 +769,60 @@ def get_cable_specs(cable_id: str) -> Optional[dict]:
     if CABLE_CATALOG is None:
         load_cable_catalog()
 
-    for entry in CABLE_CATALOG:
-        if entry.get('id') == cable_id:
-            return entry
-    return None
+    index = _catalog_index('cable', CABLE_CATALOG, (), _build_cable_index)
+    return index.get(_normalize_id(cable_id))
+
+
+def load_surface_equipment_catalog(force: bool = False, file_path: Optional[str] = None):
+    """Carga el catálogo de transformadores, filtros LC y VSDs desde el archivo JSON."""
+    global SURFACE_EQUIPMENT_CATALOG
+
+    if SURFACE_EQUIPMENT_CATALOG is not None and not force:
+        return
+
+    catalog_path = file_path or SURFACE_EQUIPMENT_CATALOG_PATH
+    if not os.path.exists(catalog_path):
+        raise FileNotFoundError(
+            f"No se encontró el archivo de catálogo de equipos de superficie en '{catalog_path}'"
+        )
+
+    with open(catalog_path, 'r', encoding='utf-8') as fh:
+        data = json.load(fh)
+
+    if not isinstance(data, dict) or not all(isinstance(data.get(key), list) for key in SURFACE_EQUIPMENT_TYPES):
+        raise ValueError(
+            'El catálogo de equipos de superficie debe tener los arrays: ' + ', '.join(SURFACE_EQUIPMENT_TYPES)
+        )
+
+    SURFACE_EQUIPMENT_CATALOG = {key: list(data[key]) for key in SURFACE_EQUIPMENT_TYPES}
+
+
+def get_surface_equipment_catalog() -> Dict[str, list]:
+    """Devuelve el catálogo de equipos de superficie ({tipo: [equipos]})."""
+    if SURFACE_EQUIPMENT_CATALOG is None:
+        load_surface_equipment_catalog()
+    return {key: list(entries) for key, entries in SURFACE_EQUIPMENT_CATALOG.items()}
+
+
+def get_surface_equipment_specs(tipo: str, equipment_id: str) -> Optional[dict]:
+    """Obtiene un transformador, filtro LC o VSD del catálogo de superficie por ID."""
+    if not equipment_id or tipo not in SURFACE_EQUIPMENT_TYPES:
+        return None
+
+    if SURFACE_EQUIPMENT_CATALOG is None:
+        load_surface_equipment_catalog()
+
+    entries = SURFACE_EQUIPMENT_CATALOG[tipo]
+
+    def build():
+        index: Dict[str, dict] = {}
+        for entry in entries:
+            if not _is_missing(entry.get('id')):
+                index.setdefault(_normalize_id(entry['id']), entry)
+        return index
+
+    index = _catalog_index(f'surface_{tipo}', entries, (), build)
+    return index.get(_normalize_id(equipment_id))
 
 
 def get_column_mapping():
@@ -696,7 +868,7 @@ def get_pump_performance_curves(
         
     try:
         # Usamos la variable de configuración para buscar por ID
-        pump_data = PUMP_CATALOG[PUMP_CATALOG[COL_PUMP_ID] == str(pump_id)].iloc[0]
+        pump_data = _find_pump_row(pump_id)
     except IndexError:
         print(f"ERROR: No se encontró la bomba con id '{pump_id}' (buscando en columna '{COL_PUMP_ID}').")
         return {"error": f"Bomba con id '{pump_id}' no encontrada."}
@@ -876,6 +1048,96 @@ def get_pump_performance_curves(
 
     return curves
 
+@dataclass(frozen=True)
+class PumpModel:
+    """
+    Coeficientes de una bomba listos para evaluación vectorizada.
+
+    Evalúa directamente los polinomios con las leyes de afinidad, para
+    arreglos de caudal, frecuencia y etapas (por broadcasting):
+        H(Q) = etapas · s² · P_h(Q / s)
+        BHP(Q) = etapas · s³ · P_p(Q / s) · 1.34 / 1000   [HP]
+    con s = rpm_real / rpm_catálogo (igual que `get_pump_performance_curves`).
+    """
+
+    pump_id: str
+    head_coeffs: tuple
+    bhp_coeffs: tuple
+    min_q: float
+    max_q: float
+    rpm_cat: Optional[float]
+    q_zero_head_base: float
+
+    def speed_ratio(self, freq_hz, motor_type: Optional[str] = None):
+        freq = np.asarray(freq_hz, dtype=float)
+        if not self.rpm_cat or self.rpm_cat <= 0:
+            return np.ones_like(freq)
+        rpm_real = freq * 60.0
+        if (motor_type or '').upper() == 'AM':
+            rpm_real = rpm_real * ASYNC_SLIP_FACTOR
+        return rpm_real / self.rpm_cat
+
+    def head(self, q, speed_ratio, stages):
+        s = np.asarray(speed_ratio, dtype=float)
+        base = np.polynomial.polynomial.polyval(np.asarray(q, dtype=float) / s, self.head_coeffs)
+        return np.maximum(base * np.asarray(stages, dtype=float) * s ** 2, 0.0)
+
+    def bhp_hp(self, q, speed_ratio, stages):
+        s = np.asarray(speed_ratio, dtype=float)
+        base = np.polynomial.polynomial.polyval(np.asarray(q, dtype=float) / s, self.bhp_coeffs)
+        return np.maximum(base * np.asarray(stages, dtype=float) * s ** 3 * 1.34 / 1000.0, 0.0)
+
+    def q_zero_head(self, speed_ratio):
+        """Caudal de TDH nula (escalado por velocidad)."""
+        return self.q_zero_head_base * np.asarray(speed_ratio, dtype=float)
+
+    def operating_range(self, speed_ratio):
+        s = np.asarray(speed_ratio, dtype=float)
+        return self.min_q * s, self.max_q * s
+
+
+def get_pump_model(pump_id) -> Optional[PumpModel]:
+    """Devuelve el modelo vectorizado de una bomba (None si no existe)."""
+    if PUMP_CATALOG is None:
+        load_catalogs()
+
+    try:
+        pump_data = _find_pump_row(pump_id)
+    except (IndexError, KeyError):
+        return None
+
+    try:
+        min_q = float(pump_data.get(COL_PUMP_MIN_Q) or 0)
+        max_q = float(pump_data.get(COL_PUMP_MAX_Q) or 3000)
+        h_coeffs = tuple(float(pump_data.get(col) or 0) for col in COLS_PUMP_HEAD)
+        p_coeffs = tuple(float(pump_data.get(col) or 0) for col in COLS_PUMP_BHP)
+    except (ValueError, TypeError):
+        return None
+
+    rpm_cat = None
+    for key in ('rpm', 'RPM', 'Rpm', 'rpm_nom', 'rpm_cat'):
+        if key in pump_data.keys():
+            rpm_cat = _to_float(pump_data.get(key))
+            break
+
+    # Misma búsqueda del caudal de TDH nula que get_pump_performance_curves
+    q_zero = max_q
+    if max_q > 0:
+        grid = np.arange(0, max_q * 2, max_q / 1000.0)
+        non_positive = np.flatnonzero(np.polynomial.polynomial.polyval(grid, h_coeffs) <= 0)
+        if non_positive.size:
+            q_zero = float(grid[non_positive[0]])
+
+    return PumpModel(
+        pump_id=str(pump_id),
+        head_coeffs=h_coeffs,
+        bhp_coeffs=p_coeffs,
+        min_q=min_q,
+        max_q=max_q,
+        rpm_cat=rpm_cat,
+        q_zero_head_base=q_zero
+    )
+
 def get_motor_performance_curves(motor_id):
     """
     Calcula las curvas de rendimiento (Amps, Eff, PF, Temp) para un motor.
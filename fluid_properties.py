@@ -0,0 +1,80 @@
+"""Estado de propiedades del fluido compartido entre módulos de cálculo.
+
+``FluidState`` se construye una sola vez por request/escenario a partir de
+``well_data`` y se pasa a IPR, demanda, TDH y eficiencia eléctrica, evitando
+recalcular densidad API, densidad de mezcla y gradiente en cada función (y
+en cada punto de caudal).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# 1 g/cm³ * 9.81 m/s² = 9810 Pa/m = 0.0981 bar/m
+GRADIENT_BAR_M_PER_GCC = 0.0981
+
+
+@dataclass(frozen=True, slots=True)
+class FluidState:
+    """Propiedades del fluido mezcla (petróleo + agua), inmutables."""
+
+    grado_api: float
+    agua_porcentaje: float
+    gravedad_especifica_agua: float
+    viscosidad_cp: float
+    densidad_oil_gcc: float
+    densidad_mezcla_gcc: float
+    densidad_kg_m3: float
+    gradiente_bar_m: float
+
+    @classmethod
+    def from_values(
+        cls,
+        grado_api: float = 30,
+        agua_porcentaje: float = 0,
+        gravedad_especifica_agua: float = 1.0,
+        viscosidad_cp: float = 1.0
+    ) -> 'FluidState':
+        # Densidad del petróleo según API (g/cm³)
+        densidad_oil = 141.5 / (131.5 + grado_api)
+        fraccion_agua = agua_porcentaje / 100.0
+        densidad_mezcla = densidad_oil * (1 - fraccion_agua) + gravedad_especifica_agua * fraccion_agua
+        return cls(
+            grado_api=grado_api,
+            agua_porcentaje=agua_porcentaje,
+            gravedad_especifica_agua=gravedad_especifica_agua,
+            viscosidad_cp=viscosidad_cp,
+            densidad_oil_gcc=densidad_oil,
+            densidad_mezcla_gcc=densidad_mezcla,
+            densidad_kg_m3=densidad_mezcla * 1000.0,
+            gradiente_bar_m=densidad_mezcla * GRADIENT_BAR_M_PER_GCC
+        )
+
+    @classmethod
+    def from_well_data(cls, well_data: Dict[str, Any]) -> 'FluidState':
+        return cls.from_values(
+            grado_api=well_data.get('grado_api', 30),
+            agua_porcentaje=well_data.get('agua_porcentaje', 0),
+            gravedad_especifica_agua=well_data.get('gravedad_especifica_agua', 1.0),
+            viscosidad_cp=well_data.get('viscosidad', 1.0)
+        )
+
+    @property
+    def gravedad_especifica(self) -> float:
+        return self.densidad_kg_m3 / 1000.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Formato de ``hydraulic_calculations.calculate_fluid_properties``."""
+        return {
+            'densidad': self.densidad_kg_m3,
+            'gradiente': self.gradiente_bar_m,
+            'viscosidad': self.viscosidad_cp
+        }
+
+
+def resolve_fluid_state(well_data: Dict[str, Any], fluid_state: Optional[FluidState] = None) -> FluidState:
+    """Devuelve ``fluid_state`` si se recibió; si no, lo construye desde ``well_data``."""
+    if fluid_state is not None:
+        return fluid_state
+    return FluidState.from_well_data(well_data)
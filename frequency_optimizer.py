@@ -0,0 +1,284 @@
+"""Optimización de la frecuencia (o del programa de frecuencias) por kWh/m³.
+
+Para cada período del programa de producción busca la frecuencia del VSD
+que minimiza la energía específica de superficie (kWh por m³ de líquido)
+cumpliendo:
+
+- caudal de operación >= ``caudal_requerido`` del período;
+- caudal dentro del rango operativo de la bomba a esa velocidad
+  (``PumpModel.operating_range``, mismas leyes de afinidad y deslizamiento
+  que ``get_pump_performance_curves``);
+- carga de motor <= ``carga_motor_max`` (%).
+
+Los candidatos se evalúan por lotes con ``batch_evaluation``: una grilla
+gruesa (todos los períodos × todas las frecuencias en un solo lote) y luego
+rondas de refinamiento alrededor del mejor candidato factible de cada
+período, también en un solo lote por ronda. ``scripts/benchmark_frequency_optimizer.py``
+compara el resultado y el tiempo contra un barrido fino por fuerza bruta.
+
+Programa de producción::
+
+    {
+        "periodos": [
+            {"nombre": "año 1", "caudal_requerido": 150, "duracion_dias": 365},
+            {"nombre": "año 2", "caudal_requerido": 130, "duracion_dias": 365,
+             "presion_reservorio": 135, "agua_porcentaje": 55}
+        ],
+        "freq_min": 35, "freq_max": 65, "carga_motor_max": 100
+    }
+
+Cada período puede sobrescribir cualquiera de ``batch_evaluation.BATCH_PARAMETERS``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+import batch_evaluation
+
+DEFAULT_FREQ_MIN = 30.0
+DEFAULT_FREQ_MAX = 70.0
+DEFAULT_MAX_MOTOR_LOAD = 100.0
+DEFAULT_PERIOD_DAYS = 30.0
+COARSE_STEP_HZ = 1.0
+REFINE_POINTS = 21
+REFINE_ROUNDS = 2
+MAX_PERIODS = 240
+RATE_TOLERANCE_M3D = 1e-6
+
+
+class FrequencyOptimizationError(ValueError):
+    """Error de validación para la optimización de frecuencia."""
+
+
+def _float(value: Any, label: str, default: Optional[float] = None) -> float:
+    if value is None and default is not None:
+        return default
+    try:
+        result = float(value)
+    except (TypeError, ValueError) as exc:
+        raise FrequencyOptimizationError(f"'{label}' debe ser numérico.") from exc
+    if not math.isfinite(result):
+        raise FrequencyOptimizationError(f"'{label}' debe ser finito.")
+    return result
+
+
+def parse_schedule(spec: Mapping[str, Any], well_data: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Valida el programa de producción.
+
+    Returns:
+        list: [{'nombre', 'caudal_requerido', 'duracion_dias', 'overrides'}]
+    """
+    periods = spec.get('periodos')
+    if periods is None and spec.get('caudal_requerido') is not None:
+        periods = [{'caudal_requerido': spec['caudal_requerido'], 'duracion_dias': spec.get('duracion_dias')}]
+    if not periods:
+        raise FrequencyOptimizationError("Se requiere 'periodos' o 'caudal_requerido'.")
+    if len(periods) > MAX_PERIODS:
+        raise FrequencyOptimizationError(f'Se admiten hasta {MAX_PERIODS} períodos.')
+
+    schedule = []
+    for idx, period in enumerate(periods):
+        if not isinstance(period, Mapping):
+            raise FrequencyOptimizationError(f'Período {idx + 1}: se esperaba un objeto.')
+        label = str(period.get('nombre') or f'periodo_{idx + 1}')
+        required = _float(period.get('caudal_requerido'), f'{label}.caudal_requerido')
+        days = _float(period.get('duracion_dias'), f'{label}.duracion_dias', DEFAULT_PERIOD_DAYS)
+        if required <= 0 or days <= 0:
+            raise FrequencyOptimizationError(f'{label}: caudal_requerido y duracion_dias deben ser positivos.')
+        overrides = {
+            key: _float(period[key], f'{label}.{key}')
+            for key in batch_evaluation.BATCH_PARAMETERS
+            if period.get(key) is not None
+        }
+        schedule.append({'nombre': label, 'caudal_requerido': required, 'duracion_dias': days, 'overrides': overrides})
+    return schedule
+
+
+def _period_samples(schedule) -> Dict[str, np.ndarray]:
+    return batch_evaluation.override_samples([period['overrides'] for period in schedule])
+
+
+def evaluate_candidates(
+    context: batch_evaluation.BatchContext,
+    samples: Mapping[str, np.ndarray],
+    required: np.ndarray,
+    freqs: np.ndarray,
+    max_motor_load: float = DEFAULT_MAX_MOTOR_LOAD
+) -> Dict[str, np.ndarray]:
+    """
+    Evalúa una matriz de frecuencias candidatas (períodos × candidatos) en un solo lote.
+
+    Returns:
+        dict: Matrices (P, K) 'q_m3d', 'P_superficie_kW', 'Motor_Load_Percent',
+              'kwh_m3' (inf donde no es factible) y máscara 'factible'
+    """
+    n_periods, n_candidates = freqs.shape
+    rows = {key: np.repeat(values, n_candidates) for key, values in samples.items()}
+    flat_freq = freqs.reshape(-1)
+    batch = batch_evaluation.evaluate_batch(context, rows, flat_freq)
+
+    q = batch['q_m3d']
+    speed = context.pump.speed_ratio(flat_freq, context.motor_specs.get('tipo_motor'))
+    q_low, q_high = context.pump.operating_range(speed)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        feasible = (
+            batch['found']
+            & (q >= np.repeat(required, n_candidates) - RATE_TOLERANCE_M3D)
+            & (q >= q_low) & (q <= q_high)
+            & (batch['Motor_Load_Percent'] <= max_motor_load)
+            & (batch['P_superficie_kW'] > 0)
+        )
+        kwh_m3 = np.where(feasible, batch['P_superficie_kW'] * 24.0 / q, np.inf)
+
+    shape = (n_periods, n_candidates)
+    return {
+        'q_m3d': q.reshape(shape),
+        'P_superficie_kW': batch['P_superficie_kW'].reshape(shape),
+        'Motor_Load_Percent': batch['Motor_Load_Percent'].reshape(shape),
+        'kwh_m3': kwh_m3.reshape(shape),
+        'factible': feasible.reshape(shape)
+    }
+
+
+def _best(freqs: np.ndarray, evaluated: Mapping[str, np.ndarray]):
+    idx = np.argmin(evaluated['kwh_m3'], axis=1)
+    rows = np.arange(freqs.shape[0])
+    return freqs[rows, idx], {name: values[rows, idx] for name, values in evaluated.items()}
+
+
+def optimize_frequencies(
+    context: batch_evaluation.BatchContext,
+    schedule: List[Mapping[str, Any]],
+    freq_min: float = DEFAULT_FREQ_MIN,
+    freq_max: float = DEFAULT_FREQ_MAX,
+    max_motor_load: float = DEFAULT_MAX_MOTOR_LOAD
+) -> Dict[str, Any]:
+    """
+    Frecuencia óptima por período: grilla gruesa y refinamiento local por lotes.
+
+    Returns:
+        dict: Arreglos (P,) 'frequency_hz', 'q_m3d', 'P_superficie_kW',
+              'Motor_Load_Percent', 'kwh_m3', 'factible' y 'n_evaluaciones'
+    """
+    samples = _period_samples(schedule)
+    required = np.array([period['caudal_requerido'] for period in schedule])
+    n_periods = len(schedule)
+
+    grid = np.linspace(freq_min, freq_max, max(int(round((freq_max - freq_min) / COARSE_STEP_HZ)), 1) + 1)
+    freqs = np.tile(grid, (n_periods, 1))
+    best_freq, best = _best(freqs, evaluate_candidates(context, samples, required, freqs, max_motor_load))
+    evaluations = freqs.size
+
+    # Sólo se refinan los períodos con algún punto factible en la grilla gruesa:
+    # en los demás el argmin sobre inf no indica dónde buscar
+    active = np.flatnonzero(best['factible'])
+    active_samples = {key: values[active] for key, values in samples.items()}
+    half_width = grid[1] - grid[0] if grid.size > 1 else 0.0
+    for _ in range(REFINE_ROUNDS):
+        if half_width <= 0 or active.size == 0:
+            break
+        offsets = np.linspace(-half_width, half_width, REFINE_POINTS)
+        freqs = np.clip(best_freq[active, None] + offsets[None, :], freq_min, freq_max)
+        freq, candidate = _best(
+            freqs, evaluate_candidates(context, active_samples, required[active], freqs, max_motor_load)
+        )
+        evaluations += freqs.size
+        # El refinamiento nunca empeora el candidato anterior
+        improved = candidate['kwh_m3'] < best['kwh_m3'][active]
+        best_freq[active[improved]] = freq[improved]
+        for name in best:
+            best[name][active[improved]] = candidate[name][improved]
+        half_width = 2.0 * half_width / (REFINE_POINTS - 1)
+
+    best['frequency_hz'] = best_freq
+    best['n_evaluaciones'] = evaluations
+    return best
+
+
+def _rounded(value, digits: int = 3) -> Optional[float]:
+    value = float(value)
+    return round(value, digits) if math.isfinite(value) else None
+
+
+def run_optimizer(
+    well_data: Mapping[str, Any],
+    pump_config: Mapping[str, Any],
+    motor_config: Mapping[str, Any],
+    cable_config: Mapping[str, Any],
+    configuracion_pozo: Mapping[str, Any],
+    spec: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """
+    Programa de frecuencias de mínima energía específica.
+
+    Returns:
+        dict: {
+            'periodos': [{'nombre', 'caudal_requerido', 'duracion_dias', 'frequency_hz',
+                          'q_m3d', 'P_superficie_kW', 'Motor_Load_Percent', 'kwh_m3',
+                          'energia_kwh', 'volumen_m3', 'factible'}],
+            'totales': {'energia_kwh', 'volumen_m3', 'kwh_m3'},
+            'restricciones', 'n_infactibles', 'n_evaluaciones'
+        }
+    """
+    spec = spec or {}
+    schedule = parse_schedule(spec, well_data)
+    freq_min = _float(spec.get('freq_min'), 'freq_min', DEFAULT_FREQ_MIN)
+    freq_max = _float(spec.get('freq_max'), 'freq_max', DEFAULT_FREQ_MAX)
+    max_load = _float(spec.get('carga_motor_max'), 'carga_motor_max', DEFAULT_MAX_MOTOR_LOAD)
+    if not 0 < freq_min <= freq_max:
+        raise FrequencyOptimizationError('Se requiere 0 < freq_min <= freq_max.')
+    if max_load <= 0:
+        raise FrequencyOptimizationError("'carga_motor_max' debe ser positivo.")
+
+    try:
+        context = batch_evaluation.build_batch_context(
+            dict(well_data), dict(pump_config), dict(motor_config), dict(cable_config), dict(configuracion_pozo)
+        )
+        best = optimize_frequencies(context, schedule, freq_min, freq_max, max_load)
+    except batch_evaluation.BatchEvaluationError as exc:
+        raise FrequencyOptimizationError(str(exc)) from exc
+
+    periods = []
+    total_energy = total_volume = 0.0
+    for idx, period in enumerate(schedule):
+        feasible = bool(best['factible'][idx])
+        entry = {
+            'nombre': period['nombre'],
+            'caudal_requerido': period['caudal_requerido'],
+            'duracion_dias': period['duracion_dias'],
+            'factible': feasible
+        }
+        if feasible:
+            energy = float(best['P_superficie_kW'][idx]) * 24.0 * period['duracion_dias']
+            volume = float(best['q_m3d'][idx]) * period['duracion_dias']
+            total_energy += energy
+            total_volume += volume
+            entry.update(
+                frequency_hz=_rounded(best['frequency_hz'][idx], 2),
+                q_m3d=_rounded(best['q_m3d'][idx]),
+                P_superficie_kW=_rounded(best['P_superficie_kW'][idx]),
+                Motor_Load_Percent=_rounded(best['Motor_Load_Percent'][idx]),
+                kwh_m3=_rounded(best['kwh_m3'][idx], 4),
+                energia_kwh=round(energy, 1),
+                volumen_m3=round(volume, 1)
+            )
+        else:
+            entry['motivo'] = 'Ninguna frecuencia cumple caudal requerido, rango operativo y carga de motor.'
+        periods.append(entry)
+
+    return {
+        'periodos': periods,
+        'totales': {
+            'energia_kwh': round(total_energy, 1),
+            'volumen_m3': round(total_volume, 1),
+            'kwh_m3': round(total_energy / total_volume, 4) if total_volume > 0 else None
+        },
+        'restricciones': {'freq_min': freq_min, 'freq_max': freq_max, 'carga_motor_max': max_load},
+        'n_infactibles': sum(1 for entry in periods if not entry['factible']),
+        'n_evaluaciones': int(best['n_evaluaciones'])
+    }
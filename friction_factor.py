@@ -0,0 +1,184 @@
+"""Factor de fricción de Darcy para flujo en tubería.
+
+Implementa la ecuación de Colebrook-White resuelta de forma iterativa sobre
+arreglos completos de números de Reynolds, y una tabla precalculada
+(Re, ε/D) con interpolación para las combinaciones tubing/rugosidad que se
+repiten entre cálculos (catálogo de `tubing_catalog`). Las tablas del
+catálogo se construyen al iniciar la app (`precompute_catalog_tables`); las
+de diámetros fuera del catálogo se construyen y memoizan en el primer uso.
+
+Zonas de flujo:
+- Laminar (Re <= 2300): f = 64 / Re
+- Transición (2300 < Re < 4000): interpolación lineal entre f laminar en
+  Re = 2300 y Colebrook en Re = 4000
+- Turbulento (Re >= 4000): 1/√f = -2 log₁₀((ε/D)/3.7 + 2.51/(Re √f))
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+import tubing_catalog
+
+RE_LAMINAR = 2300.0
+RE_TURBULENT = 4000.0
+
+FRICTION_MODELS = ('colebrook', 'swamee_jain')
+DEFAULT_FRICTION_MODEL = 'colebrook'
+
+# Malla de la tabla: log10(Re) entre el inicio de transición y 1e8
+_TABLE_LOG_RE_MIN = math.log10(RE_LAMINAR)
+_TABLE_LOG_RE_MAX = 8.0
+_TABLE_POINTS = 600
+
+_LN10 = math.log(10.0)
+
+
+def swamee_jain_friction_factor(reynolds, rugosidad_relativa) -> np.ndarray:
+    """Aproximación explícita de Swamee-Jain (sólo régimen turbulento)."""
+    re = np.asarray(reynolds, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 0.25 / (np.log10(rugosidad_relativa / 3.7 + 5.74 / (re ** 0.9)) ** 2)
+
+
+def _colebrook_turbulent(reynolds: np.ndarray, rugosidad_relativa, tol: float, max_iter: int) -> np.ndarray:
+    """Resuelve Colebrook-White con Newton sobre x = 1/√f para todo el arreglo."""
+    re = np.maximum(reynolds, RE_TURBULENT)
+    a = np.asarray(rugosidad_relativa, dtype=float) / 3.7
+    b = 2.51 / re
+
+    # Semilla: Swamee-Jain (error < 1 %), converge en 2-4 iteraciones
+    x = 1.0 / np.sqrt(swamee_jain_friction_factor(re, rugosidad_relativa))
+    for _ in range(max_iter):
+        inner = a + b * x
+        g = x + 2.0 * np.log10(inner)
+        dg = 1.0 + (2.0 / _LN10) * b / inner
+        step = g / dg
+        x = x - step
+        if np.all(np.abs(step) <= tol * np.abs(x)):
+            break
+    return 1.0 / (x ** 2)
+
+
+def colebrook_friction_factor(reynolds, rugosidad_relativa, tol: float = 1e-12, max_iter: int = 50) -> np.ndarray:
+    """
+    Factor de fricción de Darcy exacto (Colebrook-White) para un arreglo de Re.
+
+    Args:
+        reynolds: Número(s) de Reynolds (escalar o arreglo)
+        rugosidad_relativa: ε/D (escalar o arreglo compatible por broadcasting)
+        tol: Tolerancia relativa sobre 1/√f
+        max_iter: Máximo de iteraciones de Newton
+
+    Returns:
+        np.ndarray: Factor de fricción (0 donde Re <= 0)
+    """
+    re = np.asarray(reynolds, dtype=float)
+    re, eps = np.broadcast_arrays(re, np.asarray(rugosidad_relativa, dtype=float))
+
+    f_turbulent = _colebrook_turbulent(re, eps, tol, max_iter)
+    f_turbulent_edge = _colebrook_turbulent(np.full_like(re, RE_TURBULENT), eps, tol, max_iter)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f_laminar = np.where(re > 0, 64.0 / re, 0.0)
+
+    f_laminar_edge = 64.0 / RE_LAMINAR
+    weight = (re - RE_LAMINAR) / (RE_TURBULENT - RE_LAMINAR)
+    f_transition = f_laminar_edge + weight * (f_turbulent_edge - f_laminar_edge)
+
+    return np.where(
+        re >= RE_TURBULENT,
+        f_turbulent,
+        np.where(re > RE_LAMINAR, f_transition, f_laminar)
+    )
+
+
+class FrictionFactorTable:
+    """
+    Tabla precalculada de f(Re) para una rugosidad relativa fija.
+
+    Se evalúa Colebrook una sola vez sobre una malla logarítmica de Re y luego
+    se interpola en log-log; el error frente a la solución exacta es < 0.02 %.
+    """
+
+    __slots__ = ('rugosidad_relativa', '_log_re', '_log_f')
+
+    def __init__(self, rugosidad_relativa: float, points: int = _TABLE_POINTS):
+        self.rugosidad_relativa = float(rugosidad_relativa)
+        # Se incluye el nodo Re = 4000 para respetar el quiebre transición/turbulento
+        self._log_re = np.union1d(
+            np.linspace(_TABLE_LOG_RE_MIN, _TABLE_LOG_RE_MAX, points),
+            [math.log10(RE_TURBULENT)]
+        )
+        f = colebrook_friction_factor(10.0 ** self._log_re, self.rugosidad_relativa)
+        self._log_f = np.log(f)
+
+    def __call__(self, reynolds) -> np.ndarray:
+        re = np.asarray(reynolds, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_re = np.log10(np.clip(re, 10.0 ** _TABLE_LOG_RE_MIN, 10.0 ** _TABLE_LOG_RE_MAX))
+            f_table = np.exp(np.interp(log_re, self._log_re, self._log_f))
+            f_laminar = np.where(re > 0, 64.0 / re, 0.0)
+
+        f = np.where(re > RE_LAMINAR, f_table, f_laminar)
+
+        # Fuera de la malla (Re > 1e8) se resuelve Colebrook directamente
+        above = re > 10.0 ** _TABLE_LOG_RE_MAX
+        if np.any(above):
+            f = np.where(above, colebrook_friction_factor(re, self.rugosidad_relativa), f)
+        return f
+
+
+def _table_key(rugosidad_relativa: float) -> float:
+    return float(f"{float(rugosidad_relativa):.6e}")
+
+
+@lru_cache(maxsize=128)
+def _cached_table(key: float) -> FrictionFactorTable:
+    return FrictionFactorTable(key)
+
+
+def get_friction_table(diametro_interno_mm: float, rugosidad_mm: float) -> FrictionFactorTable:
+    """Devuelve (y memoiza) la tabla de fricción para un par tubing/rugosidad."""
+    if diametro_interno_mm <= 0:
+        raise ValueError('El diámetro interno debe ser mayor a cero.')
+    return _cached_table(_table_key(rugosidad_mm / diametro_interno_mm))
+
+
+def precompute_catalog_tables() -> Dict[Tuple[str, str], FrictionFactorTable]:
+    """Precalcula las tablas para todas las combinaciones del catálogo de tuberías."""
+    tables: Dict[Tuple[str, str], FrictionFactorTable] = {}
+    for tubing in tubing_catalog.get_tubing_catalog():
+        for roughness_key, roughness_mm in tubing_catalog.get_roughness_options().items():
+            tables[(tubing['nombre'], roughness_key)] = get_friction_table(tubing['id_mm'], roughness_mm)
+    return tables
+
+
+def darcy_friction_factor(reynolds, diametro_interno_mm: float, rugosidad_mm: float, modelo: str = DEFAULT_FRICTION_MODEL) -> np.ndarray:
+    """
+    Factor de fricción según el modelo seleccionado.
+
+    - 'colebrook': Colebrook-White vía tabla memoizada por (ID, rugosidad)
+    - 'swamee_jain': comportamiento FASE 1 (Swamee-Jain y f = 0.032 en transición)
+    """
+    re = np.asarray(reynolds, dtype=float)
+    modelo = (modelo or DEFAULT_FRICTION_MODEL).lower()
+
+    if modelo == 'swamee_jain':
+        rugosidad_relativa = rugosidad_mm / diametro_interno_mm
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f_laminar = np.where(re > 0, 64.0 / re, 0.032)
+        return np.where(
+            re > RE_TURBULENT,
+            swamee_jain_friction_factor(re, rugosidad_relativa),
+            np.where(re > RE_LAMINAR, 0.032, f_laminar)
+        )
+
+    if modelo != 'colebrook':
+        raise ValueError(f"Modelo de fricción desconocido: {modelo}")
+
+    return get_friction_table(diametro_interno_mm, rugosidad_mm)(re)
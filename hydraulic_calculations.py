@@ -9,8 +9,16 @@
 
 import math
 
+import numpy as np
 
-def calculate_friction_loss_darcy(caudal_m3d, longitud_m, diametro_interno_mm, rugosidad_mm, densidad_kg_m3, viscosidad_cp):
+import friction_factor
+from design_inputs import as_well_input
+from fluid_properties import resolve_fluid_state
+import multiphase_flow
+import wellbore_traverse
+
+
+def calculate_friction_loss_darcy(caudal_m3d, longitud_m, diametro_interno_mm, rugosidad_mm, densidad_kg_m3, viscosidad_cp, modelo_friccion=None):
     """
     Calcula las pérdidas por fricción usando la ecuación de Darcy-Weisbach.
     
@@ -21,6 +29,7 @@ def calculate_friction_loss_darcy(caudal_m3d, longitud_m, diametro_interno_mm, r
         rugosidad_mm (float): Rugosidad absoluta en mm
         densidad_kg_m3 (float): Densidad del fluido en kg/m³
         viscosidad_cp (float): Viscosidad dinámica en cP
+        modelo_friccion (str): 'colebrook' (por defecto) o 'swamee_jain'
     
     Returns:
         float: Pérdidas por fricción en bar
@@ -30,7 +39,6 @@ def calculate_friction_loss_darcy(caudal_m3d, longitud_m, diametro_interno_mm, r
     
     # Convertir unidades
     d_m = diametro_interno_mm / 1000.0  # mm -> m
-    e_m = rugosidad_mm / 1000.0  # mm -> m
     area_m2 = math.pi * (d_m ** 2) / 4.0
     caudal_m3s = caudal_m3d / 86400.0  # m³/día -> m³/s
     velocidad_ms = caudal_m3s / area_m2 if area_m2 > 0 else 0
@@ -41,18 +49,12 @@ def calculate_friction_loss_darcy(caudal_m3d, longitud_m, diametro_interno_mm, r
     # Número de Reynolds
     Re = (densidad_kg_m3 * velocidad_ms * d_m) / mu_pas if mu_pas > 0 else 0
     
-    # Rugosidad relativa
-    epsilon = e_m / d_m if d_m > 0 else 0
-    
-    # Factor de fricción de Darcy usando aproximación de Swamee-Jain
-    # (válida para Re > 4000 y 10^-6 < ε/D < 10^-2)
-    if Re > 4000:  # Flujo turbulento
-        # Fórmula de Swamee-Jain
-        f = 0.25 / (math.log10(epsilon/3.7 + 5.74/(Re**0.9)) ** 2)
-    elif Re > 2300:  # Zona de transición (aproximación)
-        f = 0.032  # Valor aproximado en transición
-    else:  # Flujo laminar (Re < 2300)
-        f = 64.0 / Re if Re > 0 else 0.032
+    # Factor de fricción de Darcy: Colebrook-White (tabla precalculada) o
+    # Swamee-Jain con f = 0.032 en transición (modelo FASE 1)
+    if d_m > 0:
+        f = float(friction_factor.darcy_friction_factor(Re, diametro_interno_mm, rugosidad_mm, modelo_friccion))
+    else:
+        f = 0.032
     
     # Ecuación de Darcy-Weisbach: ΔP = f * (L/D) * (ρ*v²/2)
     delta_p_pa = f * (longitud_m / d_m) * (densidad_kg_m3 * (velocidad_ms ** 2) / 2.0) if d_m > 0 else 0
@@ -63,6 +65,43 @@ def calculate_friction_loss_darcy(caudal_m3d, longitud_m, diametro_interno_mm, r
     return delta_p_bar
 
 
+def calculate_friction_loss_darcy_array(caudales_m3d, longitud_m, diametro_interno_mm, rugosidad_mm, densidad_kg_m3, viscosidad_cp, modelo_friccion=None):
+    """
+    Versión vectorizada de `calculate_friction_loss_darcy` para un arreglo de caudales.
+
+    Aplica el mismo modelo de factor de fricción sobre todos los caudales a la vez.
+
+    Args:
+        caudales_m3d (array-like): Caudales en m³/día
+        longitud_m (float): Longitud de tubería en metros
+        diametro_interno_mm (float): Diámetro interno en mm
+        rugosidad_mm (float): Rugosidad absoluta en mm
+        densidad_kg_m3 (float | array): Densidad del fluido en kg/m³
+        viscosidad_cp (float | array): Viscosidad dinámica en cP
+        modelo_friccion (str): 'colebrook' (por defecto) o 'swamee_jain'
+
+    Returns:
+        np.ndarray: Pérdidas por fricción en bar (0 para caudales <= 0)
+    """
+    q = np.asarray(caudales_m3d, dtype=float)
+    d_m = diametro_interno_mm / 1000.0
+    if d_m <= 0:
+        return np.zeros_like(q)
+
+    area_m2 = math.pi * (d_m ** 2) / 4.0
+    velocidad_ms = (q / 86400.0) / area_m2
+
+    # La viscosidad puede ser un arreglo (una por realización en lotes)
+    mu_pas = np.asarray(viscosidad_cp, dtype=float) * 0.001
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reynolds = np.where(mu_pas > 0, (densidad_kg_m3 * velocidad_ms * d_m) / mu_pas, 0.0)
+
+    f = friction_factor.darcy_friction_factor(reynolds, diametro_interno_mm, rugosidad_mm, modelo_friccion)
+
+    delta_p_pa = f * (longitud_m / d_m) * (densidad_kg_m3 * (velocidad_ms ** 2) / 2.0)
+    return np.where(q > 0, delta_p_pa / 100000.0, 0.0)
+
+
 def calculate_fluid_properties(well_data):
     """
     Calcula las propiedades del fluido necesarias para cálculos hidráulicos.
@@ -77,38 +116,10 @@ def calculate_fluid_properties(well_data):
             'viscosidad': viscosidad en cp (del input)
         }
     """
-    grado_api = well_data.get('grado_api', 30)
-    agua_porcentaje = well_data.get('agua_porcentaje', 0)
-    gravedad_especifica_agua = well_data.get('gravedad_especifica_agua', 1.0)
-    viscosidad_cp = well_data.get('viscosidad', 1.0)
-    
-    # Densidad del petróleo según API (g/cm³)
-    densidad_oil_gcc = 141.5 / (131.5 + grado_api)
-    
-    # Densidad del agua (g/cm³)
-    densidad_water_gcc = gravedad_especifica_agua
-    
-    # Fracción de agua (0 a 1)
-    fraccion_agua = agua_porcentaje / 100.0
-    
-    # Densidad de la mezcla (g/cm³)
-    densidad_mezcla_gcc = densidad_oil_gcc * (1 - fraccion_agua) + densidad_water_gcc * fraccion_agua
-    
-    # Convertir a kg/m³
-    densidad_kg_m3 = densidad_mezcla_gcc * 1000.0
-    
-    # Gradiente en bar/m
-    # 1 g/cm³ * 9.81 m/s² = 9810 Pa/m = 0.0981 bar/m
-    gradiente_bar_m = densidad_mezcla_gcc * 0.0981
-    
-    return {
-        'densidad': densidad_kg_m3,
-        'gradiente': gradiente_bar_m,
-        'viscosidad': viscosidad_cp
-    }
+    return resolve_fluid_state(well_data).as_dict()
 
 
-def calculate_tdh_basic(well_data, caudal_m3d):
+def calculate_tdh_basic(well_data, caudal_m3d, fluid_state=None):
     """
     Calcula el TDH (Total Dynamic Head) básico para un caudal dado.
     
@@ -123,20 +134,21 @@ def calculate_tdh_basic(well_data, caudal_m3d):
             - presion_superficie (bar): Presión deseada en superficie
             - presion_casing (bar): Presión en el anular (casing)
             - grado_api, agua_porcentaje, etc.
-        caudal_m3d (float): Caudal en m³/día
+        caudal_m3d (float o array): Caudal en m³/día
+        fluid_state (FluidState): Propiedades del fluido ya resueltas (opcional)
     
     Returns:
         float: TDH total en metros
     """
-    # Extraer datos de instalación
-    profundidad_intake = well_data.get('profundidad_intake', 1500)  # m
-    nivel_fluido = well_data.get('nivel_fluido_dinamico', 500)  # m desde superficie
-    presion_superficie = well_data.get('presion_superficie', 10)  # bar
-    presion_casing = well_data.get('presion_casing', 1)  # bar
+    # Extraer datos de instalación (atributos ya parseados de WellInput)
+    well = as_well_input(well_data)
+    profundidad_intake = well.profundidad_bomba  # m
+    nivel_fluido = well.nivel_fluido_dinamico  # m desde superficie
+    presion_superficie = well.presion_superficie  # bar
+    presion_casing = well.presion_casing  # bar
     
-    # Calcular propiedades del fluido
-    fluid_props = calculate_fluid_properties(well_data)
-    gradiente = fluid_props['gradiente']  # bar/m
+    # Propiedades del fluido (resueltas una vez por request/escenario)
+    gradiente = resolve_fluid_state(well_data, fluid_state).gradiente_bar_m  # bar/m
     
     # 1. CARGA DE ELEVACIÓN
     # Distancia vertical que debe elevar el fluido
@@ -160,7 +172,27 @@ def calculate_tdh_basic(well_data, caudal_m3d):
     return tdh_total
 
 
-def calculate_system_head_curve(well_data):
+def compute_system_head_arrays(well_data, caudal, fluid_state=None):
+    """
+    Núcleo vectorizado de la curva de system head.
+
+    Evalúa `calculate_tdh_basic` sobre todo el arreglo de caudales en una sola
+    pasada (las propiedades del fluido se resuelven una vez).
+
+    Args:
+        well_data (dict): Datos del pozo e instalación
+        caudal (array-like): Caudales en m³/d
+        fluid_state (FluidState): Propiedades del fluido ya resueltas (opcional)
+
+    Returns:
+        dict: Arreglos 'caudal' y 'tdh'
+    """
+    caudal = np.asarray(caudal, dtype=float)
+    tdh = calculate_tdh_basic(well_data, caudal, resolve_fluid_state(well_data, fluid_state))
+    return {'caudal': caudal, 'tdh': tdh}
+
+
+def calculate_system_head_curve(well_data, ipr_data=None, fluid_state=None):
     """
     Calcula la curva de 'system head' o TDH vs Caudal.
     Esta es la carga total (TDH) que la bomba debe vencer para
@@ -169,33 +201,227 @@ def calculate_system_head_curve(well_data):
     FASE 1: Implementación básica.
     FASE 2: Se agregará cálculo detallado de fricción.
     
+    Si se pasa el IPR, la curva se evalúa sobre los mismos caudales que la
+    curva de demanda; si no, sobre 0..q_max_estimate con n_points intervalos.
+    
     Args:
         well_data (dict): Diccionario con datos del pozo e instalación
+        ipr_data (dict): Datos del IPR calculado (opcional, define la malla de caudales)
+        fluid_state (FluidState): Propiedades del fluido ya resueltas (opcional)
     
     Returns:
         list: Lista de diccionarios [{"caudal": Q (m³/d), "tdh": TDH (m)}]
     """
     print("Calculando curva de TDH del sistema (FASE 1 - Básico)...")
     
-    # Rango de caudales a evaluar (0 a 500 m³/d en incrementos)
-    q_max = well_data.get('q_max_estimate', 500)  # m³/d
-    n_points = well_data.get('n_points', 50)
-    
-    system_curve = []
+    if ipr_data and ipr_data.get('curve'):
+        caudal, _, _ = _ipr_curve_arrays(ipr_data)
+    else:
+        # Rango de caudales a evaluar (0 a 500 m³/d en incrementos)
+        well = as_well_input(well_data)
+        q_max = well.q_max_estimate  # m³/d
+        n_points = well.n_points
+        caudal = (q_max / n_points) * np.arange(n_points + 1)  # m³/d
+
+    arrays = compute_system_head_arrays(well_data, caudal, fluid_state)
     
-    for i in range(n_points + 1):
-        q = (q_max / n_points) * i  # m³/d
-        tdh = calculate_tdh_basic(well_data, q)
-        
-        system_curve.append({
+    return [
+        {"caudal": round(q, 2), "tdh": round(tdh, 2)}
+        for q, tdh in zip(arrays['caudal'].tolist(), arrays['tdh'].tolist())
+    ]
+
+
+def _ipr_curve_arrays(ipr_data):
+    """Extrae caudal, Pwf y nivel de la curva IPR como arreglos."""
+    points = ipr_data.get('curve', []) if ipr_data else []
+    caudal = np.fromiter((p['caudal'] for p in points), dtype=float, count=len(points))
+    pwf = np.fromiter((p['pwf'] for p in points), dtype=float, count=len(points))
+    nivel = np.fromiter((p.get('nivel', 0) for p in points), dtype=float, count=len(points))
+    return caudal, pwf, nivel
+
+
+def compute_pressure_demand_arrays(well_data, caudal, pwf, nivel=None, fluid_state=None, installation=None):
+    """
+    Núcleo vectorizado de la curva de demanda de presión.
+
+    Evalúa fricción, TDH, PIP, nivel de fluido y sumergencia para todos los
+    caudales en una sola pasada (ver `calculate_pressure_demand_curve` para la
+    formulación TDH = PD + Tf + TP/MG - PIP/MG).
+
+    Args:
+        well_data (dict): Datos del pozo e instalación
+        caudal (array-like): Caudales en m³/d (los mismos puntos del IPR)
+        pwf (array-like): Presión de fondo fluyente en bar para cada caudal
+        nivel (array-like): Nivel dinámico relativo al reservorio (opcional)
+        fluid_state (FluidState): Estado del fluido compartido (opcional;
+            campos escalares o arreglos por fila)
+        installation (InstallationInput): Perfil de temperatura del pozo para
+            el traverse multifásico (opcional)
+
+    Returns:
+        dict: Arreglos 'caudal', 'tdh', 'pip', 'pwf', 'nivel', 'fluid_level_m',
+              'sumergencia_m', 'perdidas_friccion', escalares 'pd' (TVD), 'tp_bar',
+              'gradiente' y 'segments' (traverse segmentado o None)
+    """
+    well = as_well_input(well_data)
+    profundidad_bomba = well.profundidad_bomba  # m (PD)
+    presion_superficie = well.presion_superficie  # bar (TP)
+    presion_casing = well.presion_casing  # bar
+
+    tubing_id_mm = well.tubing_id_mm
+    tubing_roughness_mm = well.tubing_roughness_mm
+    tubing_length_m = profundidad_bomba  # Longitud de tubería = profundidad bomba
+    modelo_friccion = well.modelo_friccion
+
+    fluid_props = resolve_fluid_state(well_data, fluid_state).as_dict()
+    gradiente = fluid_props['gradiente']  # bar/m (MG)
+
+    caudal = np.asarray(caudal, dtype=float)
+    pwf = np.asarray(pwf, dtype=float)
+    nivel = np.zeros_like(caudal) if nivel is None else np.asarray(nivel, dtype=float)
+
+    # PIP = Pwf del IPR + presión de casing
+    pip_bar = pwf + presion_casing
+
+    p_descarga = None
+    modelo_flujo = well.modelo_flujo
+
+    if modelo_flujo != 'monofasico':
+        # Flujo multifásico en el tubing: traverse Beggs & Brill cabezal -> descarga
+        # El perfil de temperatura viene de la instalación (configuracion_pozo)
+        temperaturas = {}
+        if installation is not None:
+            temperaturas = {
+                'temp_superficie_c': installation.temp_superficie_grad,
+                'gradiente_temp_c_m': installation.gradiente_temp
+            }
+        traverse = multiphase_flow.traverse_from_well_data(well_data, caudal, **temperaturas)
+        segments = traverse['segments']
+        tf_bar = traverse['friccion_bar']
+        p_descarga = traverse['presion'][-1]
+        pd = segments.profundidad_tvd
+    else:
+        # Pozo desviado / sarta combinada: traverse segmentado (PD = TVD de la bomba)
+        segments = wellbore_traverse.segments_from_well_data(well_data)
+        if segments is not None:
+            traverse = wellbore_traverse.single_phase_traverse(
+                segments,
+                caudal,
+                fluid_props['densidad'],
+                fluid_props['viscosidad'],
+                gradiente,
+                modelo_friccion=modelo_friccion
+            )
+            tf_bar = traverse['friccion_bar']
+            pd = segments.profundidad_tvd
+        else:
+            tf_bar = calculate_friction_loss_darcy_array(
+                caudal,
+                tubing_length_m,
+                tubing_id_mm,
+                tubing_roughness_mm,
+                fluid_props['densidad'],
+                fluid_props['viscosidad'],
+                modelo_friccion
+            )
+            pd = profundidad_bomba
+
+    tf = tf_bar / gradiente
+    tp_altura = presion_superficie / gradiente
+    pip_altura = pip_bar / gradiente
+
+    if p_descarga is None:
+        # TDH = PD + Tf + TP/MG - PIP/MG
+        tdh = pd + tf + tp_altura - pip_altura
+    else:
+        # Multifásico: la bomba eleva la presión de PIP a la presión de descarga
+        tdh = (p_descarga - pip_bar) / gradiente
+
+    fluid_level_m = np.maximum(pd - pip_altura, 0.0)
+    sumergencia_m = np.maximum(pd - fluid_level_m, 0.0)
+
+    return {
+        'caudal': caudal,
+        'tdh': tdh,
+        'pip': pip_bar,
+        'pwf': pwf,
+        'nivel': nivel,
+        'fluid_level_m': fluid_level_m,
+        'sumergencia_m': sumergencia_m,
+        'perdidas_friccion': tf_bar,
+        'pd': pd,
+        'tp_bar': presion_superficie,
+        'gradiente': gradiente,
+        'segments': segments
+    }
+
+
+def compute_demand_at_flow(well_data, model, caudal, fluid_state=None, installation=None):
+    """
+    Demanda evaluada en caudales arbitrarios a partir del modelo IPR.
+
+    Usa la inversa cerrada `IPRModel.pwf_at` para obtener Pwf en cada caudal,
+    sin construir ni recorrer la lista de puntos del IPR.
+
+    Args:
+        well_data (dict): Datos del pozo e instalación
+        model (IPRModel): Modelo IPR resuelto (escalar o por lote)
+        caudal (array-like): Caudales en m³/d
+        fluid_state (FluidState): Estado del fluido compartido (opcional)
+        installation (InstallationInput): Perfil de temperatura (opcional)
+
+    Returns:
+        dict: Mismo formato que `compute_pressure_demand_arrays`
+    """
+    fluid_state = resolve_fluid_state(well_data, fluid_state)
+    pwf = model.pwf_at(caudal)
+    gradiente = fluid_state.gradiente_bar_m
+    nivel = (model.pr - pwf) / gradiente if np.all(gradiente != 0) else np.zeros_like(pwf)
+    return compute_pressure_demand_arrays(
+        well_data, caudal, pwf, nivel, fluid_state=fluid_state, installation=installation
+    )
+
+
+def pressure_demand_points(arrays):
+    """
+    Adaptador de salida: convierte los arreglos de `compute_pressure_demand_arrays`
+    en la lista de puntos (dicts redondeados) que consume el frontend.
+    """
+    pd = round(arrays['pd'], 2)
+    tp_bar = round(arrays['tp_bar'], 2)
+    columns = zip(
+        arrays['caudal'].tolist(),
+        arrays['tdh'].tolist(),
+        arrays['pip'].tolist(),
+        arrays['pwf'].tolist(),
+        arrays['nivel'].tolist(),
+        arrays['fluid_level_m'].tolist(),
+        arrays['sumergencia_m'].tolist(),
+        arrays['perdidas_friccion'].tolist()
+    )
+
+    points = []
+    for q, tdh, pip, pwf, nivel, fluid_level, sumergencia, tf_bar in columns:
+        tdh = round(tdh, 2)
+        pip = round(pip, 2)
+        points.append({
             "caudal": round(q, 2),
-            "tdh": round(tdh, 2)
+            "tdh": tdh,  # m (TDH que debe dar la bomba)
+            "head_requerido": tdh,  # Alias para compatibilidad
+            "pip": pip,  # bar (Presión de entrada = Pwf + Pcasing)
+            "p_intake": pip,  # Alias para compatibilidad
+            "pwf": round(pwf, 2),  # bar (Presión de fondo fluyente del IPR)
+            "nivel": round(nivel, 2),  # m (Nivel dinámico relativo al reservorio)
+            "fluid_level_m": round(fluid_level, 2),  # m (Nivel dinámico desde superficie)
+            "sumergencia_m": round(sumergencia, 2),  # m (Altura de fluido sobre la bomba)
+            "perdidas_friccion": round(tf_bar, 2),  # bar
+            "pd": pd,  # m (Profundidad de bomba)
+            "tp_bar": tp_bar  # bar (Presión superficie)
         })
-    
-    return system_curve
+    return points
 
 
-def calculate_pressure_demand_curve(well_data, ipr_data=None):
+def calculate_pressure_demand_curve(well_data, ipr_data=None, fluid_state=None, installation=None):
     """
     Calcula la curva de demanda de presión de la bomba (TDH vs Caudal).
     
@@ -218,10 +444,15 @@ def calculate_pressure_demand_curve(well_data, ipr_data=None):
     - A mayor Q → mayores pérdidas por fricción Tf
     
     El punto de operación es donde esta curva intercepta la curva H-Q de la bomba.
+
+    El cálculo se realiza sobre arreglos (`compute_pressure_demand_arrays`);
+    los dicts por punto se generan sólo al final para la respuesta de la API.
     
     Args:
         well_data (dict): Datos del pozo e instalación
         ipr_data (dict): Datos del IPR calculado (REQUERIDO para obtener PIP)
+        fluid_state (FluidState): Propiedades del fluido ya resueltas (opcional)
+        installation (InstallationInput): Perfil de temperatura (opcional)
     
     Returns:
         dict: {
@@ -230,98 +461,20 @@ def calculate_pressure_demand_curve(well_data, ipr_data=None):
         }
     """
     print("Calculando curva de demanda de presión de la bomba...")
-    
-    # Extraer parámetros
+
     profundidad_bomba = well_data.get('profundidad_intake', 1500)  # m (PD)
     presion_superficie = well_data.get('presion_superficie', 10)  # bar (TP)
     presion_casing = well_data.get('presion_casing', 1)  # bar (Pcasing)
-    
-    # Parámetros de tubería para cálculo de fricción
-    tubing_id_mm = well_data.get('tubing_id_mm', 62.0)  # Diámetro interno en mm
-    tubing_roughness_mm = well_data.get('tubing_roughness_mm', 0.046)  # Rugosidad en mm
-    tubing_length_m = profundidad_bomba  # Longitud de tubería = profundidad bomba
-    
-    # Calcular propiedades del fluido
-    fluid_props = calculate_fluid_properties(well_data)
-    gradiente = fluid_props['gradiente']  # bar/m (MG)
-    densidad = fluid_props['densidad']  # kg/m³
-    viscosidad = fluid_props['viscosidad']  # cP
-    
-    # Rango de caudales: DEBE COINCIDIR CON EL IPR
-    if ipr_data and 'q_max' in ipr_data:
-        q_max = ipr_data['q_max']  # m³/d del IPR calculado
-    else:
-        q_max = well_data.get('q_max_estimate', 500)  # m³/d
-    
-    n_points = well_data.get('n_points', 50)
-    
-    # Crear mapa de datos del IPR: PIP (Pwf) vs caudal
-    # PIP = Pump Intake Pressure = Pwf del IPR
-    # IMPORTANTE: Usar exactamente los MISMOS PUNTOS del IPR
-    ipr_points = []
-    if ipr_data and 'curve' in ipr_data:
-        ipr_points = ipr_data['curve']
-    
-    pressure_curve = []
-    
+
     # Usar exactamente los mismos puntos de caudal del IPR
-    for point in ipr_points:
-        q = point['caudal']  # m³/d (exactamente del IPR)
-        
-        # 1. Obtener PIP (Pump Intake Pressure) del IPR
-        #    PIP = Pwf = Presión de fondo fluyente a este caudal
-        pwf_bar = point['pwf']  # bar (del IPR)
-        pip_bar = pwf_bar + presion_casing  # bar (sumar presión de casing)
-        nivel_dinamico = point.get('nivel', 0)  # m (del IPR)
-        
-        # 2. PD: Profundidad de la bomba (Pump Depth)
-        pd = profundidad_bomba  # m
-        
-        # 3. Tf: Pérdidas por fricción usando Darcy-Weisbach
-        tf_bar = calculate_friction_loss_darcy(
-            caudal_m3d=q,
-            longitud_m=tubing_length_m,
-            diametro_interno_mm=tubing_id_mm,
-            rugosidad_mm=tubing_roughness_mm,
-            densidad_kg_m3=densidad,
-            viscosidad_cp=viscosidad
-        )
-        tf = tf_bar / gradiente  # Convertir de bar a metros
-        
-        # 4. TP: Presión en tubería en superficie (Tubing Pressure)
-        tp_bar = presion_superficie  # bar
-        tp_altura = tp_bar / gradiente  # m
-        
-        # 5. PIP: Presión de entrada a la bomba (del IPR)
-        pip_altura = pip_bar / gradiente  # m
-        
-        # FORMULA TDH (Total Dynamic Head):
-        # TDH = PD + Tf + TP/MG - PIP/MG
-        tdh = pd + tf + tp_altura - pip_altura  # m
-
-        # Nivel de fluido relativo a superficie y sumergencia
-        fluid_level_m = max(pd - pip_altura, 0.0)
-        sumergencia_m = max(pd - fluid_level_m, 0.0)
-        
-        # tf_bar ya está calculado arriba
-        
-        pressure_curve.append({
-            "caudal": round(q, 2),
-            "tdh": round(tdh, 2),  # m (TDH que debe dar la bomba)
-            "head_requerido": round(tdh, 2),  # Alias para compatibilidad
-            "pip": round(pip_bar, 2),  # bar (Presión de entrada = Pwf + Pcasing)
-            "p_intake": round(pip_bar, 2),  # Alias para compatibilidad
-            "pwf": round(pwf_bar, 2),  # bar (Presión de fondo fluyente del IPR)
-            "nivel": round(nivel_dinamico, 2),  # m (Nivel dinámico relativo al reservorio)
-            "fluid_level_m": round(fluid_level_m, 2),  # m (Nivel dinámico desde superficie)
-            "sumergencia_m": round(sumergencia_m, 2),  # m (Altura de fluido sobre la bomba)
-            "perdidas_friccion": round(tf_bar, 2),  # bar
-            "pd": round(pd, 2),  # m (Profundidad de bomba)
-            "tp_bar": round(tp_bar, 2)  # bar (Presión superficie)
-        })
-    
-    return {
-        'curve': pressure_curve,
+    caudal, pwf, nivel = _ipr_curve_arrays(ipr_data)
+    arrays = compute_pressure_demand_arrays(
+        well_data, caudal, pwf, nivel, fluid_state=fluid_state, installation=installation
+    )
+    gradiente = arrays['gradiente']
+
+    result = {
+        'curve': pressure_demand_points(arrays),
         'components': {
             'p_surface_target': presion_superficie,
             'profundidad_bomba': profundidad_bomba,
@@ -335,4 +488,9 @@ def calculate_pressure_demand_curve(well_data, ipr_data=None):
         }
     }
 
+    segments = arrays['segments']
+    if segments is not None:
+        result['components']['profundidad_bomba_tvd'] = round(segments.profundidad_tvd, 2)
+        result['components']['trayectoria'] = segments.summary()
 
+    return result
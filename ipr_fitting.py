@@ -0,0 +1,345 @@
+"""Ajuste de IPR a múltiples pruebas de pozo (mínimos cuadrados ponderados).
+
+Resuelve los parámetros de cada método a partir de N pruebas (q, Pwf) por
+pozo, para lotes de pozos a la vez. Las pruebas se pasan como matrices
+(pozos × pruebas); los pozos con menos pruebas se completan con NaN.
+
+- linear: q = J (pr - Pwf)                         -> J cerrado
+- vogel saturado (pr <= pb): q = q_max V(Pwf/pr)   -> q_max cerrado
+- vogel compuesto: q = J G(Pwf; pr, pb)            -> J cerrado
+- fetkovich: q = C (pr^n - Pwf^n)                  -> C cerrado para cada n,
+  n por búsqueda en malla + refinamiento local, vectorizado por pozo
+
+El resultado se convierte en ``well_performance.IPRModel`` y se pasa directo
+a ``calculate_ipr(well_data, model=...)``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from well_performance import IPRModel
+
+FIT_METHODS = ('linear', 'vogel', 'fetkovich')
+WEIGHT_SCHEMES = ('uniforme', 'caudal', 'drawdown')
+
+DEFAULT_N_BOUNDS = (0.5, 1.0)
+_N_GRID_POINTS = 51
+_N_REFINE_POINTS = 41
+
+WeightsInput = Union[None, str, Sequence[float], np.ndarray]
+
+
+class IPRFittingError(ValueError):
+    """Error de validación en el ajuste de IPR."""
+
+
+@dataclass(frozen=True)
+class IPRFit:
+    """Parámetros ajustados por pozo (arreglos de longitud W)."""
+
+    method: str
+    pr: np.ndarray
+    pb: np.ndarray
+    j: np.ndarray
+    q_max: np.ndarray
+    c: np.ndarray
+    n: np.ndarray
+    saturated: np.ndarray
+    rmse: np.ndarray
+    n_tests: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.pr.size)
+
+    def model(self, index: int = 0) -> IPRModel:
+        """Modelo IPR del pozo ``index`` listo para ``calculate_ipr``."""
+        if self.n_tests[index] == 0:
+            raise IPRFittingError(f"El pozo {index} no tiene pruebas válidas para ajustar.")
+
+        if self.method == 'fetkovich':
+            return IPRModel(
+                method='fetkovich',
+                label='Fetkovich (Ajuste multipunto)',
+                pr=float(self.pr[index]),
+                q_max=float(self.q_max[index]),
+                c=float(self.c[index]),
+                n=float(self.n[index])
+            )
+        if self.method == 'vogel':
+            saturated = bool(self.saturated[index])
+            label = 'Saturado' if saturated else 'Compuesta'
+            return IPRModel(
+                method='vogel',
+                label=f'Vogel (Bifásico - {label}, ajuste multipunto)',
+                pr=float(self.pr[index]),
+                q_max=float(self.q_max[index]),
+                j=float(self.j[index]),
+                pb=float(self.pb[index]),
+                saturated=saturated
+            )
+        return IPRModel(
+            method='linear',
+            label='Linear (Ajuste multipunto)',
+            pr=float(self.pr[index]),
+            q_max=float(self.q_max[index]),
+            j=float(self.j[index])
+        )
+
+    def as_dict(self, index: int = 0) -> Dict[str, Any]:
+        def value(arr):
+            v = float(arr[index])
+            return None if np.isnan(v) else round(v, 6)
+
+        return {
+            'method': self.method,
+            'pr': value(self.pr),
+            'pb': value(self.pb),
+            'j': value(self.j),
+            'q_max': value(self.q_max),
+            'c': value(self.c),
+            'n': value(self.n),
+            'rmse': value(self.rmse),
+            'n_tests': int(self.n_tests[index])
+        }
+
+
+def pad_tests(series: Iterable[Sequence[float]]) -> np.ndarray:
+    """Convierte listas de distinta longitud en una matriz completada con NaN."""
+    rows = [np.asarray(row, dtype=float).ravel() for row in series]
+    width = max((row.size for row in rows), default=0)
+    out = np.full((len(rows), width), np.nan)
+    for idx, row in enumerate(rows):
+        out[idx, :row.size] = row
+    return out
+
+
+def _as_matrix(values) -> np.ndarray:
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim == 1:
+        arr = arr[np.newaxis, :]
+    if arr.ndim != 2:
+        raise IPRFittingError('Las pruebas deben ser un vector o una matriz (pozos × pruebas).')
+    return arr
+
+
+def _per_well(values, n_wells: int, name: str) -> np.ndarray:
+    arr = np.broadcast_to(np.asarray(values, dtype=float).ravel(), (n_wells,))
+    if np.any(~np.isfinite(arr)) or np.any(arr <= 0):
+        raise IPRFittingError(f"'{name}' debe ser positivo para todos los pozos.")
+    return np.array(arr, dtype=float)
+
+
+def _resolve_weights(weights: WeightsInput, q: np.ndarray, drawdown: np.ndarray) -> np.ndarray:
+    if weights is None or (isinstance(weights, str) and weights == 'uniforme'):
+        return np.ones_like(q)
+    if isinstance(weights, str):
+        if weights == 'caudal':
+            return np.abs(q)
+        if weights == 'drawdown':
+            return np.abs(drawdown)
+        raise IPRFittingError(f"Esquema de pesos desconocido: {weights}. Opciones: {', '.join(WEIGHT_SCHEMES)}")
+    w = np.broadcast_to(_as_matrix(weights), q.shape).astype(float)
+    if np.any(w[np.isfinite(w)] < 0):
+        raise IPRFittingError('Los pesos no pueden ser negativos.')
+    return w
+
+
+def _closed_form(x: np.ndarray, q: np.ndarray, w: np.ndarray, axis: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+    """Mínimos cuadrados ponderados de q = a·x (sin ordenada); devuelve a y SSE."""
+    sxx = np.sum(w * x * x, axis=axis)
+    sxq = np.sum(w * x * q, axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = np.where(sxx > 0, sxq / sxx, np.nan)
+    residual = q - np.expand_dims(a, axis) * x
+    sse = np.sum(w * np.nan_to_num(residual) ** 2, axis=axis)
+    return a, sse
+
+
+def _vogel_shape(ratio: np.ndarray) -> np.ndarray:
+    return 1 - 0.2 * ratio - 0.8 * (ratio ** 2)
+
+
+def _fetkovich_sse(n_values: np.ndarray, pr: np.ndarray, pwf: np.ndarray, q: np.ndarray, w: np.ndarray):
+    """C y SSE para una malla de exponentes por pozo: n_values (K, W)."""
+    n_k = n_values[:, :, np.newaxis]
+    x = pr[np.newaxis, :, np.newaxis] ** n_k - pwf[np.newaxis, :, :] ** n_k
+    return _closed_form(x, q[np.newaxis], w[np.newaxis])
+
+
+def fit_ipr_batch(
+    method: str,
+    presion_reservorio,
+    q_tests,
+    pwf_tests,
+    weights: WeightsInput = None,
+    presion_burbuja=None,
+    n_bounds: Tuple[float, float] = DEFAULT_N_BOUNDS
+) -> IPRFit:
+    """
+    Ajusta el IPR de un lote de pozos por mínimos cuadrados ponderados.
+
+    Args:
+        method: 'linear', 'vogel' o 'fetkovich'
+        presion_reservorio: pr por pozo (escalar o arreglo de W)
+        q_tests: Caudales de prueba (W × T o vector de T), NaN = sin dato
+        pwf_tests: Pwf de prueba con la misma forma que q_tests
+        weights: None/'uniforme', 'caudal', 'drawdown' o matriz de pesos
+        presion_burbuja: pb por pozo (sólo Vogel; por defecto saturado, pb = pr)
+        n_bounds: Rango del exponente de Fetkovich
+
+    Returns:
+        IPRFit: Parámetros por pozo, RMSE ponderado y cantidad de pruebas usadas
+    """
+    method = (method or '').lower()
+    if method not in FIT_METHODS:
+        raise IPRFittingError(f"Método de ajuste desconocido: {method}. Opciones: {', '.join(FIT_METHODS)}")
+
+    q = _as_matrix(q_tests)
+    pwf = _as_matrix(pwf_tests)
+    if q.shape != pwf.shape:
+        raise IPRFittingError('q_tests y pwf_tests deben tener la misma forma.')
+
+    n_wells = q.shape[0]
+    pr = _per_well(presion_reservorio, n_wells, 'presion_reservorio')
+    pb = pr.copy() if presion_burbuja is None else _per_well(presion_burbuja, n_wells, 'presion_burbuja')
+
+    valid = np.isfinite(q) & np.isfinite(pwf) & (q >= 0) & (pwf >= 0) & (pwf < pr[:, np.newaxis])
+    q = np.where(valid, q, 0.0)
+    pwf = np.where(valid, pwf, 0.0)
+    drawdown = pr[:, np.newaxis] - pwf
+    w = np.where(valid, _resolve_weights(weights, q, drawdown), 0.0)
+    w = np.nan_to_num(w)
+    n_tests = np.sum(valid & (w > 0), axis=1)
+
+    nan = np.full(n_wells, np.nan)
+    saturated = np.zeros(n_wells, dtype=bool)
+    j = q_max = c = n = nan
+
+    if method == 'linear':
+        j, sse = _closed_form(drawdown, q, w)
+        q_max = j * pr
+    elif method == 'vogel':
+        saturated = pr <= pb
+        pb_col = pb[:, np.newaxis]
+        pr_col = pr[:, np.newaxis]
+        # Saturado: q = q_max V(Pwf/pr)
+        sat_shape = _vogel_shape(pwf / pr_col)
+        # Compuesto: q = J G(Pwf)
+        comp_shape = np.where(
+            pwf >= pb_col,
+            pr_col - pwf,
+            (pr_col - pb_col) + (pb_col / 1.8) * _vogel_shape(pwf / pb_col)
+        )
+        q_max_sat, sse_sat = _closed_form(sat_shape, q, w)
+        j_comp, sse_comp = _closed_form(comp_shape, q, w)
+
+        j = np.where(saturated, q_max_sat * 1.8 / pr, j_comp)
+        q_max = np.where(saturated, q_max_sat, j_comp * (pr - pb) + j_comp * pb / 1.8)
+        sse = np.where(saturated, sse_sat, sse_comp)
+    else:
+        n_min, n_max = n_bounds
+        if not 0 < n_min < n_max:
+            raise IPRFittingError('n_bounds debe cumplir 0 < n_min < n_max.')
+
+        grid = np.linspace(n_min, n_max, _N_GRID_POINTS)
+        c_grid, sse_grid = _fetkovich_sse(np.repeat(grid[:, np.newaxis], n_wells, axis=1), pr, pwf, q, w)
+        best = np.argmin(np.where(np.isfinite(c_grid), sse_grid, np.inf), axis=0)
+
+        # Refinamiento local alrededor del mejor nodo de cada pozo
+        step = grid[1] - grid[0]
+        centers = grid[best]
+        local = np.linspace(-step, step, _N_REFINE_POINTS)[:, np.newaxis] + centers[np.newaxis, :]
+        local = np.clip(local, n_min, n_max)
+        c_local, sse_local = _fetkovich_sse(local, pr, pwf, q, w)
+        best_local = np.argmin(np.where(np.isfinite(c_local), sse_local, np.inf), axis=0)
+
+        cols = np.arange(n_wells)
+        n = local[best_local, cols]
+        c = c_local[best_local, cols]
+        sse = sse_local[best_local, cols]
+        q_max = c * pr ** n
+
+    w_total = np.sum(w, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rmse = np.where(w_total > 0, np.sqrt(sse / w_total), np.nan)
+
+    no_data = n_tests == 0
+    if np.any(no_data):
+        j = np.where(no_data, np.nan, j)
+        q_max = np.where(no_data, np.nan, q_max)
+        c = np.where(no_data, np.nan, c)
+        n = np.where(no_data, np.nan, n)
+
+    return IPRFit(
+        method=method,
+        pr=pr,
+        pb=pb,
+        j=np.asarray(j, dtype=float),
+        q_max=np.asarray(q_max, dtype=float),
+        c=np.asarray(c, dtype=float),
+        n=np.asarray(n, dtype=float),
+        saturated=np.asarray(saturated, dtype=bool),
+        rmse=rmse,
+        n_tests=n_tests
+    )
+
+
+def fit_well_ipr(
+    well_data: Dict[str, Any],
+    tests: Sequence[Dict[str, float]],
+    method: Optional[str] = None,
+    weights: WeightsInput = None,
+    n_bounds: Tuple[float, float] = DEFAULT_N_BOUNDS
+) -> IPRModel:
+    """
+    Ajusta el IPR de un pozo a partir de una lista de pruebas.
+
+    Args:
+        well_data: Datos del pozo (presion_reservorio, presion_burbuja, method)
+        tests: [{'q': m³/d, 'pwf': bar, 'peso': opcional}, ...]
+        method: Método a ajustar (por defecto well_data['method'])
+
+    Returns:
+        IPRModel: Modelo para ``calculate_ipr(well_data, model=...)``
+    """
+    method = (method or well_data.get('method', 'linear')).lower()
+    if not tests:
+        raise IPRFittingError('Se requiere al menos una prueba de pozo para el ajuste.')
+
+    q = [t.get('q', t.get('caudal')) for t in tests]
+    pwf = [t.get('pwf') for t in tests]
+    if any(v is None for v in q + pwf):
+        raise IPRFittingError("Cada prueba debe incluir 'q' (o 'caudal') y 'pwf'.")
+    if weights is None and any('peso' in t for t in tests):
+        weights = [t.get('peso', 1.0) for t in tests]
+
+    pr = well_data.get('presion_reservorio', 150)
+    fit = fit_ipr_batch(
+        method,
+        pr,
+        q,
+        pwf,
+        weights=weights,
+        presion_burbuja=well_data.get('presion_burbuja', pr * 0.8) if method == 'vogel' else None,
+        n_bounds=n_bounds
+    )
+    return fit.model(0)
+
+
+def model_from_well_data(well_data: Dict[str, Any]) -> Optional[IPRModel]:
+    """
+    Modelo ajustado si ``well_data`` trae historial de pruebas.
+
+    Usa ``well_data['pruebas_pozo']`` (lista de {'q', 'pwf', 'peso'}) y el
+    esquema opcional ``well_data['pesos_ajuste']``; devuelve None si no hay
+    pruebas o si el método no admite ajuste (Darcy).
+    """
+    tests = well_data.get('pruebas_pozo')
+    method = str(well_data.get('method', 'linear')).lower()
+    if not tests or method not in FIT_METHODS:
+        return None
+    return fit_well_ipr(well_data, tests, method=method, weights=well_data.get('pesos_ajuste'))
@@ -0,0 +1,234 @@
+"""Recalculo en vivo por Server-Sent Events sobre sesiones de diseño.
+
+El cliente abre ``GET /api/design_sessions/<id>/stream`` (``text/event-stream``)
+y envía los cambios de parámetros (frecuencia, etapas, presión de boca de
+pozo, ...) con ``POST /api/design_sessions/<id>/deltas``, que responde de
+inmediato. Los deltas se acumulan en un ``LiveChannel``:
+
+- ráfagas de deltas que llegan mientras se calcula se combinan en un único
+  patch (merge patch, gana el último valor de cada campo);
+- los estados intermedios nunca se calculan: a lo sumo hay un cálculo en
+  curso por sesión y el siguiente usa el estado más reciente;
+- cada evento ``update`` lleva el punto de operación y el resumen eléctrico
+  del caso base y de los escenarios (no las curvas completas), la versión
+  del último delta aplicado y ``pending`` si ya llegaron deltas más nuevos.
+
+Cada canal admite un solo stream a la vez (``attach``): un segundo stream
+sobre la misma sesión se rechaza en lugar de repartirse los deltas. Los
+canales se descartan cuando la sesión deja el store (cierre, TTL o
+capacidad, vía ``SessionStore(on_discard=...)``) y el stream termina.
+
+Formato de eventos::
+
+    event: update
+    id: <versión>
+    data: {"version": 3, "pending": false, "base": {...}, "scenarios": {...}, ...}
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+from design_sessions import SessionNotFoundError, SessionStore, merge_patch
+
+HEARTBEAT_SECONDS = 15.0
+ELECTRICAL_FIELDS = (
+    'P_motor_kW',
+    'I_motor',
+    'V_op',
+    'Motor_Load_Percent',
+    'P_perdida_kW',
+    'V_superficie',
+    'P_superficie_kW',
+    'P_superficie_kVA',
+    'PF_superficie',
+    'Eff_Sistema',
+    'Energy_Index',
+)
+
+
+class LiveChannel:
+    """Deltas pendientes de una sesión, coalescidos (latest-wins)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._version = 0
+        self._applied_version = 0
+        self._closed = False
+        self._consumer: Optional[object] = None
+        self.received = 0
+        self.coalesced = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def applied_version(self) -> int:
+        """Versión del último patch retirado con ``take``."""
+        return self._applied_version
+
+    @property
+    def has_pending(self) -> bool:
+        with self._cond:
+            return self._pending is not None
+
+    def push(self, patch: Mapping[str, Any]) -> int:
+        """Agrega un delta; si hay otro sin procesar se combinan. Devuelve la versión."""
+        with self._cond:
+            if self._pending is None:
+                self._pending = merge_patch({}, patch)
+            else:
+                self._pending = merge_patch(self._pending, patch)
+                self.coalesced += 1
+            self._version += 1
+            self.received += 1
+            self._cond.notify_all()
+            return self._version
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Espera y retira el patch combinado pendiente.
+
+        Returns:
+            tuple: (patch, versión) o None si venció el timeout o se cerró el canal
+        """
+        with self._cond:
+            if self._pending is None and not self._closed:
+                self._cond.wait(timeout)
+            if self._pending is None:
+                return None
+            patch, self._pending = self._pending, None
+            self._applied_version = self._version
+            return patch, self._version
+
+    def attach(self) -> Optional[object]:
+        """
+        Registra el único stream que consume el canal.
+
+        Returns:
+            Token para ``detach`` o None si ya hay un stream conectado
+        """
+        with self._cond:
+            if self._consumer is not None:
+                return None
+            self._consumer = object()
+            return self._consumer
+
+    def detach(self, token: Optional[object]) -> None:
+        """Libera el canal si ``token`` es el del stream conectado."""
+        with self._cond:
+            if token is not None and self._consumer is token:
+                self._consumer = None
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class LiveChannelRegistry:
+    """Un canal por sesión de diseño."""
+
+    def __init__(self):
+        self._channels: Dict[str, LiveChannel] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> LiveChannel:
+        with self._lock:
+            channel = self._channels.get(session_id)
+            if channel is None or channel.closed:
+                channel = self._channels[session_id] = LiveChannel()
+            return channel
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            channel = self._channels.pop(session_id, None)
+        if channel is not None:
+            channel.close()
+
+
+def _scenario_summary(electrical: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    electrical = electrical or {}
+    return {
+        'operating_point': (electrical.get('metadata') or {}).get('operating_point'),
+        'electrical': {name: electrical.get(name) for name in ELECTRICAL_FIELDS},
+        'warnings': electrical.get('warnings') or []
+    }
+
+
+def summarize_conditions(response: Mapping[str, Any]) -> Dict[str, Any]:
+    """Resumen compacto (punto de operación y eléctrico) de calculate_conditions."""
+    return {
+        'base': _scenario_summary(response.get('electrical_data')),
+        'scenarios': {
+            key: _scenario_summary(electrical)
+            for key, electrical in (response.get('electrical_scenarios') or {}).items()
+        },
+        'recalculated_nodes': response.get('recalculated_nodes')
+    }
+
+
+def format_event(event: str, data: Mapping[str, Any], event_id: Optional[int] = None) -> str:
+    """Serializa un evento SSE."""
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append('data: ' + json.dumps(data, default=str))
+    return '\n'.join(lines) + '\n\n'
+
+
+def stream_updates(
+    store: SessionStore,
+    session_id: str,
+    channel: LiveChannel,
+    compute: Callable[[Mapping[str, Any], Any], Mapping[str, Any]],
+    heartbeat_seconds: float = HEARTBEAT_SECONDS
+) -> Iterator[str]:
+    """
+    Generador SSE: estado inicial y luego un ``update`` por cada lote de deltas.
+
+    Args:
+        store: Sesiones de diseño
+        session_id: Sesión a seguir
+        channel: Canal de deltas de la sesión
+        compute: ``compute(payload, graph)`` → cuerpo de calculate_conditions
+        heartbeat_seconds: Intervalo de comentarios keepalive sin deltas
+    """
+    def _update(payload, graph, version):
+        try:
+            data = summarize_conditions(compute(payload, graph))
+        except Exception as exc:
+            return format_event('error', {'version': version, 'error': str(exc)}, version)
+        data.update(version=version, pending=channel.has_pending)
+        return format_event('update', data, version)
+
+    try:
+        session = store.get(session_id)
+    except SessionNotFoundError:
+        yield format_event('error', {'error': 'Sesión inexistente o expirada.'})
+        return
+    yield _update(session.payload, session.graph, channel.applied_version)
+
+    while not channel.closed:
+        item = channel.take(heartbeat_seconds)
+        if item is None:
+            if not store.contains(session_id):
+                yield format_event('error', {'error': 'Sesión inexistente o expirada.'})
+                return
+            yield ': keepalive\n\n'
+            continue
+        patch, version = item
+        try:
+            session = store.update(session_id, patch)
+        except SessionNotFoundError:
+            yield format_event('error', {'version': version, 'error': 'Sesión inexistente o expirada.'}, version)
+            return
+        yield _update(session.payload, session.graph, version)
@@ -0,0 +1,231 @@
+"""Análisis de incertidumbre Monte Carlo del punto de operación.
+
+Muestrea parámetros del pozo (presión de reservorio, IP / datos de prueba,
+corte de agua, API, ...) desde distribuciones y evalúa todas las
+realizaciones con ``batch_evaluation`` (IPR → demanda → punto de operación →
+eléctrico) en forma vectorizada. Opcionalmente reparte bloques de
+realizaciones en un pool de procesos.
+
+Los percentiles reportados son estadísticos: P10 es el percentil 10 (valor
+superado por el 90 % de las realizaciones), P90 el percentil 90.
+
+Formato de distribuciones::
+
+    {
+        "presion_reservorio": {"tipo": "normal", "media": 150, "desvio": 10},
+        "agua_porcentaje": {"tipo": "uniforme", "min": 30, "max": 60},
+        "pi": {"tipo": "triangular", "min": 1.5, "moda": 2.5, "max": 3.0},
+        "grado_api": {"tipo": "lognormal", "media": 28, "desvio": 2}
+    }
+
+``lognormal`` usa media y desvío de la variable (no del logaritmo). Se
+aceptan ``limite_min``/``limite_max`` opcionales para recortar valores.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+import batch_evaluation
+
+DISTRIBUTION_TYPES = ('normal', 'uniforme', 'triangular', 'lognormal', 'fijo')
+REPORTED_OUTPUTS = ('q_m3d', 'P_superficie_kW', 'Motor_Load_Percent')
+PERCENTILES = (10, 50, 90)
+
+DEFAULT_REALIZATIONS = 2000
+MAX_REALIZATIONS = 200000
+WORKERS_ENV = 'BES_MC_WORKERS'
+MIN_CHUNK_SIZE = 2000
+
+# Límites físicos aplicados después del muestreo
+_PHYSICAL_BOUNDS = {
+    'agua_porcentaje': (0.0, 100.0),
+    'presion_reservorio': (1e-3, None),
+    'pi': (1e-6, None),
+    'q_test': (0.0, None),
+    'pwf_test': (0.0, None),
+    'presion_burbuja': (0.0, None),
+    'grado_api': (1.0, None),
+    'n_exponent': (0.1, 1.5),
+    'presion_superficie': (0.0, None),
+    'presion_casing': (0.0, None),
+    'viscosidad': (1e-3, None),
+    'gravedad_especifica_agua': (0.9, 1.3),
+}
+
+
+class MonteCarloError(ValueError):
+    """Error de validación para el análisis Monte Carlo."""
+
+
+def _number(spec: Mapping[str, Any], key: str, name: str) -> float:
+    try:
+        return float(spec[key])
+    except KeyError as exc:
+        raise MonteCarloError(f"Distribución de '{name}': falta '{key}'.") from exc
+    except (TypeError, ValueError) as exc:
+        raise MonteCarloError(f"Distribución de '{name}': '{key}' debe ser numérico.") from exc
+
+
+def sample_parameter(name: str, spec: Mapping[str, Any], size: int, rng: np.random.Generator) -> np.ndarray:
+    """Muestrea ``size`` valores de un parámetro según su especificación."""
+    kind = str(spec.get('tipo', 'normal')).lower()
+
+    if kind == 'normal':
+        values = rng.normal(_number(spec, 'media', name), _number(spec, 'desvio', name), size)
+    elif kind == 'uniforme':
+        low, high = _number(spec, 'min', name), _number(spec, 'max', name)
+        if high < low:
+            raise MonteCarloError(f"Distribución de '{name}': max < min.")
+        values = rng.uniform(low, high, size)
+    elif kind == 'triangular':
+        low, mode, high = _number(spec, 'min', name), _number(spec, 'moda', name), _number(spec, 'max', name)
+        if not low <= mode <= high or low == high:
+            raise MonteCarloError(f"Distribución de '{name}': se requiere min <= moda <= max.")
+        values = rng.triangular(low, mode, high, size)
+    elif kind == 'lognormal':
+        mean, std = _number(spec, 'media', name), _number(spec, 'desvio', name)
+        if mean <= 0 or std < 0:
+            raise MonteCarloError(f"Distribución de '{name}': media > 0 y desvío >= 0.")
+        sigma2 = np.log1p((std / mean) ** 2)
+        values = rng.lognormal(np.log(mean) - sigma2 / 2.0, np.sqrt(sigma2), size)
+    elif kind == 'fijo':
+        values = np.full(size, _number(spec, 'valor', name))
+    else:
+        raise MonteCarloError(
+            f"Distribución de '{name}': tipo '{kind}' no soportado. Opciones: {', '.join(DISTRIBUTION_TYPES)}"
+        )
+
+    low, high = _PHYSICAL_BOUNDS.get(name, (None, None))
+    low = spec.get('limite_min', low)
+    high = spec.get('limite_max', high)
+    if low is not None or high is not None:
+        values = np.clip(values, low, high)
+    return values
+
+
+def sample_inputs(distributions: Mapping[str, Mapping[str, Any]], size: int, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Muestrea todas las distribuciones (orden determinista por nombre)."""
+    unknown = sorted(set(distributions) - set(batch_evaluation.BATCH_PARAMETERS))
+    if unknown:
+        raise MonteCarloError(
+            f"Parámetros no muestreables: {', '.join(unknown)}. "
+            f"Opciones: {', '.join(batch_evaluation.BATCH_PARAMETERS)}"
+        )
+    rng = np.random.default_rng(seed)
+    samples = {name: sample_parameter(name, distributions[name], size, rng) for name in sorted(distributions)}
+
+    # Pwf de prueba por debajo de la presión de reservorio muestreada
+    if 'pwf_test' in samples and 'presion_reservorio' in samples:
+        samples['pwf_test'] = np.minimum(samples['pwf_test'], samples['presion_reservorio'] * 0.999)
+    return samples
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """Cantidad de procesos: argumento explícito, variable BES_MC_WORKERS o 1."""
+    if workers is None:
+        try:
+            workers = int(os.environ.get(WORKERS_ENV, '1'))
+        except ValueError:
+            workers = 1
+    return max(int(workers), 1)
+
+
+def _split(samples: Dict[str, np.ndarray], size: int, n_chunks: int):
+    bounds = np.linspace(0, size, n_chunks + 1).astype(int)
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        yield {name: values[start:stop] for name, values in samples.items()}
+
+
+def evaluate_samples(
+    context: batch_evaluation.BatchContext,
+    samples: Dict[str, np.ndarray],
+    size: int,
+    freq_hz: float,
+    workers: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """Evalúa las realizaciones en este proceso o en un pool por bloques."""
+    workers = resolve_workers(workers)
+    n_chunks = min(workers, max(size // MIN_CHUNK_SIZE, 1))
+    if n_chunks <= 1:
+        return batch_evaluation.evaluate_batch(context, samples, freq_hz)
+
+    tasks = [(context, chunk, freq_hz) for chunk in _split(samples, size, n_chunks)]
+    with ProcessPoolExecutor(max_workers=n_chunks) as pool:
+        parts = list(pool.map(batch_evaluation.evaluate_chunk, tasks))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def summarize(values: np.ndarray, mask: np.ndarray) -> Optional[Dict[str, float]]:
+    selected = values[mask & np.isfinite(values)]
+    if selected.size == 0:
+        return None
+    p10, p50, p90 = np.percentile(selected, PERCENTILES)
+    return {
+        'p10': round(float(p10), 3),
+        'p50': round(float(p50), 3),
+        'p90': round(float(p90), 3),
+        'media': round(float(selected.mean()), 3),
+        'desvio': round(float(selected.std()), 3),
+    }
+
+
+def run_monte_carlo(
+    well_data: Dict[str, Any],
+    pump_config: Dict[str, Any],
+    motor_config: Dict[str, Any],
+    cable_config: Dict[str, Any],
+    configuracion_pozo: Dict[str, Any],
+    distributions: Mapping[str, Mapping[str, Any]],
+    n_realizations: int = DEFAULT_REALIZATIONS,
+    freq_hz: float = 50.0,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Ejecuta el análisis Monte Carlo del punto de operación.
+
+    Returns:
+        dict: {
+            'n_realizations', 'n_converged', 'fraction_converged',
+            'percentiles': {salida: {'p10', 'p50', 'p90', 'media', 'desvio'}},
+            'motor_overload_probability': fracción con carga de motor > 100 %
+        }
+    """
+    try:
+        n_realizations = int(n_realizations)
+    except (TypeError, ValueError) as exc:
+        raise MonteCarloError('n_realizations debe ser entero.') from exc
+    if not 1 <= n_realizations <= MAX_REALIZATIONS:
+        raise MonteCarloError(f'n_realizations debe estar entre 1 y {MAX_REALIZATIONS}.')
+    if not distributions:
+        raise MonteCarloError('Se requiere al menos una distribución de parámetros.')
+
+    try:
+        context = batch_evaluation.build_batch_context(
+            well_data, pump_config, motor_config, cable_config, configuracion_pozo
+        )
+    except batch_evaluation.BatchEvaluationError as exc:
+        raise MonteCarloError(str(exc)) from exc
+
+    samples = sample_inputs(distributions, n_realizations, seed)
+    results = evaluate_samples(context, samples, n_realizations, freq_hz, workers)
+
+    found = results['found']
+    n_converged = int(found.sum())
+    load = results['Motor_Load_Percent']
+
+    return {
+        'n_realizations': n_realizations,
+        'n_converged': n_converged,
+        'fraction_converged': round(n_converged / n_realizations, 4),
+        'freq_hz': freq_hz,
+        'seed': seed,
+        'percentiles': {name: summarize(results[name], found) for name in REPORTED_OUTPUTS},
+        'motor_overload_probability': round(float(np.mean(load[found] > 100.0)), 4) if n_converged else None,
+        'sampled_parameters': sorted(samples)
+    }
@@ -0,0 +1,406 @@
+"""Flujo multifásico vertical en el tubing (correlación de Beggs & Brill).
+
+Calcula el traverse de presión desde el cabezal hasta la descarga de la
+bomba cuando hay gas libre en el tubing (presión por debajo de burbuja).
+El avance es segmento a segmento (las propiedades dependen de la presión),
+pero cada segmento evalúa todos los caudales de la curva de demanda a la
+vez. Las propiedades PVT se tabulan una vez por temperatura de segmento y
+se memoizan, de modo que escenarios y barridos con el mismo fluido
+reutilizan las tablas.
+
+PVT black-oil (correlaciones de campo, convertidas desde unidades métricas):
+- Rs y presión de burbuja: Standing (calibrado a ``presion_burbuja`` si se da)
+- Bo: Standing
+- Z: Papay con propiedades pseudo-críticas de Sutton
+- Viscosidad de gas: Lee-Gonzalez-Eakin
+- Viscosidad de petróleo vivo: Beggs-Robinson sobre la viscosidad muerta
+  (``viscosidad`` del pozo o Beggs-Robinson si no se informa)
+
+Simplificaciones: se desprecia el término de aceleración y se usa una
+tensión superficial constante para el número de velocidad del líquido.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+import friction_factor
+import wellbore_traverse
+
+MULTIPHASE_MODELS = ('beggs_brill',)
+
+G = 9.81
+AIR_DENSITY_STD = 1.225  # kg/m³
+WATER_DENSITY_STD = 1000.0  # kg/m³
+BAR_TO_PSI = 14.5038
+ATM_PSIA = 14.696
+M3M3_TO_SCF_STB = 5.6146
+SURFACE_TENSION_N_M = 0.03
+WATER_VISCOSITY_CP = 0.6
+
+DEFAULT_SEGMENT_M = 50.0
+_PVT_TABLE_POINTS = 120
+
+
+class MultiphaseFlowError(ValueError):
+    """Error de validación para el cálculo multifásico."""
+
+
+@dataclass(frozen=True)
+class FluidPVT:
+    """Datos de entrada PVT (hashables, usados como clave de caché)."""
+
+    grado_api: float
+    gravedad_gas: float
+    gor_m3m3: float
+    fraccion_agua: float
+    gravedad_especifica_agua: float
+    presion_burbuja_bar: Optional[float]
+    viscosidad_muerta_cp: Optional[float]
+
+    @property
+    def gravedad_oil(self) -> float:
+        return 141.5 / (131.5 + self.grado_api)
+
+
+def pvt_from_well_data(well_data: Dict[str, Any]) -> FluidPVT:
+    """Construye los datos PVT a partir de ``well_data``."""
+    pb = well_data.get('presion_burbuja')
+    viscosidad = well_data.get('viscosidad')
+    return FluidPVT(
+        grado_api=float(well_data.get('grado_api', 30)),
+        gravedad_gas=float(well_data.get('gravedad_gas', 0.65)),
+        gor_m3m3=max(float(well_data.get('gor', 100)), 0.0),
+        fraccion_agua=float(well_data.get('agua_porcentaje', 0)) / 100.0,
+        gravedad_especifica_agua=float(well_data.get('gravedad_especifica_agua', 1.0)),
+        presion_burbuja_bar=float(pb) if pb is not None else None,
+        viscosidad_muerta_cp=float(viscosidad) if viscosidad is not None else None
+    )
+
+
+def _standing_rs_scf(p_psia, t_f: float, pvt: FluidPVT):
+    exponent = 0.0125 * pvt.grado_api - 0.00091 * t_f
+    return pvt.gravedad_gas * ((p_psia / 18.2 + 1.4) * 10.0 ** exponent) ** 1.2048
+
+
+def _standing_pb_psia(rs_scf: float, t_f: float, pvt: FluidPVT) -> float:
+    if rs_scf <= 0:
+        return ATM_PSIA
+    exponent = 0.00091 * t_f - 0.0125 * pvt.grado_api
+    return 18.2 * ((rs_scf / pvt.gravedad_gas) ** 0.83 * 10.0 ** exponent - 1.4)
+
+
+def _z_factor_papay(p_psia, t_r: float, gravedad_gas: float):
+    tpc = 169.2 + 349.5 * gravedad_gas - 74.0 * gravedad_gas ** 2
+    ppc = 756.8 - 131.0 * gravedad_gas - 3.6 * gravedad_gas ** 2
+    tpr = t_r / tpc
+    ppr = p_psia / ppc
+    z = 1.0 - 3.52 * ppr / (10.0 ** (0.9813 * tpr)) + 0.274 * ppr ** 2 / (10.0 ** (0.8157 * tpr))
+    return np.maximum(z, 0.05)
+
+
+def _gas_viscosity_lge(rho_g_kg_m3, t_r: float, gravedad_gas: float):
+    mw = 28.97 * gravedad_gas
+    k = (9.4 + 0.02 * mw) * t_r ** 1.5 / (209.0 + 19.0 * mw + t_r)
+    x = 3.5 + 986.0 / t_r + 0.01 * mw
+    y = 2.4 - 0.2 * x
+    rho_g_gcc = rho_g_kg_m3 / 1000.0
+    return 1e-4 * k * np.exp(x * rho_g_gcc ** y)
+
+
+def _dead_oil_viscosity(t_f: float, pvt: FluidPVT) -> float:
+    if pvt.viscosidad_muerta_cp is not None and pvt.viscosidad_muerta_cp > 0:
+        return pvt.viscosidad_muerta_cp
+    x = t_f ** -1.163 * math.exp(6.9824 - 0.04658 * pvt.grado_api)
+    return 10.0 ** x - 1.0
+
+
+@dataclass(frozen=True)
+class PVTTable:
+    """Propiedades PVT tabuladas contra presión a temperatura fija."""
+
+    presion_bar: np.ndarray
+    rs_m3m3: np.ndarray
+    bo: np.ndarray
+    bg: np.ndarray
+    rho_oil: np.ndarray
+    rho_gas: np.ndarray
+    mu_oil: np.ndarray
+    mu_gas: np.ndarray
+
+    def at(self, presion_bar) -> Dict[str, np.ndarray]:
+        p = np.clip(presion_bar, self.presion_bar[0], self.presion_bar[-1])
+        return {
+            name: np.interp(p, self.presion_bar, getattr(self, name))
+            for name in ('rs_m3m3', 'bo', 'bg', 'rho_oil', 'rho_gas', 'mu_oil', 'mu_gas')
+        }
+
+
+@lru_cache(maxsize=256)
+def pvt_table(pvt: FluidPVT, temperatura_c: float, presion_max_bar: float) -> PVTTable:
+    """Tabla PVT memoizada por (fluido, temperatura del segmento, rango de presión)."""
+    t_f = temperatura_c * 9.0 / 5.0 + 32.0
+    t_r = t_f + 459.67
+    presion = np.linspace(0.0, presion_max_bar, _PVT_TABLE_POINTS)
+    p_psia = presion * BAR_TO_PSI + ATM_PSIA
+
+    gor_scf = pvt.gor_m3m3 * M3M3_TO_SCF_STB
+    rs_standing = _standing_rs_scf(p_psia, t_f, pvt)
+    if pvt.presion_burbuja_bar is not None and pvt.presion_burbuja_bar > 0:
+        pb_psia = pvt.presion_burbuja_bar * BAR_TO_PSI + ATM_PSIA
+        rs_scf = gor_scf * rs_standing / _standing_rs_scf(pb_psia, t_f, pvt)
+    else:
+        pb_psia = _standing_pb_psia(gor_scf, t_f, pvt)
+        rs_scf = rs_standing
+    rs_scf = np.where(p_psia >= pb_psia, gor_scf, np.minimum(rs_scf, gor_scf))
+
+    gamma_o = pvt.gravedad_oil
+    bo = 0.9759 + 0.00012 * (rs_scf * math.sqrt(pvt.gravedad_gas / gamma_o) + 1.25 * t_f) ** 1.2
+    z = _z_factor_papay(p_psia, t_r, pvt.gravedad_gas)
+    bg = 0.02827 * z * t_r / p_psia  # m³/m³ (= rcf/scf)
+
+    rs_m3m3 = rs_scf / M3M3_TO_SCF_STB
+    rho_gas_std = AIR_DENSITY_STD * pvt.gravedad_gas
+    rho_oil = (WATER_DENSITY_STD * gamma_o + rho_gas_std * rs_m3m3) / bo
+    rho_gas = rho_gas_std / bg
+
+    mu_dead = _dead_oil_viscosity(t_f, pvt)
+    a = 10.715 * (rs_scf + 100.0) ** -0.515
+    b = 5.44 * (rs_scf + 150.0) ** -0.338
+    mu_oil = a * mu_dead ** b
+    mu_gas = _gas_viscosity_lge(rho_gas, t_r, pvt.gravedad_gas)
+
+    return PVTTable(
+        presion_bar=presion,
+        rs_m3m3=rs_m3m3,
+        bo=bo,
+        bg=bg,
+        rho_oil=rho_oil,
+        rho_gas=rho_gas,
+        mu_oil=mu_oil,
+        mu_gas=mu_gas
+    )
+
+
+def _flow_pattern_holdup(lambda_l, n_fr, n_lv, sin_theta):
+    """Holdup de líquido de Beggs & Brill (inclinado) para arreglos."""
+    lam = np.clip(lambda_l, 1e-9, 1.0)
+    l1 = 316.0 * lam ** 0.302
+    l2 = 0.0009252 * lam ** -2.4684
+    l3 = 0.1 * lam ** -1.4516
+    l4 = 0.5 * lam ** -6.738
+
+    segregated = ((lam < 0.01) & (n_fr < l1)) | ((lam >= 0.01) & (n_fr < l2))
+    transition = (lam >= 0.01) & (n_fr >= l2) & (n_fr <= l3)
+    distributed = ((lam < 0.4) & (n_fr >= l1)) | ((lam >= 0.4) & (n_fr > l4))
+    intermittent = ~(segregated | transition | distributed)
+
+    angle_term = np.sin(np.arcsin(np.clip(sin_theta, -1.0, 1.0)) * 1.8)
+    psi_angle = angle_term - 0.333 * angle_term ** 3
+
+    def holdup(a, b, c, coeffs):
+        hl0 = np.maximum(a * lam ** b / np.maximum(n_fr, 1e-12) ** c, lam)
+        if coeffs is None:
+            return hl0
+        e, f, g, h = coeffs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = (1.0 - lam) * np.log(e * lam ** f * np.maximum(n_lv, 1e-12) ** g * np.maximum(n_fr, 1e-12) ** h)
+        corr = np.maximum(np.nan_to_num(corr, nan=0.0, neginf=0.0, posinf=0.0), 0.0)
+        return np.clip(hl0 * (1.0 + corr * psi_angle), lam, 1.0)
+
+    hl_seg = holdup(0.98, 0.4846, 0.0868, (0.011, -3.768, 3.539, -1.614))
+    hl_int = holdup(0.845, 0.5351, 0.0173, (2.96, 0.305, -0.4473, 0.0978))
+    hl_dis = holdup(1.065, 0.5824, 0.0609, None)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.clip((l3 - n_fr) / (l3 - l2), 0.0, 1.0)
+    hl_trans = weight * hl_seg + (1.0 - weight) * hl_int
+
+    return np.select(
+        [segregated, transition, intermittent],
+        [hl_seg, hl_trans, hl_int],
+        default=hl_dis
+    )
+
+
+def beggs_brill_gradient(
+    presion_bar,
+    caudales_m3d,
+    table: PVTTable,
+    pvt: FluidPVT,
+    id_mm: float,
+    rugosidad_mm: float,
+    sin_theta: float,
+    modelo_friccion: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Gradiente de presión (bar/m) por elevación y fricción para todos los caudales.
+
+    Args:
+        presion_bar: Presión en el segmento para cada caudal (arreglo)
+        caudales_m3d: Caudal de líquido en condiciones de superficie (arreglo)
+        table: Tabla PVT a la temperatura del segmento
+        sin_theta: Seno del ángulo respecto de la horizontal (1 = vertical)
+    """
+    q = np.asarray(caudales_m3d, dtype=float)
+    props = table.at(presion_bar)
+
+    q_oil = q * (1.0 - pvt.fraccion_agua) / 86400.0
+    q_water = q * pvt.fraccion_agua / 86400.0
+    q_oil_insitu = q_oil * props['bo']
+    free_gas = np.maximum(pvt.gor_m3m3 - props['rs_m3m3'], 0.0)
+    q_gas_insitu = q_oil * free_gas * props['bg']
+
+    d_m = id_mm / 1000.0
+    area = math.pi * d_m ** 2 / 4.0
+    v_sl = (q_oil_insitu + q_water) / area
+    v_sg = q_gas_insitu / area
+    v_m = v_sl + v_sg
+
+    rho_water = WATER_DENSITY_STD * pvt.gravedad_especifica_agua
+    liquid_volume = q_oil_insitu + q_water
+    with np.errstate(divide='ignore', invalid='ignore'):
+        oil_fraction = np.where(liquid_volume > 0, q_oil_insitu / liquid_volume, 1.0 - pvt.fraccion_agua)
+        lambda_l = np.where(v_m > 0, v_sl / v_m, 1.0)
+    rho_l = props['rho_oil'] * oil_fraction + rho_water * (1.0 - oil_fraction)
+    mu_l = props['mu_oil'] * oil_fraction + WATER_VISCOSITY_CP * (1.0 - oil_fraction)
+
+    n_fr = v_m ** 2 / (G * d_m)
+    n_lv = v_sl * (rho_l / (G * SURFACE_TENSION_N_M)) ** 0.25
+    h_l = np.where(lambda_l >= 1.0, 1.0, _flow_pattern_holdup(lambda_l, n_fr, n_lv, sin_theta))
+
+    rho_s = rho_l * h_l + props['rho_gas'] * (1.0 - h_l)
+    rho_n = rho_l * lambda_l + props['rho_gas'] * (1.0 - lambda_l)
+    mu_n = mu_l * lambda_l + props['mu_gas'] * (1.0 - lambda_l)
+
+    reynolds = rho_n * v_m * d_m / (mu_n * 0.001)
+    f_n = friction_factor.darcy_friction_factor(reynolds, id_mm, rugosidad_mm, modelo_friccion)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = lambda_l / h_l ** 2
+        ln_y = np.log(np.where(y > 0, y, 1.0))
+        s = ln_y / (-0.0523 + 3.182 * ln_y - 0.8725 * ln_y ** 2 + 0.01853 * ln_y ** 4)
+        s = np.where((y > 1.0) & (y < 1.2), np.log(2.2 * y - 1.2), s)
+    s = np.nan_to_num(s, nan=0.0, posinf=0.0, neginf=0.0)
+    f_tp = f_n * np.exp(s)
+
+    grad_elevacion = rho_s * G * sin_theta / 1e5
+    grad_friccion = np.where(v_m > 0, f_tp * rho_n * v_m ** 2 / (2.0 * d_m) / 1e5, 0.0)
+
+    return {
+        'elevacion': grad_elevacion,
+        'friccion': grad_friccion,
+        'holdup': h_l,
+        'rho_liquido': rho_l
+    }
+
+
+def multiphase_traverse(
+    segments: wellbore_traverse.WellboreSegments,
+    caudales_m3d,
+    pvt: FluidPVT,
+    presion_cabezal_bar: float,
+    temp_superficie_c: float = 15.0,
+    gradiente_temp_c_m: float = 0.0425,
+    modelo_friccion: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Traverse de presión de cabezal a descarga de bomba con Beggs & Brill.
+
+    Avanza segmento a segmento con predictor-corrector; en cada segmento se
+    evalúan todos los caudales a la vez.
+
+    Returns:
+        dict: 'presion' (S+1, N), 'friccion_bar' (N,), 'hidrostatica_bar' (N,),
+              'holdup' (S, N), 'md' y 'tvd' de los nodos
+    """
+    q = np.asarray(caudales_m3d, dtype=float)
+    n_seg = segments.md_top.size
+    presion = np.empty((n_seg + 1, q.size))
+    holdup = np.empty((n_seg, q.size))
+    presion[0] = presion_cabezal_bar
+    friccion_total = np.zeros(q.size)
+    elevacion_total = np.zeros(q.size)
+
+    longitudes = segments.longitud_m
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sin_thetas = np.where(longitudes > 0, segments.delta_tvd_m / longitudes, 1.0)
+    tvd_mid = (segments.tvd_top + segments.tvd_base) / 2.0
+
+    # Rango de la tabla PVT: cota superior de la presión de descarga (columna de agua)
+    p_max = max(presion_cabezal_bar + 0.12 * segments.profundidad_md * 2.0, presion_cabezal_bar + 50.0)
+    p_max = float(math.ceil(p_max / 50.0) * 50.0)
+
+    for idx in range(n_seg):
+        temperatura = round(temp_superficie_c + gradiente_temp_c_m * tvd_mid[idx], 1)
+        table = pvt_table(pvt, temperatura, p_max)
+        args = (table, pvt, float(segments.id_mm[idx]), float(segments.rugosidad_mm[idx]), float(sin_thetas[idx]), modelo_friccion)
+
+        p_in = presion[idx]
+        first = beggs_brill_gradient(p_in, q, *args)
+        p_mid = p_in + 0.5 * (first['elevacion'] + first['friccion']) * longitudes[idx]
+        mid = beggs_brill_gradient(p_mid, q, *args)
+
+        dp_elev = mid['elevacion'] * longitudes[idx]
+        dp_fric = mid['friccion'] * longitudes[idx]
+        presion[idx + 1] = p_in + dp_elev + dp_fric
+        holdup[idx] = mid['holdup']
+        friccion_total += dp_fric
+        elevacion_total += dp_elev
+
+    return {
+        'presion': presion,
+        'friccion_bar': friccion_total,
+        'hidrostatica_bar': elevacion_total,
+        'holdup': holdup,
+        'md': np.append(segments.md_top, segments.profundidad_md),
+        'tvd': np.append(segments.tvd_top, segments.profundidad_tvd)
+    }
+
+
+def traverse_from_well_data(
+    well_data: Dict[str, Any],
+    caudales_m3d,
+    segment_m: float = DEFAULT_SEGMENT_M,
+    temp_superficie_c: Optional[float] = None,
+    gradiente_temp_c_m: Optional[float] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Traverse multifásico para la curva de demanda a partir de ``well_data``.
+
+    El perfil de temperatura es el de la instalación (``configuracion_pozo``);
+    si no se pasa, se usan las claves de ``well_data`` o los defaults.
+    """
+    model = str(well_data.get('modelo_flujo', 'beggs_brill')).lower()
+    if model not in MULTIPHASE_MODELS:
+        raise MultiphaseFlowError(f"Modelo de flujo multifásico desconocido: {model}")
+
+    segments = wellbore_traverse.segments_from_well_data(well_data, max_segment_m=segment_m)
+    if segments is None:
+        segments = wellbore_traverse.build_segments(
+            well_data.get('profundidad_intake', 1500),
+            default_id_mm=well_data.get('tubing_id_mm', 62.0),
+            default_roughness_mm=well_data.get('tubing_roughness_mm', 0.046),
+            max_segment_m=segment_m
+        )
+
+    result = multiphase_traverse(
+        segments,
+        caudales_m3d,
+        pvt_from_well_data(well_data),
+        float(well_data.get('presion_superficie', 10)),
+        temp_superficie_c=float(
+            temp_superficie_c if temp_superficie_c is not None else well_data.get('temp_superficie_grad', 15.0)
+        ),
+        gradiente_temp_c_m=float(
+            gradiente_temp_c_m if gradiente_temp_c_m is not None else well_data.get('gradiente_temp', 0.0425)
+        ),
+        modelo_friccion=well_data.get('modelo_friccion')
+    )
+    result['segments'] = segments
+    return result
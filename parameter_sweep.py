@@ -0,0 +1,167 @@
+"""Barridos 2-D de parámetros (mapas de calor del punto de operación).
+
+Evalúa la grilla completa de dos ejes (p. ej. presión de reservorio × IP o
+frecuencia × etapas) con la cadena por lotes IPR → demanda → curva de bomba
+→ eléctrico. Cada celda es una fila del lote; los ejes que cambian el
+contexto (profundidad, tubing, bomba, ...) agrupan las filas igual que en
+``sensitivity_batch``.
+
+Especificación de un eje (rango o valores explícitos)::
+
+    {"parametro": "presion_reservorio", "min": 100, "max": 200, "n": 50}
+    {"parametro": "stages", "valores": [150, 200, 250]}
+
+Barrer ``pi`` fija el índice de productividad de cada celda: reemplaza al
+que derivaría la prueba ``q_test``/``pwf_test`` o la fórmula de Darcy.
+
+Las salidas son matrices densas ``[len(eje_y)][len(eje_x)]`` (filas = eje y),
+con ``None`` donde no hay punto de operación.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+import sensitivity_batch
+from design_inputs import WELL_TEXT_FIELDS
+
+DEFAULT_AXIS_POINTS = 25
+MAX_AXIS_POINTS = 200
+MAX_GRID_POINTS = 40000
+DEFAULT_OUTPUTS = ('q_m3d', 'P_superficie_kW', 'Motor_Load_Percent')
+INTEGER_PARAMETERS = ('stages',)
+# Parámetros de escenario con valores numéricos (los únicos barribles)
+SWEEP_PARAMETERS = sensitivity_batch.SUPPORTED_PARAMETERS - {'pump_id', 'motor_id'} - set(WELL_TEXT_FIELDS)
+
+
+class SweepError(ValueError):
+    """Error de validación para barridos de parámetros."""
+
+
+def _number(value: Any, label: str) -> float:
+    try:
+        result = float(value)
+    except (TypeError, ValueError) as exc:
+        raise SweepError(f"'{label}' debe ser numérico.") from exc
+    if not math.isfinite(result):
+        raise SweepError(f"'{label}' debe ser finito.")
+    return result
+
+
+def parse_axis(spec: Optional[Mapping[str, Any]], label: str) -> Dict[str, Any]:
+    """
+    Valida un eje y genera sus valores.
+
+    Returns:
+        dict: {'parametro': nombre, 'valores': np.ndarray ordenado sin repetidos}
+    """
+    if not isinstance(spec, Mapping) or not spec.get('parametro'):
+        raise SweepError(f"{label}: se requiere 'parametro'.")
+    name = str(spec['parametro'])
+    if name not in SWEEP_PARAMETERS:
+        if name in sensitivity_batch.SUPPORTED_PARAMETERS:
+            raise SweepError(f"{label}: '{name}' no es un parámetro numérico.")
+        raise SweepError(f"{label}: parámetro desconocido '{name}'.")
+
+    if spec.get('valores') is not None:
+        values = np.array([_number(v, f'{label}.valores') for v in spec['valores']], dtype=float)
+    else:
+        low = _number(spec.get('min'), f'{label}.min')
+        high = _number(spec.get('max'), f'{label}.max')
+        try:
+            n = int(spec.get('n') or DEFAULT_AXIS_POINTS)
+        except (TypeError, ValueError) as exc:
+            raise SweepError(f"{label}.n debe ser entero.") from exc
+        if high < low:
+            raise SweepError(f'{label}: max debe ser mayor o igual que min.')
+        if not 1 <= n <= MAX_AXIS_POINTS:
+            raise SweepError(f'{label}.n debe estar entre 1 y {MAX_AXIS_POINTS}.')
+        values = np.linspace(low, high, n)
+
+    if name in INTEGER_PARAMETERS:
+        values = np.round(values)
+    values = np.unique(values)
+    if values.size == 0:
+        raise SweepError(f'{label}: el eje no tiene valores.')
+    if values.size > MAX_AXIS_POINTS:
+        raise SweepError(f'{label}: se admiten hasta {MAX_AXIS_POINTS} valores.')
+    return {'parametro': name, 'valores': values}
+
+
+def _grid_payload(values: np.ndarray) -> list:
+    """Matriz con 3 decimales y None en celdas sin resultado (JSON)."""
+    rounded = np.round(values, 3)
+    return np.where(np.isfinite(values), rounded, None).tolist()
+
+
+def _axis_value(name: str, value: float):
+    return int(value) if name in INTEGER_PARAMETERS else float(value)
+
+
+def run_sweep(
+    well_data: Mapping[str, Any],
+    pump_config: Mapping[str, Any],
+    motor_config: Mapping[str, Any],
+    cable_config: Mapping[str, Any],
+    configuracion_pozo: Mapping[str, Any],
+    eje_x: Mapping[str, Any],
+    eje_y: Mapping[str, Any],
+    freq_hz: float = 50.0,
+    salidas: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Evalúa la grilla eje_x × eje_y por lotes.
+
+    Returns:
+        dict: {
+            'eje_x': {'parametro', 'valores'}, 'eje_y': {'parametro', 'valores'},
+            'salidas': {salida: matriz [ny][nx]}, 'found': matriz booleana,
+            'base': salidas del caso sin overrides,
+            'n_puntos', 'n_convergidos', 'n_grupos'
+        }
+    """
+    x_axis = parse_axis(eje_x, 'eje_x')
+    y_axis = parse_axis(eje_y, 'eje_y')
+    if x_axis['parametro'] == y_axis['parametro']:
+        raise SweepError('Los ejes deben barrer parámetros distintos.')
+
+    outputs = tuple(salidas or DEFAULT_OUTPUTS)
+    unknown = [name for name in outputs if name not in sensitivity_batch.OUTPUTS]
+    if unknown:
+        raise SweepError(
+            f"Salidas no soportadas: {', '.join(unknown)}. Opciones: {', '.join(sensitivity_batch.OUTPUTS)}"
+        )
+
+    nx, ny = x_axis['valores'].size, y_axis['valores'].size
+    if nx * ny > MAX_GRID_POINTS:
+        raise SweepError(f'La grilla admite hasta {MAX_GRID_POINTS} puntos (recibido: {nx * ny}).')
+
+    x_name, y_name = x_axis['parametro'], y_axis['parametro']
+    # Orden fila mayor: la celda (j, i) es el escenario j * nx + i
+    scenarios = [
+        {'overrides': {x_name: _axis_value(x_name, x), y_name: _axis_value(y_name, y)}}
+        for y in y_axis['valores'] for x in x_axis['valores']
+    ]
+
+    try:
+        results = sensitivity_batch.evaluate_scenarios(
+            well_data, pump_config, motor_config, cable_config, configuracion_pozo, scenarios, freq_hz
+        )
+    except sensitivity_batch.SensitivityError as exc:
+        raise SweepError(str(exc)) from exc
+
+    found = results['found'][1:].reshape(ny, nx)
+    return {
+        'eje_x': {'parametro': x_name, 'valores': x_axis['valores'].tolist()},
+        'eje_y': {'parametro': y_name, 'valores': y_axis['valores'].tolist()},
+        'salidas': {name: _grid_payload(results[name][1:].reshape(ny, nx)) for name in outputs},
+        'found': found.tolist(),
+        'base': {name: _grid_payload(results[name][0]) for name in outputs},
+        'freq_hz': freq_hz,
+        'n_puntos': nx * ny,
+        'n_convergidos': int(found.sum()),
+        'n_grupos': results['n_grupos']
+    }
@@ -0,0 +1,255 @@
+"""Pronóstico de energía y costo a lo largo de la vida productiva del pozo.
+
+Avanza en pasos mensuales declinando la presión de reservorio y aumentando
+el corte de agua; en cada paso resuelve el punto de operación y la potencia
+de superficie con la cadena por lotes de ``batch_evaluation`` (la misma
+sección eléctrica vectorizada que ``calculate_electrical_summary``). Todos
+los pasos son filas de un mismo lote, de modo que 120 meses se evalúan en
+una sola llamada.
+
+Cada paso representa el punto medio de su intervalo: la energía del paso es
+``P_superficie_kW × horas del intervalo × disponibilidad``. El IPR se
+resuelve una vez a la presión inicial (incluida la prueba ``q_test``/
+``pwf_test``) y su índice de productividad queda fijo en todos los pasos:
+la prueba no se reinterpreta contra la presión declinada. Un pozo Vogel
+compuesto que cae bajo la presión de burbuja conserva el caudal máximo
+continuo en ``pr = pb``.
+
+Control de frecuencia:
+- ``fija``: todos los pasos a ``frequency_hz``.
+- ``vsd``: en cada paso la menor frecuencia de [freq_min, freq_max] que
+  entrega ``caudal_objetivo`` (bisección vectorizada sobre todos los pasos;
+  si ni freq_max alcanza el objetivo se opera a freq_max).
+
+Especificación::
+
+    {
+        "meses": 120, "paso_meses": 1,
+        "declinacion": {"presion_pct_anual": 8, "corte_agua_pp_anual": 3, "corte_agua_max": 95},
+        "control": {"modo": "vsd", "caudal_objetivo": 150, "freq_min": 35, "freq_max": 65},
+        "tarifa_kwh": 0.12, "disponibilidad": 0.95
+    }
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+import batch_evaluation
+from well_performance import resolve_ipr_model
+
+DEFAULT_MONTHS = 120
+MAX_STEPS = 600
+HOURS_PER_MONTH = 365.25 * 24.0 / 12.0
+DEFAULT_WATER_CUT_MAX = 98.0
+VSD_ITERATIONS = 20
+STEP_OUTPUTS = ('q_m3d', 'head_m', 'pip_bar', 'P_superficie_kW', 'Motor_Load_Percent')
+
+
+class ForecastError(ValueError):
+    """Error de validación para el pronóstico de producción."""
+
+
+def _float(value: Any, label: str, default: Optional[float] = None) -> float:
+    if value is None and default is not None:
+        return default
+    try:
+        result = float(value)
+    except (TypeError, ValueError) as exc:
+        raise ForecastError(f"'{label}' debe ser numérico.") from exc
+    if not math.isfinite(result):
+        raise ForecastError(f"'{label}' debe ser finito.")
+    return result
+
+
+def _decline_profiles(well_data: Mapping[str, Any], decline: Mapping[str, Any], years: np.ndarray):
+    """Presión de reservorio y corte de agua en cada paso."""
+    pr0 = _float(well_data.get('presion_reservorio'), 'presion_reservorio', 150.0)
+    pct = _float(decline.get('presion_pct_anual'), 'declinacion.presion_pct_anual', 0.0)
+    bar = _float(decline.get('presion_bar_anual'), 'declinacion.presion_bar_anual', 0.0)
+    if not 0.0 <= pct < 100.0 or bar < 0.0:
+        raise ForecastError('La declinación de presión debe ser no negativa (y menor a 100 %).')
+    # Declinación exponencial (% anual) y/o lineal (bar/año)
+    pressure = np.maximum(pr0 * (1.0 - pct / 100.0) ** years - bar * years, 0.0)
+
+    wc0 = _float(well_data.get('agua_porcentaje'), 'agua_porcentaje', 0.0)
+    wc_rate = _float(decline.get('corte_agua_pp_anual'), 'declinacion.corte_agua_pp_anual', 0.0)
+    wc_max = _float(decline.get('corte_agua_max'), 'declinacion.corte_agua_max', DEFAULT_WATER_CUT_MAX)
+    if not 0.0 <= wc_max <= 100.0:
+        raise ForecastError("'declinacion.corte_agua_max' debe estar entre 0 y 100.")
+    water_cut = np.minimum(wc0 + wc_rate * years, max(wc_max, wc0))
+    return pressure, water_cut
+
+
+def _fixed_productivity(well_data: Mapping[str, Any], pressure: np.ndarray):
+    """
+    Pozo sin prueba e índice de productividad por paso equivalentes al IPR
+    resuelto a la presión inicial.
+
+    Los lotes sin prueba usan q_max = 0.8·pr·pi (Vogel saturado) y
+    C = pi / pr (Fetkovich); el pi equivalente reproduce el IPR inicial.
+    """
+    model = resolve_ipr_model(well_data)
+    if model.method == 'darcy':
+        # El lote resuelve J de Darcy con los datos de reservorio
+        return well_data, {}
+    if model.method == 'fetkovich':
+        pi = model.c * model.pr
+    elif model.method == 'vogel' and model.saturated:
+        pi = model.q_max / (0.8 * model.pr) if model.pr else model.j
+    else:
+        pi = model.j
+    pi = np.full(pressure.shape, float(pi))
+    if model.method == 'vogel' and not model.saturated:
+        # Bajo pb: 0.8·pb·pi = J·pb/1.8 (caudal máximo compuesto en pr = pb)
+        pi = np.where(pressure <= model.pb, pi / 1.44, pi)
+
+    well = {key: value for key, value in well_data.items() if key not in ('q_test', 'pwf_test')}
+    if model.method == 'vogel':
+        # La presión de burbuja no declina con la de reservorio
+        well['presion_burbuja'] = model.pb
+    return well, {'pi': pi}
+
+
+def _vsd_frequencies(context, samples, target: float, freq_min: float, freq_max: float):
+    """Menor frecuencia por paso que alcanza el caudal objetivo (bisección vectorizada)."""
+    size = samples['presion_reservorio'].size
+
+    def rate(freq):
+        q = batch_evaluation.batch_operating_points(context, samples, freq)['q_m3d']
+        return np.where(np.isfinite(q), q, -np.inf)
+
+    low = np.full(size, freq_min)
+    high = np.full(size, freq_max)
+    reaches_max = rate(high) >= target
+    at_min = rate(low) >= target
+    for _ in range(VSD_ITERATIONS):
+        mid = 0.5 * (low + high)
+        ok = rate(mid) >= target
+        high = np.where(ok, mid, high)
+        low = np.where(ok, low, mid)
+
+    freq = np.where(at_min, freq_min, high)
+    freq = np.where(reaches_max, freq, freq_max)
+    return freq, reaches_max
+
+
+def _rounded(values: np.ndarray, digits: int = 3) -> list:
+    return np.where(np.isfinite(values), np.round(values, digits), None).tolist()
+
+
+def run_forecast(
+    well_data: Mapping[str, Any],
+    pump_config: Mapping[str, Any],
+    motor_config: Mapping[str, Any],
+    cable_config: Mapping[str, Any],
+    configuracion_pozo: Mapping[str, Any],
+    spec: Mapping[str, Any],
+    freq_hz: float = 50.0
+) -> Dict[str, Any]:
+    """
+    Pronóstico mensual de producción, energía y costo.
+
+    Returns:
+        dict: {
+            'meses': mes de cada paso (punto medio), 'pasos': {serie: lista},
+            'totales': {'energia_kwh', 'costo', 'liquido_m3', 'petroleo_m3',
+                        'kwh_por_m3_liquido', 'kwh_por_m3_petroleo'},
+            'control', 'n_pasos', 'n_sin_punto_operacion', 'n_bajo_objetivo'
+        }
+    """
+    spec = spec or {}
+    months = _float(spec.get('meses'), 'meses', float(DEFAULT_MONTHS))
+    step = _float(spec.get('paso_meses'), 'paso_meses', 1.0)
+    if months <= 0 or step <= 0:
+        raise ForecastError("'meses' y 'paso_meses' deben ser positivos.")
+    n_steps = int(math.ceil(months / step - 1e-9))
+    if n_steps > MAX_STEPS:
+        raise ForecastError(f'Se admiten hasta {MAX_STEPS} pasos (recibido: {n_steps}).')
+
+    availability = _float(spec.get('disponibilidad'), 'disponibilidad', 1.0)
+    if not 0.0 < availability <= 1.0:
+        raise ForecastError("'disponibilidad' debe estar en (0, 1].")
+    tariff = _float(spec.get('tarifa_kwh'), 'tarifa_kwh', 0.0)
+
+    edges = np.minimum(np.arange(n_steps + 1) * step, months)
+    month_mid = 0.5 * (edges[:-1] + edges[1:])
+    hours = np.diff(edges) * HOURS_PER_MONTH * availability
+    pressure, water_cut = _decline_profiles(well_data, spec.get('declinacion') or {}, month_mid / 12.0)
+
+    well, productivity = _fixed_productivity(well_data, pressure)
+    try:
+        context = batch_evaluation.build_batch_context(
+            dict(well), dict(pump_config), dict(motor_config), dict(cable_config), dict(configuracion_pozo)
+        )
+    except batch_evaluation.BatchEvaluationError as exc:
+        raise ForecastError(str(exc)) from exc
+    samples = {'presion_reservorio': pressure, 'agua_porcentaje': water_cut, **productivity}
+
+    control = dict(spec.get('control') or {})
+    mode = str(control.get('modo') or 'fija').lower()
+    below_target = np.zeros(n_steps, dtype=bool)
+    if mode == 'fija':
+        freq = np.full(n_steps, _float(control.get('frequency_hz'), 'control.frequency_hz', freq_hz))
+        control = {'modo': 'fija', 'frequency_hz': float(freq[0])}
+    elif mode == 'vsd':
+        target = _float(control.get('caudal_objetivo'), 'control.caudal_objetivo')
+        freq_min = _float(control.get('freq_min'), 'control.freq_min', 30.0)
+        freq_max = _float(control.get('freq_max'), 'control.freq_max', 70.0)
+        if target <= 0 or not 0 < freq_min <= freq_max:
+            raise ForecastError('Control VSD: se requiere caudal_objetivo > 0 y 0 < freq_min <= freq_max.')
+        freq, reaches = _vsd_frequencies(context, samples, target, freq_min, freq_max)
+        below_target = ~reaches
+        control = {'modo': 'vsd', 'caudal_objetivo': target, 'freq_min': freq_min, 'freq_max': freq_max}
+    else:
+        raise ForecastError("'control.modo' debe ser 'fija' o 'vsd'.")
+
+    try:
+        batch = batch_evaluation.evaluate_batch(context, samples, freq)
+    except batch_evaluation.BatchEvaluationError as exc:
+        raise ForecastError(str(exc)) from exc
+
+    found = batch['found']
+    # Sin punto de operación la bomba no produce ni se le asigna consumo
+    power = np.where(found, batch['P_superficie_kW'], 0.0)
+    rate = np.where(found, batch['q_m3d'], 0.0)
+    energy = power * hours
+    liquid = rate * hours / 24.0
+    oil = liquid * (1.0 - water_cut / 100.0)
+    total_energy = float(energy.sum())
+    total_liquid = float(liquid.sum())
+    total_oil = float(oil.sum())
+
+    steps = {name: _rounded(np.where(found, batch[name], np.nan)) for name in STEP_OUTPUTS}
+    steps.update(
+        presion_reservorio=_rounded(pressure),
+        agua_porcentaje=_rounded(water_cut),
+        frequency_hz=_rounded(freq),
+        energia_kwh=_rounded(energy, 1),
+        energia_acumulada_kwh=_rounded(np.cumsum(energy), 1),
+        costo=_rounded(energy * tariff, 2),
+        liquido_m3=_rounded(liquid, 1),
+        petroleo_m3=_rounded(oil, 1),
+        found=found.tolist()
+    )
+    return {
+        'meses': _rounded(month_mid),
+        'pasos': steps,
+        'totales': {
+            'energia_kwh': round(total_energy, 1),
+            'costo': round(total_energy * tariff, 2),
+            'liquido_m3': round(total_liquid, 1),
+            'petroleo_m3': round(total_oil, 1),
+            'kwh_por_m3_liquido': round(total_energy / total_liquid, 3) if total_liquid > 0 else None,
+            'kwh_por_m3_petroleo': round(total_energy / total_oil, 3) if total_oil > 0 else None
+        },
+        'control': control,
+        'tarifa_kwh': tariff,
+        'disponibilidad': availability,
+        'n_pasos': n_steps,
+        'n_sin_punto_operacion': int((~found).sum()),
+        'n_bajo_objetivo': int(below_target.sum())
+    }
@@ -0,0 +1,64 @@
+"""Diseño de ejemplo con catálogos sintéticos (sin Excel ni PostgreSQL).
+
+Lo usan los tests y los scripts de benchmark: un pozo lineal y uno Vogel
+calibrado con una prueba, la bomba 'P1' de 250 etapas, el motor 'M1' y
+cables AWG. ``install_synthetic_catalogs`` reemplaza los catálogos de
+``equipment_selection`` por versiones mínimas con esos equipos.
+"""
+
+import pandas as pd
+
+import equipment_selection
+
+WELL = {
+    'method': 'linear', 'presion_reservorio': 150, 'pi': 2.5, 'grado_api': 28, 'agua_porcentaje': 40,
+    'profundidad_intake': 1500, 'presion_superficie': 12, 'presion_casing': 2, 'tubing_id_mm': 62.0,
+    'viscosidad': 3.0,
+}
+# Mismo pozo con IPR Vogel compuesto calibrado con una prueba
+VOGEL_WELL = {
+    'method': 'vogel', 'presion_reservorio': 150, 'presion_burbuja': 100, 'q_test': 120, 'pwf_test': 90,
+    'grado_api': 28, 'agua_porcentaje': 40, 'profundidad_intake': 1500, 'presion_superficie': 12,
+    'presion_casing': 2, 'tubing_id_mm': 62.0, 'viscosidad': 3.0,
+}
+PUMP = {'pump_id': 'P1', 'stages': 250}
+MOTOR = {'motor_id': 'M1'}
+CABLE = {'mle_tipo_id': 'awg_4', 'mle_longitud': 30, 'fondo_tipo_id': 'awg_2',
+         'superficie_tipo_id': 'awg_2', 'superficie_longitud': 50}
+
+
+def install_synthetic_catalogs(set_attribute=setattr):
+    """
+    Instala los catálogos mínimos en ``equipment_selection``.
+
+    Args:
+        set_attribute: Función (objeto, nombre, valor) usada para asignar;
+            los tests pasan ``monkeypatch.setattr`` para restaurar al terminar
+    """
+    values = {
+        'COL_PUMP_ID': 'Tipo',
+        'COL_PUMP_MIN_Q': 'Q mín',
+        'COL_PUMP_MAX_Q': 'Q máx',
+        'COLS_PUMP_HEAD': ['hpoly0', 'hpoly1', 'hpoly2'],
+        'COLS_PUMP_BHP': ['npoly0', 'npoly1', 'npoly2'],
+        'COLS_PUMP_EFF': [],
+        'PUMP_CATALOG': pd.DataFrame([{
+            'Tipo': 'P1', 'Q mín': 80, 'Q máx': 260, 'rpm': 2910,
+            'hpoly0': 6.0, 'hpoly1': -0.004, 'hpoly2': -0.00006,
+            'npoly0': 180.0, 'npoly1': 0.9, 'npoly2': -0.0009,
+        }]),
+        'MOTOR_CATALOG': pd.DataFrame([{
+            'descripción': 'M1', 'HP NOM': 150.0, 'VOLT NOM': 2200.0, 'AMP NOM': 40.0,
+            'COS FI NOM': 0.85, 'EFF': 88.0, 'HZ NOM': 50.0, 'Tipo Motor': 'AM',
+        }]),
+        'MOTOR_COLUMN_MAP': {
+            'descripcion': 'descripción', 'hp_nom': 'HP NOM', 'volt_nom': 'VOLT NOM', 'amp_nom': 'AMP NOM',
+            'cos_fi_nom': 'COS FI NOM', 'eff': 'EFF', 'hz_nom': 'HZ NOM', 'tipo_motor': 'Tipo Motor',
+        },
+        'CABLE_CATALOG': [
+            {'id': 'awg_4', 'r_ohm_km_20c': 0.87, 'temp_coeff': 0.00393},
+            {'id': 'awg_2', 'r_ohm_km_20c': 0.55, 'temp_coeff': 0.00393},
+        ],
+    }
+    for name, value in values.items():
+        set_attribute(equipment_selection, name, value)
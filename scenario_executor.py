@@ -0,0 +1,231 @@
+"""Evaluación concurrente de escenarios de ``calculate_conditions``.
+
+El caso base y los escenarios de sensibilidad (optimista / conservador /
+pesimista) son independientes: cada uno resuelve IPR, curva de demanda y
+resumen eléctrico (incluida la curva de bomba). Las etapas se resuelven como
+nodos de ``calculation_graph`` memoizados por hash de contenido: las etapas
+idénticas se calculan una sola vez y su resultado se comparte por referencia;
+con un grafo persistente, sólo se recalculan los nodos invalidados desde el
+request anterior. Opcionalmente, los grupos que deben recalcular curvas se
+reparten en un pool de procesos persistente.
+
+El pool se crea la primera vez que se usa y se reutiliza entre requests. Los
+workers heredan (fork) o cargan (initializer) los catálogos; si el proceso
+principal recarga catálogos, el pool se recrea para no usar datos viejos.
+Los workers adoptan la versión de catálogos del proceso principal
+(``equipment_selection.catalog_version``), así las claves de los nodos que
+devuelven son las mismas que busca el proceso principal.
+
+Cantidad de procesos: argumento ``workers`` o variable ``BES_SCENARIO_WORKERS``;
+por defecto 1. Cada escenario tarda del orden de un milisegundo y el costo
+de IPC y pickling del pool lo supera (con 4 escenarios el pool caliente
+tarda más del doble que la ejecución en serie), por eso el pool es opcional. Con 1 worker, o si
+el pool no está disponible, los escenarios se evalúan en serie en el proceso
+actual.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import calc_cache
+import equipment_selection
+import friction_factor
+import well_performance
+from calculation_graph import CURVE_NODES, CalculationGraph, catalog_signature, node_keys
+from design_inputs import InstallationInput
+from fluid_properties import FluidState
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ENV = 'BES_SCENARIO_WORKERS'
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_CATALOGS: tuple = ()
+_POOL_LOCK = threading.Lock()
+
+
+_MAPPING_FIELDS = ('well_data', 'pump_config', 'motor_config', 'cable_config', 'configuracion_pozo')
+
+
+@dataclass(frozen=True)
+class ScenarioTask:
+    """
+    Entradas de un escenario, de solo lectura.
+
+    Los dicts se guardan como vistas congeladas (``calc_cache.freeze``) en
+    lugar de copias profundas; al serializar para un worker se convierten de
+    nuevo en dicts. ``well_data`` puede ser un ``design_inputs.WellInput`` e
+    ``installation`` las entradas de equipo ya parseadas de los configs.
+    """
+
+    key: str
+    well_data: Mapping[str, Any]
+    fluid_state: FluidState
+    freq_hz: float
+    pump_config: Mapping[str, Any] = field(default_factory=dict)
+    motor_config: Mapping[str, Any] = field(default_factory=dict)
+    cable_config: Mapping[str, Any] = field(default_factory=dict)
+    configuracion_pozo: Mapping[str, Any] = field(default_factory=dict)
+    motor_id: Optional[str] = None
+    ipr_model: Optional[well_performance.IPRModel] = None
+    include_system_head: bool = False
+    installation: Optional[InstallationInput] = None
+
+    def __post_init__(self):
+        for name in _MAPPING_FIELDS:
+            object.__setattr__(self, name, calc_cache.freeze(getattr(self, name)))
+
+    def __reduce__(self):
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        for name in _MAPPING_FIELDS:
+            values[name] = calc_cache.thaw(values[name])
+        return (_rebuild_task, (values,))
+
+    @property
+    def curves_key(self) -> str:
+        """Entradas efectivas de IPR, TDH del sistema y curva de demanda."""
+        return calc_cache.content_hash('curves', self.well_data, self.fluid_state, self.ipr_model)
+
+    @property
+    def electrical_key(self) -> str:
+        """Clave del nodo eléctrico (curvas + equipo + frecuencia + cable)."""
+        return node_keys(self)['electrical']
+
+
+def _rebuild_task(values: Dict[str, Any]) -> ScenarioTask:
+    return ScenarioTask(**values)
+
+
+def evaluate_group(tasks: Sequence[ScenarioTask], graph: Optional[CalculationGraph] = None) -> Dict[str, Any]:
+    """
+    Evalúa escenarios que comparten las mismas curvas (mismo ``curves_key``).
+
+    Los nodos se resuelven con ``calculation_graph``: IPR, TDH del sistema (si
+    alguna tarea lo pide) y curva de demanda se calculan una vez; curva de
+    bomba, punto de operación y resumen eléctrico una vez por equipo y
+    frecuencia distintos.
+
+    Returns:
+        dict: 'entries' (caché de nodos {clave: resultado}) y
+              'ran' ({task.key: nodos recalculados})
+    """
+    graph = graph if graph is not None else CalculationGraph()
+    ran = {task.key: graph.evaluate(task)[1] for task in tasks}
+    return {'entries': graph.export(tasks), 'ran': ran}
+
+
+def resolve_workers(n_tasks: int, workers: Optional[int] = None) -> int:
+    """Cantidad de procesos: argumento, BES_SCENARIO_WORKERS o 1 (serie)."""
+    if workers is None:
+        env_value = os.environ.get(WORKERS_ENV)
+        try:
+            workers = int(env_value) if env_value else 1
+        except ValueError:
+            workers = 1
+    return max(min(int(workers), n_tasks), 1)
+
+
+def _init_worker(catalog_version: int) -> None:
+    """Initializer del pool: asegura catálogos y tablas de fricción en memoria y adopta su versión."""
+    try:
+        equipment_selection.load_catalogs()
+    except Exception as exc:  # El resumen eléctrico reporta el error como warning
+        logger.warning('No se pudieron cargar catálogos en el worker: %s', exc)
+    equipment_selection.set_catalog_version(catalog_version)
+    friction_factor.precompute_catalog_tables()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS, _POOL_CATALOGS
+
+    signature = catalog_signature()
+    if _POOL is not None and (_POOL_WORKERS < workers or _POOL_CATALOGS != signature):
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(equipment_selection.catalog_version(),)
+        )
+        _POOL_WORKERS = workers
+        _POOL_CATALOGS = signature
+    return _POOL
+
+
+def shutdown_pool() -> None:
+    """Cierra el pool persistente (p. ej. al finalizar la aplicación o en tests)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True, cancel_futures=True)
+            _POOL = None
+
+
+def _group_by_curves(tasks: Sequence[ScenarioTask]) -> Dict[str, List[ScenarioTask]]:
+    groups: Dict[str, List[ScenarioTask]] = {}
+    for task in tasks:
+        groups.setdefault(task.curves_key, []).append(task)
+    return groups
+
+
+def run_scenarios(
+    tasks: Sequence[ScenarioTask],
+    workers: Optional[int] = None,
+    graph: Optional[CalculationGraph] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Evalúa los escenarios recalculando sólo los nodos invalidados.
+
+    Con ``graph`` (caché persistente entre requests) los nodos cuyas entradas
+    no cambiaron se reutilizan; sin él, la memoización sólo deduplica dentro
+    del request. Los grupos que deben recalcular curvas se reparten en el pool
+    si hay más de un worker. Las tareas con las mismas entradas efectivas
+    comparten por referencia el mismo resultado; no deben modificarse.
+
+    Returns:
+        dict: {task.key: {'ipr', 'pressure_demand_curve', 'electrical_data'
+              [, 'system_head_curve'], 'recalculated': [nodos]}} en el orden
+              de ``tasks``
+    """
+    graph = graph if graph is not None else CalculationGraph()
+    groups = _group_by_curves(tasks)
+    pending = [job for job in groups.values() if any(graph.missing(task, CURVE_NODES) for task in job)]
+    workers = resolve_workers(len(pending), workers)
+
+    ran: Dict[str, List[str]] = {}
+    if workers > 1:
+        try:
+            with _POOL_LOCK:
+                pool = _get_pool(workers)
+                futures = [pool.submit(evaluate_group, job) for job in pending]
+            for future in futures:
+                computed = future.result()
+                graph.merge(computed['entries'])
+                ran.update(computed['ran'])
+        except (BrokenProcessPool, OSError) as exc:
+            logger.warning('Pool de escenarios no disponible (%s); se evalúa en serie.', exc)
+            shutdown_pool()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for task in tasks:
+        values, ran_here = graph.evaluate(task)
+        result = {
+            'ipr': values['ipr'],
+            'pressure_demand_curve': values['pressure_demand_curve'],
+            'electrical_data': values['electrical']
+        }
+        if task.include_system_head:
+            result['system_head_curve'] = values['system_head_curve']
+        result['recalculated'] = ran.get(task.key, []) + ran_here
+        results[task.key] = result
+    return results
@@ -0,0 +1,106 @@
+"""Compara frequency_optimizer contra un barrido fino por fuerza bruta.
+
+El barrido de fuerza bruta evalúa cada frecuencia de la grilla fina por
+separado (un lote por frecuencia, todos los períodos) y toma el mínimo de
+kWh/m³ factible. Se reportan tiempos, evaluaciones y la diferencia de
+frecuencia y energía específica por período.
+
+Uso:
+    python scripts/benchmark_frequency_optimizer.py --catalogo-sintetico --paso 0.01
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Asegurarnos de que el directorio raíz del proyecto esté en sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import batch_evaluation
+import frequency_optimizer
+# Mismo pozo, cables y catálogo sintético que los tests
+from sample_designs import CABLE, WELL, install_synthetic_catalogs
+
+
+def build_schedule(n_periods):
+    # Programa anual: caudal requerido decreciente con presión en declinación
+    return [
+        {
+            'nombre': f'periodo_{i + 1}',
+            'caudal_requerido': 110.0 - 40.0 * i / max(n_periods - 1, 1),
+            'duracion_dias': 30.0,
+            'presion_reservorio': 150.0 * 0.97 ** i,
+            'agua_porcentaje': min(40.0 + 2.0 * i, 95.0),
+        }
+        for i in range(n_periods)
+    ]
+
+
+def brute_force(context, schedule, freq_min, freq_max, step_hz, max_load):
+    samples = frequency_optimizer._period_samples(schedule)
+    required = np.array([period['caudal_requerido'] for period in schedule])
+    grid = np.arange(freq_min, freq_max + step_hz / 2, step_hz)
+    best_kwh = np.full(len(schedule), np.inf)
+    best_freq = np.full(len(schedule), np.nan)
+    for freq in grid:
+        freqs = np.full((len(schedule), 1), freq)
+        result = frequency_optimizer.evaluate_candidates(context, samples, required, freqs, max_load)
+        kwh = result['kwh_m3'][:, 0]
+        better = kwh < best_kwh
+        best_kwh = np.where(better, kwh, best_kwh)
+        best_freq = np.where(better, freq, best_freq)
+    return best_freq, best_kwh, grid.size * len(schedule)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pump', default='P1')
+    parser.add_argument('--motor', default='M1')
+    parser.add_argument('--stages', type=int, default=250)
+    parser.add_argument('--periodos', type=int, default=12)
+    parser.add_argument('--freq-min', type=float, default=30.0)
+    parser.add_argument('--freq-max', type=float, default=70.0)
+    parser.add_argument('--paso', type=float, default=0.01, help='Paso del barrido de fuerza bruta (Hz)')
+    parser.add_argument('--carga-max', type=float, default=100.0)
+    parser.add_argument('--catalogo-sintetico', action='store_true',
+                        help='Usar un catálogo sintético en lugar de Excel/PostgreSQL')
+    args = parser.parse_args()
+
+    if args.catalogo_sintetico:
+        install_synthetic_catalogs()
+
+    context = batch_evaluation.build_batch_context(
+        WELL, {'pump_id': args.pump, 'stages': args.stages}, {'motor_id': args.motor}, CABLE, {}
+    )
+    schedule = frequency_optimizer.parse_schedule({'periodos': build_schedule(args.periodos)}, WELL)
+
+    start = time.perf_counter()
+    optimized = frequency_optimizer.optimize_frequencies(
+        context, schedule, args.freq_min, args.freq_max, args.carga_max
+    )
+    optimizer_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    brute_freq, brute_kwh, brute_evaluations = brute_force(
+        context, schedule, args.freq_min, args.freq_max, args.paso, args.carga_max
+    )
+    brute_time = time.perf_counter() - start
+
+    print(f"{'período':<12}{'f_opt':>9}{'f_bruta':>9}{'kWh/m3 opt':>12}{'kWh/m3 bruta':>14}{'dif %':>9}")
+    for idx, period in enumerate(schedule):
+        opt_kwh = optimized['kwh_m3'][idx]
+        diff = (opt_kwh / brute_kwh[idx] - 1.0) * 100.0 if np.isfinite(brute_kwh[idx]) else float('nan')
+        print(f"{period['nombre']:<12}{optimized['frequency_hz'][idx]:>9.2f}{brute_freq[idx]:>9.2f}"
+              f"{opt_kwh:>12.4f}{brute_kwh[idx]:>14.4f}{diff:>9.3f}")
+
+    print(f"\nOptimizador: {optimizer_time * 1000:.1f} ms, {optimized['n_evaluaciones']} evaluaciones")
+    print(f"Fuerza bruta (paso {args.paso} Hz): {brute_time * 1000:.1f} ms, {brute_evaluations} evaluaciones")
+    if optimizer_time > 0:
+        print(f"Aceleración: {brute_time / optimizer_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+"""Sensibilidades de N escenarios evaluadas por lotes (tornado / spider).
+
+Cada escenario sobrescribe cualquier campo de ``WellInput`` (además de
+``stages``, ``frequency_hz``, ``pump_id`` y ``motor_id``); un nombre
+desconocido es un error, no un override ignorado. Los
+escenarios se apilan y se evalúan juntos con ``batch_evaluation`` (IPR →
+demanda → punto de operación → eléctrico sobre arreglos):
+
+- Los parámetros de ``PER_ROW_PARAMETERS`` varían fila a fila dentro de un
+  mismo lote.
+- El resto (p. ej. profundidad de intake, tubing, método IPR, bomba) cambia
+  el contexto del lote: los escenarios se agrupan por el hash de esos
+  valores y se evalúa un lote por grupo.
+
+La respuesta es una tabla compacta (una fila por escenario con las salidas
+del punto de operación) más los resúmenes para gráficos tornado y spider,
+en lugar de N curvas completas.
+
+Especificación de escenarios (se pueden combinar)::
+
+    {
+        "escenarios": [{"nombre": "alto corte", "overrides": {"agua_porcentaje": 70}}],
+        "tornado": {"presion_reservorio": [130, 170], "frequency_hz": {"bajo": 45, "alto": 60}},
+        "spider": {"parametros": ["pi", "grado_api"], "variaciones_pct": [-20, -10, 10, 20]}
+    }
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+import batch_evaluation
+import calc_cache
+from design_inputs import WELL_INPUT_FIELDS
+
+PER_ROW_PARAMETERS = batch_evaluation.BATCH_PARAMETERS + ('stages', 'frequency_hz')
+EQUIPMENT_PARAMETERS = ('pump_id', 'motor_id', 'stages', 'frequency_hz')
+# Parámetros que un escenario puede sobrescribir
+SUPPORTED_PARAMETERS = frozenset(PER_ROW_PARAMETERS + EQUIPMENT_PARAMETERS + WELL_INPUT_FIELDS)
+OUTPUTS = (
+    'q_m3d',
+    'head_m',
+    'pip_bar',
+    'pwf_bar',
+    'pump_bhp_hp',
+    'P_superficie_kW',
+    'Motor_Load_Percent',
+)
+TABLE_COLUMNS = ('escenario', 'tipo', 'parametro', 'valor', 'variacion_pct') + OUTPUTS
+DEFAULT_SPIDER_VARIATIONS = (-20.0, -10.0, 10.0, 20.0)
+MAX_SCENARIOS = 500
+
+
+class SensitivityError(ValueError):
+    """Error de validación para sensibilidades por lotes."""
+
+
+def _float(value: Any, label: str) -> float:
+    try:
+        result = float(value)
+    except (TypeError, ValueError) as exc:
+        raise SensitivityError(f"'{label}' debe ser numérico.") from exc
+    if not math.isfinite(result):
+        raise SensitivityError(f"'{label}' debe ser finito.")
+    return result
+
+
+def _check_parameter(name: Any, label: str) -> str:
+    """Rechaza nombres desconocidos (un typo no debe ignorarse en silencio)."""
+    if name not in SUPPORTED_PARAMETERS:
+        raise SensitivityError(f"{label}: parámetro desconocido '{name}'.")
+    return name
+
+
+def _base_value(name: str, well_data: Mapping[str, Any], pump_config: Mapping[str, Any], freq_hz: float):
+    if name == 'frequency_hz':
+        return freq_hz
+    if name == 'stages':
+        return pump_config.get('stages') or pump_config.get('stages_count')
+    if name in ('pump_id', 'motor_id'):
+        return None
+    return well_data.get(name)
+
+
+def _scenario(name: str, tipo: str, overrides: Mapping[str, Any], parametro=None, valor=None, variacion=None) -> Dict[str, Any]:
+    return {
+        'nombre': name,
+        'tipo': tipo,
+        'parametro': parametro,
+        'valor': valor,
+        'variacion_pct': variacion,
+        'overrides': dict(overrides)
+    }
+
+
+def build_scenarios(
+    spec: Mapping[str, Any],
+    well_data: Mapping[str, Any],
+    pump_config: Mapping[str, Any],
+    freq_hz: float
+) -> List[Dict[str, Any]]:
+    """
+    Expande la especificación (escenarios explícitos, tornado y spider) a una
+    lista de escenarios con sus overrides.
+    """
+    scenarios: List[Dict[str, Any]] = []
+
+    for idx, item in enumerate(spec.get('escenarios') or []):
+        if not isinstance(item, Mapping) or not isinstance(item.get('overrides'), Mapping):
+            raise SensitivityError(f"Escenario {idx + 1}: se requiere un dict 'overrides'.")
+        overrides = item['overrides']
+        for name in overrides:
+            _check_parameter(name, f'Escenario {idx + 1}')
+        parametro = next(iter(overrides)) if len(overrides) == 1 else None
+        scenarios.append(_scenario(
+            str(item.get('nombre') or f'escenario_{idx + 1}'),
+            'escenario',
+            overrides,
+            parametro,
+            overrides[parametro] if parametro else None
+        ))
+
+    for name, bounds in (spec.get('tornado') or {}).items():
+        _check_parameter(name, 'Tornado')
+        if isinstance(bounds, Mapping):
+            low, high = bounds.get('bajo'), bounds.get('alto')
+        elif isinstance(bounds, Sequence) and len(bounds) == 2:
+            low, high = bounds
+        else:
+            raise SensitivityError(f"Tornado de '{name}': use [bajo, alto] o {{'bajo', 'alto'}}.")
+        for label, value in (('bajo', low), ('alto', high)):
+            value = _float(value, f'{name}.{label}')
+            scenarios.append(_scenario(f'{name}_{label}', 'tornado', {name: value}, name, value))
+
+    spider = spec.get('spider') or {}
+    if spider:
+        variations = spider.get('variaciones_pct') or DEFAULT_SPIDER_VARIATIONS
+        for name in spider.get('parametros') or []:
+            _check_parameter(name, 'Spider')
+            base = _base_value(name, well_data, pump_config, freq_hz)
+            if base is None:
+                raise SensitivityError(f"Spider de '{name}': el caso base no define el parámetro.")
+            base = _float(base, name)
+            for variation in variations:
+                variation = _float(variation, f'{name}.variacion')
+                value = base * (1.0 + variation / 100.0)
+                scenarios.append(_scenario(
+                    f'{name}_{variation:+g}%', 'spider', {name: value}, name, value, variation
+                ))
+
+    if not scenarios:
+        raise SensitivityError("Se requiere al menos un escenario ('escenarios', 'tornado' o 'spider').")
+    if len(scenarios) > MAX_SCENARIOS:
+        raise SensitivityError(f'Se admiten hasta {MAX_SCENARIOS} escenarios por request.')
+    return scenarios
+
+
+def _split_overrides(overrides: Mapping[str, Any]):
+    """Separa overrides por fila (dentro del lote) de los que cambian el contexto."""
+    per_row = {key: value for key, value in overrides.items() if key in PER_ROW_PARAMETERS}
+    structural = {key: value for key, value in overrides.items() if key not in PER_ROW_PARAMETERS}
+    return per_row, structural
+
+
+def evaluate_scenarios(
+    well_data: Mapping[str, Any],
+    pump_config: Mapping[str, Any],
+    motor_config: Mapping[str, Any],
+    cable_config: Mapping[str, Any],
+    configuracion_pozo: Mapping[str, Any],
+    scenarios: Sequence[Mapping[str, Any]],
+    freq_hz: float = 50.0
+) -> Dict[str, Any]:
+    """
+    Evalúa el caso base (fila 0) y los escenarios apilados por lotes.
+
+    Returns:
+        dict: Arreglos de longitud N + 1 para cada salida de OUTPUTS y 'found',
+              más 'n_grupos' (lotes evaluados)
+    """
+    rows = [{}] + [scenario['overrides'] for scenario in scenarios]
+    size = len(rows)
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    for idx, overrides in enumerate(rows):
+        per_row, structural = _split_overrides(overrides)
+        key = calc_cache.content_hash(structural)
+        group = groups.setdefault(key, {'structural': structural, 'rows': [], 'per_row': []})
+        group['rows'].append(idx)
+        group['per_row'].append(per_row)
+
+    results = {name: np.full(size, np.nan) for name in OUTPUTS}
+    results['found'] = np.zeros(size, dtype=bool)
+
+    for group in groups.values():
+        structural = group['structural']
+        group_well = dict(well_data)
+        group_well.update({k: v for k, v in structural.items() if k not in EQUIPMENT_PARAMETERS})
+        group_pump = dict(pump_config)
+        group_motor = dict(motor_config)
+        if 'pump_id' in structural:
+            group_pump['pump_id'] = structural['pump_id']
+        if 'motor_id' in structural:
+            group_motor['motor_id'] = structural['motor_id']
+
+        try:
+            context = batch_evaluation.build_batch_context(
+                group_well, group_pump, group_motor, cable_config, configuracion_pozo
+            )
+        except batch_evaluation.BatchEvaluationError as exc:
+            raise SensitivityError(f'Escenarios con {structural or "caso base"}: {exc}') from exc
+
+        samples = batch_evaluation.override_samples([
+            {key: _float(value, key) for key, value in per_row.items() if key != 'frequency_hz' and value is not None}
+            for per_row in group['per_row']
+        ])
+        freq = np.array([_float(per_row.get('frequency_hz', freq_hz), 'frequency_hz') for per_row in group['per_row']])
+
+        batch = batch_evaluation.evaluate_batch(context, samples, freq)
+        index = np.asarray(group['rows'])
+        results['found'][index] = batch['found']
+        for name in OUTPUTS:
+            results[name][index] = batch[name]
+
+    results['n_grupos'] = len(groups)
+    return results
+
+
+def _rounded(value) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return round(value, 3) if math.isfinite(value) else None
+
+
+def run_sensitivity(
+    well_data: Mapping[str, Any],
+    pump_config: Mapping[str, Any],
+    motor_config: Mapping[str, Any],
+    cable_config: Mapping[str, Any],
+    configuracion_pozo: Mapping[str, Any],
+    spec: Mapping[str, Any],
+    freq_hz: float = 50.0,
+    salida: str = 'q_m3d'
+) -> Dict[str, Any]:
+    """
+    Ejecuta las sensibilidades y arma la tabla compacta y los resúmenes.
+
+    Returns:
+        dict: {
+            'columns': TABLE_COLUMNS, 'rows': filas (la primera es el caso base),
+            'base': salidas del caso base,
+            'tornado': [{'parametro', 'bajo', 'alto', 'salida_bajo', 'salida_alto', 'rango'}]
+                       ordenado por rango descendente,
+            'spider': {parametro: [{'variacion_pct', 'valor', 'salida'}]} (incluye 0 %),
+            'salida', 'n_escenarios', 'n_grupos'
+        }
+    """
+    if salida not in OUTPUTS:
+        raise SensitivityError(f"Salida '{salida}' no soportada. Opciones: {', '.join(OUTPUTS)}")
+
+    scenarios = build_scenarios(spec, well_data, pump_config, freq_hz)
+    results = evaluate_scenarios(
+        well_data, pump_config, motor_config, cable_config, configuracion_pozo, scenarios, freq_hz
+    )
+
+    labels = [_scenario('base', 'base', {})] + scenarios
+    table_rows = []
+    for idx, scenario in enumerate(labels):
+        table_rows.append(
+            [scenario['nombre'], scenario['tipo'], scenario['parametro'], _rounded(scenario['valor']),
+             _rounded(scenario['variacion_pct'])]
+            + [_rounded(results[name][idx]) for name in OUTPUTS]
+        )
+
+    output = results[salida]
+    base_output = _rounded(output[0])
+
+    tornado: Dict[str, Dict[str, Any]] = {}
+    spider: Dict[str, List[Dict[str, Any]]] = {}
+    for idx, scenario in enumerate(labels):
+        name = scenario['parametro']
+        if scenario['tipo'] == 'tornado':
+            entry = tornado.setdefault(name, {'parametro': name})
+            side = 'bajo' if scenario['nombre'].endswith('_bajo') else 'alto'
+            entry[side] = scenario['valor']
+            entry[f'salida_{side}'] = _rounded(output[idx])
+        elif scenario['tipo'] == 'spider':
+            spider.setdefault(name, []).append({
+                'variacion_pct': scenario['variacion_pct'],
+                'valor': _rounded(scenario['valor']),
+                'salida': _rounded(output[idx])
+            })
+
+    for entry in tornado.values():
+        values = [entry.get('salida_bajo'), entry.get('salida_alto')]
+        entry['rango'] = round(abs(values[1] - values[0]), 3) if None not in values else None
+    for name, series in spider.items():
+        base_value = _rounded(_float(_base_value(name, well_data, pump_config, freq_hz), name))
+        series.append({'variacion_pct': 0.0, 'valor': base_value, 'salida': base_output})
+        series.sort(key=lambda point: point['variacion_pct'])
+
+    return {
+        'columns': list(TABLE_COLUMNS),
+        'rows': table_rows,
+        'base': {name: _rounded(results[name][0]) for name in OUTPUTS},
+        'tornado': sorted(tornado.values(), key=lambda entry: -(entry['rango'] or 0.0)),
+        'spider': spider,
+        'salida': salida,
+        'n_escenarios': len(scenarios),
+        'n_grupos': results['n_grupos']
+    }
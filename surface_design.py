@@ -4,15 +4,35 @@ Este módulo implementa la función ``calcular_diseno_superficie`` descrita en
 ``calcular_diseno_superficie.md``. La función prepara los datos requeridos para
 seleccionar TAP de transformador y dimensionamiento de VSD/tablero en la etapa
 estática de diseño.
+
+Con ``config_diseno_usuario.barrido_frecuencia`` (``{"f_min", "f_max", "n"}``
+o ``{"frecuencias": [...]}``) el diseño VSD además se evalúa sobre todo el
+rango de frecuencias en una sola pasada: tensión requerida y entregada con
+el TAP de diseño, TAP requerido, caída en el filtro y kVA del VSD por
+frecuencia, y las frecuencias límite por tensión y por kVA.
 """
 
 from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
 
 SQRT_3 = 1.73205
+DEFAULT_MAX_RESULTADOS = 10
+DEFAULT_PUNTOS_BARRIDO = 61
+MAX_PUNTOS_BARRIDO = 2000
+MOTIVOS_DESCARTE = (
+    "tension_entrada_trafo",
+    "tap_fuera_de_rango",
+    "kva_transformador",
+    "corriente_filtro",
+    "kva_vsd",
+    "corriente_vsd",
+    "tension_vsd",
+)
 
 
 class SurfaceDesignError(ValueError):
@@ -95,36 +115,156 @@ def _build_vhz_curve(f_operacion: float, v_vsd_out: float, warnings: List[str])
     return [p.as_dict() for p in puntos]
 
 
-def _interpolate_voltage(freq: float, f_operacion: float, v_vsd_out: float) -> float:
-    """Interpolación lineal con rampa 0-5 Hz al 10 % de tensión nominal."""
-    if f_operacion <= 0:
-        return 0.0
+def _interpolate_voltage(freq, f_operacion: float, v_vsd_out: float):
+    """Interpolación lineal con rampa 0-5 Hz al 10 % de tensión nominal.
 
+    ``freq`` puede ser un escalar (devuelve float) o un arreglo de frecuencias.
+    """
+    f = np.asarray(freq, dtype=float)
     f_rampa = 5.0
-    if freq <= 0:
-        return 0.0
-    if f_operacion <= f_rampa:
-        return v_vsd_out * (freq / f_operacion)
-
-    if freq <= f_rampa:
-        return v_vsd_out * 0.10 * (freq / f_rampa)
-
-    slope = (v_vsd_out - v_vsd_out * 0.10) / (f_operacion - f_rampa)
-    return v_vsd_out * 0.10 + slope * (freq - f_rampa)
 
+    if f_operacion <= 0:
+        voltage = np.zeros_like(f)
+    elif f_operacion <= f_rampa:
+        voltage = v_vsd_out * (f / f_operacion)
+    else:
+        slope = (v_vsd_out - v_vsd_out * 0.10) / (f_operacion - f_rampa)
+        voltage = np.where(
+            f <= f_rampa,
+            v_vsd_out * 0.10 * (f / f_rampa),
+            v_vsd_out * 0.10 + slope * (f - f_rampa)
+        )
+    voltage = np.where(f <= 0, 0.0, voltage)
+    return float(voltage) if voltage.ndim == 0 else voltage
 
-def calcular_diseno_superficie(datos_diseno: Dict[str, Any]) -> Dict[str, Any]:
-    """Calcula el diseño de equipos de superficie para VSD o tablero."""
-    if not isinstance(datos_diseno, dict):
-        raise SurfaceDesignError("'datos_diseno' debe ser un diccionario.")
 
-    warnings: List[str] = list(datos_diseno.get("warnings") or [])
+def _frecuencias_barrido(spec: Dict[str, Any], f_operacion: float) -> np.ndarray:
+    if spec.get("frecuencias") is not None:
+        try:
+            frecuencias = np.array([float(f) for f in spec["frecuencias"]], dtype=float)
+        except (TypeError, ValueError) as exc:
+            raise SurfaceDesignError("'barrido_frecuencia.frecuencias' debe ser una lista numérica.") from exc
+    else:
+        f_min = _require_non_negative(spec.get("f_min", 0.0), "barrido_frecuencia.f_min")
+        f_max = _require_positive(spec.get("f_max", f_operacion), "barrido_frecuencia.f_max")
+        n = int(_require_positive(spec.get("n", DEFAULT_PUNTOS_BARRIDO), "barrido_frecuencia.n"))
+        if f_max < f_min:
+            raise SurfaceDesignError("'barrido_frecuencia.f_max' debe ser mayor o igual que f_min.")
+        frecuencias = np.linspace(f_min, f_max, n)
+
+    frecuencias = np.unique(frecuencias)
+    if frecuencias.size == 0 or frecuencias.size > MAX_PUNTOS_BARRIDO:
+        raise SurfaceDesignError(f"El barrido admite entre 1 y {MAX_PUNTOS_BARRIDO} frecuencias.")
+    if not np.all(np.isfinite(frecuencias)) or frecuencias[0] < 0:
+        raise SurfaceDesignError("Las frecuencias del barrido deben ser finitas y no negativas.")
+    return frecuencias
+
+
+def _cruce(frecuencias: np.ndarray, valores: np.ndarray) -> Optional[float]:
+    """Primera frecuencia (interpolada) en la que ``valores`` pasa de negativo a >= 0."""
+    no_negativos = valores >= 0
+    if not no_negativos.any():
+        return None
+    idx = int(np.argmax(no_negativos))
+    if idx == 0:
+        return float(frecuencias[0])
+    f0, f1 = frecuencias[idx - 1], frecuencias[idx]
+    v0, v1 = valores[idx - 1], valores[idx]
+    if not (np.isfinite(v0) and np.isfinite(v1)) or v1 == v0:
+        return float(f1)
+    return float(f0 + (f1 - f0) * (-v0) / (v1 - v0))
+
+
+def _limitante(frecuencias: np.ndarray, motivos: Dict[str, np.ndarray], idx: Optional[int]) -> Optional[Dict[str, Any]]:
+    if idx is None:
+        return None
+    motivo = next(name for name, mask in motivos.items() if mask[idx])
+    return {"frecuencia_hz": float(frecuencias[idx]), "motivo": motivo}
+
+
+def _barrido_frecuencia(
+    spec: Dict[str, Any],
+    demanda: Dict[str, Any],
+    f_operacion: float,
+    v_vsd_out: float,
+    i_vsd_out_aprox: float,
+    resistencia_filtro: float,
+    inductancia_l: float,
+    ratio_trafo_final: Optional[float],
+    v_primario_nom: float,
+    v_secundario_nom: float,
+    eficiencia_vsd: float,
+    pf_entrada: float,
+    kva_vsd_nom: Optional[float]
+) -> Dict[str, Any]:
+    """
+    Diseño VSD evaluado sobre un arreglo de frecuencias (vectorizado).
+
+    El TAP queda fijo en el valor de diseño (calculado a ``f_max_operativa``);
+    en cada frecuencia se compara la tensión entregada por el transformador
+    con la requerida en superficie y los kVA requeridos con los del VSD.
+    La potencia del motor es la del diseño (``p_motor_kw`` de la demanda) en
+    ``f_operacion`` y escala con la frecuencia (V/f a corriente de placa), de
+    modo que la fila en ``f_operacion`` reproduce el diseño puntual.
+    """
+    frecuencias = _frecuencias_barrido(spec, f_operacion)
+
+    v_motor_op = demanda["v_nom"] * (frecuencias / demanda["f_nom"])
+    v_superficie_req = v_motor_op + demanda["v_drop_cable"]
+    v_vsd = _interpolate_voltage(frecuencias, f_operacion, v_vsd_out)
+    v_drop_filtro = i_vsd_out_aprox * np.hypot(resistencia_filtro, 2 * math.pi * frecuencias * inductancia_l)
+    v_trafo_in = v_vsd - v_drop_filtro
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tap_requerido = np.where(
+            v_trafo_in > 0, (v_superficie_req / v_trafo_in) * v_primario_nom / v_secundario_nom * 100.0, np.nan
+        )
+    v_entregada = v_trafo_in * ratio_trafo_final if ratio_trafo_final else np.full_like(frecuencias, np.nan)
+    margen_tension = v_entregada - v_superficie_req
+
+    p_motor_kw = demanda["p_motor_kw"] * (frecuencias / f_operacion)
+    p_superficie_kw = p_motor_kw + demanda["p_cable_loss_kw"]
+    p_filtro_loss_kw = (i_vsd_out_aprox ** 2 * resistencia_filtro) / 1000.0
+    p_vsd_out_kw = p_superficie_kw + p_filtro_loss_kw + p_superficie_kw * 0.02
+    kva_vsd_req = (p_vsd_out_kw / eficiencia_vsd) / pf_entrada
+
+    # Tolerancia para que el propio punto de diseño (margen 0) resulte factible
+    motivos = {
+        "tension": ~(margen_tension >= -1e-9 * np.maximum(v_superficie_req, 1.0)),
+        "kva_vsd": kva_vsd_req > kva_vsd_nom if kva_vsd_nom else np.zeros(frecuencias.size, dtype=bool),
+    }
+    factible = ~(motivos["tension"] | motivos["kva_vsd"])
+    indices = np.flatnonzero(factible)
+
+    limite_inferior = limite_superior = None
+    if indices.size:
+        if indices[0] > 0:
+            limite_inferior = int(indices[0] - 1)
+        if indices[-1] < frecuencias.size - 1:
+            limite_superior = int(indices[-1] + 1)
+
+    return {
+        "frecuencia_hz": frecuencias.tolist(),
+        "v_vsd_out_v": v_vsd.tolist(),
+        "v_drop_filtro_v": v_drop_filtro.tolist(),
+        "v_trafo_in_v": v_trafo_in.tolist(),
+        "v_superficie_req_v": v_superficie_req.tolist(),
+        "v_superficie_entregada_v": v_entregada.tolist(),
+        "margen_tension_v": margen_tension.tolist(),
+        "tap_porcentaje_requerido": np.where(np.isfinite(tap_requerido), tap_requerido, None).tolist(),
+        "kva_vsd_req": kva_vsd_req.tolist(),
+        "factible": factible.tolist(),
+        "f_min_factible_hz": float(frecuencias[indices[0]]) if indices.size else None,
+        "f_max_factible_hz": float(frecuencias[indices[-1]]) if indices.size else None,
+        "limitante_inferior": _limitante(frecuencias, motivos, limite_inferior),
+        "limitante_superior": _limitante(frecuencias, motivos, limite_superior),
+        # Frecuencias límite interpoladas entre puntos del barrido
+        "f_min_tension_hz": _cruce(frecuencias, margen_tension),
+        "f_max_kva_vsd_hz": _cruce(frecuencias, kva_vsd_req - kva_vsd_nom) if kva_vsd_nom else None,
+    }
 
-    motor = _require_section(datos_diseno, "motor_placa")
-    cable = _require_section(datos_diseno, "cable_seleccionado")
-    config = _require_section(datos_diseno, "config_diseno_usuario")
-    catalogo = _require_section(datos_diseno, "catalogo_equipos")
 
+def _calcular_demanda_pozo(motor: Dict[str, Any], cable: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Paso A: tensión y potencia requeridas a la salida del transformador."""
     tipo_accionamiento = str(config.get("tipo_accionamiento", "")).lower()
     if tipo_accionamiento not in {"vsd", "tablero"}:
         raise SurfaceDesignError("Tipo de accionamiento no reconocido. Use 'vsd' o 'tablero'.")
@@ -155,7 +295,47 @@ def calcular_diseno_superficie(datos_diseno: Dict[str, Any]) -> Dict[str, Any]:
 
     p_motor_kw = (v_nom * i_nom * pf_nom * SQRT_3) / 1000.0
     p_cable_loss_kw = (3.0 * (i_nom ** 2) * r_total_ohms) / 1000.0
-    p_superficie_kw = p_motor_kw + p_cable_loss_kw
+
+    return {
+        "tipo_accionamiento": tipo_accionamiento,
+        "f_operacion": f_operacion,
+        "v_vsd_out_actual": v_vsd_out_actual,
+        "v_nom": v_nom,
+        "i_nom": i_nom,
+        "pf_nom": pf_nom,
+        "f_nom": f_nom,
+        "v_motor_op": v_motor_op,
+        "v_drop_cable": v_drop_cable,
+        "v_superficie_req": v_superficie_req,
+        "p_motor_kw": p_motor_kw,
+        "p_cable_loss_kw": p_cable_loss_kw,
+        "p_superficie_kw": p_motor_kw + p_cable_loss_kw,
+    }
+
+
+def calcular_diseno_superficie(datos_diseno: Dict[str, Any]) -> Dict[str, Any]:
+    """Calcula el diseño de equipos de superficie para VSD o tablero."""
+    if not isinstance(datos_diseno, dict):
+        raise SurfaceDesignError("'datos_diseno' debe ser un diccionario.")
+
+    warnings: List[str] = list(datos_diseno.get("warnings") or [])
+
+    motor = _require_section(datos_diseno, "motor_placa")
+    cable = _require_section(datos_diseno, "cable_seleccionado")
+    config = _require_section(datos_diseno, "config_diseno_usuario")
+    catalogo = _require_section(datos_diseno, "catalogo_equipos")
+
+    demanda = _calcular_demanda_pozo(motor, cable, config)
+    tipo_accionamiento = demanda["tipo_accionamiento"]
+    f_operacion: float = demanda["f_operacion"]
+    v_vsd_out_actual: Optional[float] = demanda["v_vsd_out_actual"]
+    i_nom = demanda["i_nom"]
+    v_motor_op = demanda["v_motor_op"]
+    v_drop_cable = demanda["v_drop_cable"]
+    v_superficie_req = demanda["v_superficie_req"]
+    p_motor_kw = demanda["p_motor_kw"]
+    p_cable_loss_kw = demanda["p_cable_loss_kw"]
+    p_superficie_kw = demanda["p_superficie_kw"]
 
     trafo = _require_section(catalogo, "transformador")
     v_primario_nom = _require_positive(trafo.get("v_primario_nom"), "catalogo_equipos.transformador.v_primario_nom")
@@ -173,6 +353,7 @@ def calcular_diseno_superficie(datos_diseno: Dict[str, Any]) -> Dict[str, Any]:
     v_sec_equivalente_calc: Optional[float] = None
     tap_porc_calculado: Optional[float] = None
     curva_v_hz_6_puntos: Optional[List[Dict[str, float]]] = None
+    barrido: Optional[Dict[str, Any]] = None
 
     if tipo_accionamiento == "vsd":
         filtro = _require_section(catalogo, "filtro_lc")
@@ -206,6 +387,27 @@ def calcular_diseno_superficie(datos_diseno: Dict[str, Any]) -> Dict[str, Any]:
 
         curva_v_hz_6_puntos = _build_vhz_curve(f_operacion, v_vsd_out_actual, warnings)
 
+        barrido_spec = config.get("barrido_frecuencia")
+        if barrido_spec:
+            if not isinstance(barrido_spec, dict):
+                barrido_spec = {}
+            barrido = _barrido_frecuencia(
+                barrido_spec,
+                demanda,
+                f_operacion,
+                v_vsd_out_actual,
+                i_vsd_out_aprox,
+                resistencia_filtro,
+                inductancia_l,
+                ratio_trafo_final,
+                v_primario_nom,
+                v_secundario_nom,
+                eficiencia_vsd,
+                pf_entrada,
+                _require_positive(vsd_catalogo.get("kva_nom"), "catalogo_equipos.vsd.kva_nom")
+                if vsd_catalogo.get("kva_nom") is not None else None
+            )
+
     else:  # tablero
         margen = _require_non_negative(
             config.get("margen_tension_tablero"),
@@ -251,5 +453,218 @@ def calcular_diseno_superficie(datos_diseno: Dict[str, Any]) -> Dict[str, Any]:
         },
         "warnings": warnings,
     }
+    if barrido is not None:
+        resultado["barrido_frecuencia"] = barrido
 
     return resultado
+
+
+def _catalog_column(entries: Sequence[Mapping[str, Any]], key: str, default: float = np.nan) -> np.ndarray:
+    """Columna numérica de un tipo de equipo (``default`` donde falta o no es numérica)."""
+    values = []
+    for entry in entries:
+        try:
+            values.append(float(entry.get(key)))
+        except (TypeError, ValueError):
+            values.append(default)
+    return np.array(values, dtype=float)
+
+
+def _required_column(entries: Sequence[Mapping[str, Any]], key: str, tipo: str) -> np.ndarray:
+    column = _catalog_column(entries, key)
+    invalid = ~(column > 0)
+    if invalid.any():
+        equipo = entries[int(np.flatnonzero(invalid)[0])].get("id")
+        raise SurfaceDesignError(f"El equipo '{equipo}' de '{tipo}' requiere '{key}' numérico mayor a cero.")
+    return column
+
+
+def _catalog_entries(catalogo: Mapping[str, Any], tipo: str) -> List[Mapping[str, Any]]:
+    entries = catalogo.get(tipo)
+    if not isinstance(entries, list) or not entries:
+        raise SurfaceDesignError(f"El catálogo de superficie no tiene equipos en '{tipo}'.")
+    return entries
+
+
+def _equipo_resumen(entry: Mapping[str, Any]) -> Dict[str, Any]:
+    return {"id": entry.get("id"), "nombre": entry.get("nombre")}
+
+
+def rankear_equipos_superficie(
+    datos_diseno: Dict[str, Any],
+    catalogo: Mapping[str, Any],
+    max_resultados: int = DEFAULT_MAX_RESULTADOS,
+    margen_kva_porc: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Evalúa todas las combinaciones transformador × filtro LC × VSD del catálogo.
+
+    Calcula TAP %, kVA requerido del VSD y del transformador y la factibilidad
+    de cada combinación en una sola pasada vectorizada (mismas ecuaciones que
+    ``calcular_diseno_superficie``) y devuelve las combinaciones factibles
+    ordenadas por potencia instalada (kVA de VSD + transformador), luego por
+    potencia de entrada y por cercanía del TAP al 100 %. Con tablero sólo se
+    combinan transformadores.
+
+    Args:
+        datos_diseno: 'motor_placa', 'cable_seleccionado' y 'config_diseno_usuario'
+        catalogo: {'transformadores': [...], 'filtros_lc': [...], 'vsds': [...]}
+        max_resultados: Largo de la lista corta
+        margen_kva_porc: Margen exigido sobre los kVA requeridos (%)
+
+    Returns:
+        dict: {'ranking': [...], 'diseno_recomendado': resultado de
+               calcular_diseno_superficie para la mejor combinación (o None),
+               'n_combinaciones', 'n_factibles', 'descartes': {motivo: cantidad},
+               'calculos_demanda_pozo'}
+    """
+    if not isinstance(datos_diseno, dict):
+        raise SurfaceDesignError("'datos_diseno' debe ser un diccionario.")
+    if not isinstance(catalogo, Mapping):
+        raise SurfaceDesignError("El catálogo de superficie debe ser un diccionario.")
+
+    motor = _require_section(datos_diseno, "motor_placa")
+    cable = _require_section(datos_diseno, "cable_seleccionado")
+    config = _require_section(datos_diseno, "config_diseno_usuario")
+    margen = 1.0 + _require_non_negative(margen_kva_porc, "margen_kva_porc") / 100.0
+
+    demanda = _calcular_demanda_pozo(motor, cable, config)
+    tipo_accionamiento = demanda["tipo_accionamiento"]
+    i_nom = demanda["i_nom"]
+    v_superficie_req = demanda["v_superficie_req"]
+    p_superficie_kw = demanda["p_superficie_kw"]
+    kva_trafo_req = SQRT_3 * v_superficie_req * i_nom / 1000.0
+
+    # Ejes: transformador (T, 1, 1), filtro (1, F, 1), VSD (1, 1, V)
+    trafos = _catalog_entries(catalogo, "transformadores")
+    v_primario = _required_column(trafos, "v_primario_nom", "transformadores")[:, None, None]
+    v_secundario = _required_column(trafos, "v_secundario_nom", "transformadores")[:, None, None]
+    kva_trafo = _catalog_column(trafos, "kva_nom", np.inf)[:, None, None]
+    tap_min = _catalog_column(trafos, "tap_min_porc", 0.0)[:, None, None]
+    tap_max = _catalog_column(trafos, "tap_max_porc", np.inf)[:, None, None]
+
+    if tipo_accionamiento == "vsd":
+        filtros = _catalog_entries(catalogo, "filtros_lc")
+        vsds = _catalog_entries(catalogo, "vsds")
+        resistencia = _required_column(filtros, "resistencia_r", "filtros_lc")[None, :, None]
+        inductancia = _required_column(filtros, "inductancia_l", "filtros_lc")[None, :, None]
+        i_filtro = _catalog_column(filtros, "i_nom_a", np.inf)[None, :, None]
+        eficiencia = _required_column(vsds, "eficiencia", "vsds")[None, None, :]
+        pf_entrada = _required_column(vsds, "pf_entrada", "vsds")[None, None, :]
+        kva_vsd = _catalog_column(vsds, "kva_nom", np.inf)[None, None, :]
+        i_vsd = _catalog_column(vsds, "i_out_nom_a", np.inf)[None, None, :]
+        v_vsd_max = _catalog_column(vsds, "v_out_max", np.inf)[None, None, :]
+
+        f_operacion = demanda["f_operacion"]
+        v_vsd_out = demanda["v_vsd_out_actual"]
+        i_vsd_out_aprox = i_nom * (v_secundario / v_primario)
+        z_filtro = np.hypot(resistencia, 2 * math.pi * f_operacion * inductancia)
+        v_trafo_in = v_vsd_out - i_vsd_out_aprox * z_filtro
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio_trafo = np.where(v_trafo_in > 0, v_superficie_req / v_trafo_in, np.nan)
+        tap = (ratio_trafo * v_primario / v_secundario) * 100.0
+
+        p_filtro_loss_kw = (i_vsd_out_aprox ** 2 * resistencia) / 1000.0
+        p_vsd_out_kw = p_superficie_kw + p_filtro_loss_kw + p_superficie_kw * 0.02
+        p_vsd_in_kw = p_vsd_out_kw / eficiencia
+        kva_vsd_req = p_vsd_in_kw / pf_entrada
+
+        shape = (len(trafos), len(filtros), len(vsds))
+        checks = {
+            "tension_entrada_trafo": ~(v_trafo_in > 0),
+            "tap_fuera_de_rango": ~((tap >= tap_min) & (tap <= tap_max)),
+            "kva_transformador": kva_trafo < kva_trafo_req * margen,
+            "corriente_filtro": i_filtro < i_vsd_out_aprox,
+            "kva_vsd": kva_vsd < kva_vsd_req * margen,
+            "corriente_vsd": i_vsd < i_vsd_out_aprox,
+            "tension_vsd": v_vsd_max < v_vsd_out,
+        }
+        potencia_instalada = kva_trafo + kva_vsd
+    else:
+        margen_tension = _require_non_negative(
+            config.get("margen_tension_tablero"),
+            "config_diseno_usuario.margen_tension_tablero"
+        )
+        v_tap_requerido = v_superficie_req * (1.0 + margen_tension / 100.0)
+        ratio_trafo = v_tap_requerido / v_primario
+        tap = (v_tap_requerido / v_secundario) * 100.0
+        p_vsd_in_kw = np.full((len(trafos), 1, 1), p_superficie_kw)
+        kva_vsd_req = np.full((len(trafos), 1, 1), np.nan)
+        v_trafo_in = np.broadcast_to(v_primario, (len(trafos), 1, 1))
+        filtros, vsds = [None], [None]
+        shape = (len(trafos), 1, 1)
+        checks = {
+            "tap_fuera_de_rango": ~((tap >= tap_min) & (tap <= tap_max)),
+            "kva_transformador": kva_trafo < kva_trafo_req * margen,
+        }
+        potencia_instalada = kva_trafo
+
+    failed = {name: np.broadcast_to(mask, shape) for name, mask in checks.items()}
+    feasible = np.ones(shape, dtype=bool)
+    for mask in failed.values():
+        feasible &= ~mask
+
+    columns = {
+        name: np.broadcast_to(values, shape).reshape(-1)
+        for name, values in (
+            ("potencia_instalada", potencia_instalada),
+            ("p_vsd_in_kw", p_vsd_in_kw),
+            ("tap", tap),
+            ("ratio_trafo", ratio_trafo),
+            ("kva_vsd_req", kva_vsd_req),
+            ("v_trafo_in", v_trafo_in),
+            ("kva_trafo", kva_trafo),
+        )
+    }
+    candidates = np.flatnonzero(feasible.reshape(-1))
+    order = candidates[np.lexsort((
+        np.abs(columns["tap"][candidates] - 100.0),
+        columns["p_vsd_in_kw"][candidates],
+        columns["potencia_instalada"][candidates],
+    ))][:max(int(max_resultados), 0)]
+
+    ranking = []
+    for flat in order:
+        t, f, v = np.unravel_index(flat, shape)
+        vsd = vsds[v]
+        kva_vsd_req_value = float(columns["kva_vsd_req"][flat])
+        entry = {
+            "transformador": _equipo_resumen(trafos[t]),
+            "filtro_lc": _equipo_resumen(filtros[f]) if filtros[f] is not None else None,
+            "vsd": _equipo_resumen(vsd) if vsd is not None else None,
+            "tap_porcentaje_calculado": float(columns["tap"][flat]),
+            "ratio_trafo_final": float(columns["ratio_trafo"][flat]),
+            "v_trafo_in_real_v": float(columns["v_trafo_in"][flat]),
+            "kva_transformador_req": kva_trafo_req,
+            "carga_transformador_porc": kva_trafo_req / float(columns["kva_trafo"][flat]) * 100.0,
+            "kva_vsd_req": kva_vsd_req_value if vsd is not None else None,
+            "carga_vsd_porc": (
+                kva_vsd_req_value / float(vsd["kva_nom"]) * 100.0
+                if vsd is not None and vsd.get("kva_nom") else None
+            ),
+            "p_entrada_kw": float(columns["p_vsd_in_kw"][flat]),
+            "potencia_instalada_kva": float(columns["potencia_instalada"][flat]),
+        }
+        ranking.append(entry)
+
+    diseno_recomendado = None
+    if ranking:
+        t, f, v = np.unravel_index(order[0], shape)
+        catalogo_equipos = {"transformador": dict(trafos[t])}
+        if tipo_accionamiento == "vsd":
+            catalogo_equipos.update(filtro_lc=dict(filtros[f]), vsd=dict(vsds[v]))
+        diseno_recomendado = calcular_diseno_superficie(dict(datos_diseno, catalogo_equipos=catalogo_equipos))
+
+    return {
+        "tipo_accionamiento": tipo_accionamiento,
+        "ranking": ranking,
+        "diseno_recomendado": diseno_recomendado,
+        "n_combinaciones": int(feasible.size),
+        "n_factibles": int(feasible.sum()),
+        "descartes": {name: int(mask.sum()) for name, mask in failed.items()},
+        "calculos_demanda_pozo": {
+            "v_superficie_req_v": v_superficie_req,
+            "p_superficie_kw": p_superficie_kw,
+            "kva_transformador_req": kva_trafo_req,
+        },
+    }
@@ -0,0 +1,10 @@
+"""Fixtures compartidos de los tests."""
+
+import pytest
+
+from sample_designs import install_synthetic_catalogs
+
+
+@pytest.fixture
+def synthetic_catalogs(monkeypatch):
+    install_synthetic_catalogs(monkeypatch.setattr)
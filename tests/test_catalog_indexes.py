@@ -0,0 +1,34 @@
+import pandas as pd
+
+import engineering_validation
+import equipment_selection
+
+
+def test_indexed_lookups_normalize_ids_and_keep_first_match(synthetic_catalogs):
+    specs = equipment_selection.get_motor_specs('  m1 ')
+    assert specs['id'] == 'M1' and specs['hp_nom'] == 150.0 and specs['tipo_motor'] == 'AM'
+    specs['hp_nom'] = 0.0
+    assert equipment_selection.get_motor_specs('M1')['hp_nom'] == 150.0
+    assert equipment_selection.get_motor_specs('M2') is None
+
+    assert equipment_selection.get_cable_specs('AWG_2')['r_ohm_km_20c'] == 0.55
+    assert equipment_selection.get_cable_specs('awg_6') is None
+    assert equipment_selection.get_pump_model(' p1 ').max_q == 260.0
+    assert equipment_selection.get_pump_model('P9') is None
+    assert 'error' in equipment_selection.get_pump_performance_curves('P9')
+
+    equipment_selection.MOTOR_CATALOG['id'] = ['MX']
+    assert engineering_validation._find_motor_data('mx')['HP NOM'] == 150.0
+
+
+def test_indexes_rebuild_when_catalog_is_replaced(synthetic_catalogs, monkeypatch):
+    assert equipment_selection.get_pump_model('P1') is not None
+    rows = equipment_selection.PUMP_CATALOG.to_dict(orient='records')
+    replacement = pd.DataFrame([dict(rows[0], Tipo='P2'), dict(rows[0], Tipo='P2', **{'Q máx': 999})])
+    monkeypatch.setattr(equipment_selection, 'PUMP_CATALOG', replacement)
+
+    assert equipment_selection.get_pump_model('P1') is None
+    assert equipment_selection.get_pump_model('P2').max_q == 260.0
+
+    monkeypatch.setattr(equipment_selection, 'COL_PUMP_ID', 'inexistente')
+    assert 'Configuración incorrecta' in equipment_selection.get_pump_performance_curves('P2')['error']
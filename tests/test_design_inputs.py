@@ -0,0 +1,72 @@
+import pickle
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+import hydraulic_calculations
+import well_performance
+from design_inputs import DesignInputError, InstallationInput, WellInput
+
+
+WELL = {
+    'method': 'Vogel',
+    'presion_reservorio': '150',
+    'presion_burbuja': '',
+    'pi': 2.5,
+    'profundidad_intake': 1500,
+    'presion_superficie': 12,
+    'tubing_id_mm': 62,
+}
+
+
+def test_well_input_parses_once_and_matches_dict_results():
+    well = WellInput.from_mapping(WELL)
+
+    assert well.presion_reservorio == 150.0 and well.presion_burbuja is None
+    assert well.method == 'vogel' and well.nivel_fluido_dinamico == 500.0
+    assert well['presion_reservorio'] == 150.0 and 'grado_api' not in well
+    assert well == WellInput.from_mapping(dict(reversed(list(WELL.items()))))
+    assert pickle.loads(pickle.dumps(well)).cache_key == well.cache_key
+    assert well.replace(pi=3.0).pi == 3.0 and well.pi == 2.5
+    with pytest.raises(FrozenInstanceError):
+        well.pi = 3.0
+
+    ipr = {'curve': [{'caudal': 0.0, 'pwf': 150.0}, {'caudal': 100.0, 'pwf': 110.0}]}
+    from_dict = hydraulic_calculations.calculate_pressure_demand_curve(dict(well), ipr)
+    from_model = hydraulic_calculations.calculate_pressure_demand_curve(well, ipr)
+    assert from_model['curve'] == from_dict['curve']
+
+
+def test_blank_fields_read_the_same_default_as_attribute_and_mapping():
+    well = WellInput.from_mapping({'presion_reservorio': '', 'pi': '3', 'n_points': ' '})
+
+    assert well.presion_reservorio == 150.0 and 'presion_reservorio' not in well
+    assert well.n_points == 50 and 'n_points' not in well
+    assert well == WellInput.from_mapping({'pi': 3.0})
+    assert well_performance.calculate_ipr(well)['q_max'] == pytest.approx(150.0 * 3.0)
+    with pytest.raises(TypeError):
+        well._data['pi'] = 4.0
+
+
+@pytest.mark.parametrize('value', ['abc', float('nan'), True])
+def test_well_input_rejects_invalid_numbers(value):
+    with pytest.raises(DesignInputError):
+        WellInput.from_mapping(dict(WELL, presion_reservorio=value))
+
+
+def test_well_input_rejects_unknown_flow_model():
+    assert WellInput.from_mapping(dict(WELL, modelo_flujo='Beggs_Brill')).modelo_flujo == 'beggs_brill'
+    with pytest.raises(DesignInputError, match='modelo_flujo'):
+        WellInput.from_mapping(dict(WELL, modelo_flujo='hagedorn_brown'))
+
+
+def test_installation_input_is_lenient_like_electrical_summary():
+    installation = InstallationInput.from_configs(
+        {'pump_id': 'P1', 'stages': '120'},
+        {'motor_id': 'M1'},
+        {'mle_longitud': 'x'},
+        {'gradiente_temp': None}
+    )
+    assert installation.stages == 120 and installation.mle_longitud == 0.0
+    assert installation.gradiente_temp == 0.0425
+    assert installation.missing_cable_keys == ('mle_tipo_id', 'fondo_tipo_id', 'superficie_tipo_id', 'superficie_longitud')
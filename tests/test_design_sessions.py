@@ -0,0 +1,44 @@
+import pytest
+
+import design_sessions
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_merge_patch_only_touches_changed_fields():
+    payload = {'well_data': {'pi': 2.5, 'q_test': 120}, 'pump_config': {'pump_id': 'P1', 'stages': 250}}
+    merged = design_sessions.merge_patch(payload, {'well_data': {'q_test': None, 'pi': 3.0}, 'pump_config': {'frequency_hz': 55}})
+    assert merged == {'well_data': {'pi': 3.0}, 'pump_config': {'pump_id': 'P1', 'stages': 250, 'frequency_hz': 55}}
+    assert payload['well_data'] == {'pi': 2.5, 'q_test': 120}
+
+
+def test_store_evicts_by_ttl_and_capacity():
+    clock = FakeClock()
+    discarded = []
+    store = design_sessions.SessionStore(ttl_seconds=60, max_sessions=2, clock=clock, on_discard=discarded.append)
+    first = store.create({'well_data': {'pi': 2.5}})
+    second = store.create({})
+
+    clock.now = 30.0
+    assert store.update(first.session_id, {'well_data': {'pi': 3.0}}).payload == {'well_data': {'pi': 3.0}}
+    third = store.create({})  # Capacidad: se desaloja la menos usada (second)
+    with pytest.raises(design_sessions.SessionNotFoundError):
+        store.get(second.session_id)
+
+    clock.now = 80.0
+    store.get(third.session_id)
+    clock.now = 100.0  # first inactiva por 70 s > TTL; third sigue vigente
+    with pytest.raises(design_sessions.SessionNotFoundError):
+        store.get(first.session_id)
+
+    stats = store.stats()
+    assert (stats['created'], stats['evicted'], stats['expired'], stats['misses']) == (3, 1, 1, 2)
+    assert stats['active'] == 1 and store.get(third.session_id) is third
+    assert store.close(third.session_id)
+    assert discarded == [second.session_id, first.session_id, third.session_id]
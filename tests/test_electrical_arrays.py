@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import electrical_calculations as ec
+from design_inputs import InstallationInput
+from equipment_selection import get_motor_specs
+
+
+CABLE = {'mle_tipo_id': 'awg_4', 'mle_longitud': 30, 'fondo_tipo_id': 'awg_2',
+         'superficie_tipo_id': 'awg_2', 'superficie_longitud': 50}
+
+
+def test_arrays_match_scalar_sections(synthetic_catalogs):
+    specs = get_motor_specs('M1')
+    installation = InstallationInput.from_configs({}, {'motor_id': 'M1'}, CABLE, {})
+    bhp = np.array([60.0, 95.0, 120.0, np.nan])
+    freq = np.array([45.0, 50.0, 60.0, 50.0])
+    depth = np.array([1200.0, 1500.0, 1800.0, 1500.0])
+    q = np.array([100.0, 150.0, 200.0, np.nan])
+    head = np.array([900.0, 1000.0, 1100.0, np.nan])
+
+    arrays = ec.calculate_electrical_arrays(specs, installation, bhp, freq, depth, q, head, 0.95)
+
+    for i in range(3):
+        motor = ec._calculate_motor_section('M1', specs, bhp[i], freq[i])
+        temps = {'intake': 15.0 + 0.0425 * depth[i], 'superficie': 25.0}
+        lengths = dict(CABLE, fondo_longitud=depth[i] - 30)
+        cable = ec._calculate_cable_losses(lengths, temps, motor['I_motor'])
+        surface = ec._calculate_surface_section(motor['P_motor_kW'], cable['P_perdida_kW'], motor['S_motor_kVA'], motor['PF_motor'])
+        assert arrays['I_motor'][i] == pytest.approx(motor['I_motor'])
+        assert arrays['Motor_Load_Percent'][i] == pytest.approx(motor['Motor_Load_Percent'])
+        assert arrays['P_perdida_kW'][i] == pytest.approx(cable['P_perdida_kW'])
+        assert arrays['P_superficie_kVA'][i] == pytest.approx(surface['P_superficie_kVA'])
+        assert arrays['PF_superficie'][i] == pytest.approx(surface['PF_superficie'])
+        hydraulic = q[i] * head[i] * 0.95 * ec.HYDRAULIC_POWER_CONSTANT
+        assert arrays['Eff_Sistema'][i] == pytest.approx(hydraulic / surface['P_superficie_kW'])
+
+    assert np.isnan(arrays['P_superficie_kW'][3]) and np.isnan(arrays['Eff_Sistema'][3])
+
+
+def test_arrays_require_complete_cable_config(synthetic_catalogs):
+    installation = InstallationInput.from_configs({}, {'motor_id': 'M1'}, {'mle_tipo_id': 'awg_4'}, {})
+    with pytest.raises(ec.ElectricalComputationError):
+        ec.calculate_electrical_arrays(get_motor_specs('M1'), installation, [80.0], [50.0], 1500.0)
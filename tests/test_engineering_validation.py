@@ -0,0 +1,39 @@
+import engineering_validation
+import equipment_selection
+
+
+def _counting(monkeypatch, name, calls):
+    original = getattr(equipment_selection, name)
+
+    def wrapper(*args, **kwargs):
+        calls[name] = calls.get(name, 0) + 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(equipment_selection, name, wrapper)
+
+
+def test_full_validation_builds_each_artifact_once(synthetic_catalogs, monkeypatch):
+    monkeypatch.setattr(equipment_selection, 'COL_MOTOR_ID', 'descripción')
+    monkeypatch.setattr(equipment_selection, 'COL_MOTOR_AMPS', 'AMP NOM')
+    calls = {}
+    for name in ('get_pump_performance_curves', 'get_motor_performance_curves', 'get_motor_record'):
+        _counting(monkeypatch, name, calls)
+
+    equipment = {'pump_id': 'P1', 'motor_id': 'M1', 'cable_id': 'awg_4'}
+    well = {'cable_length_m': 1500, 'temp_reservorio': 90}
+    context = engineering_validation.ValidationContext()
+    results = engineering_validation.validate_full_design(well, equipment, context)
+
+    assert context.pump_curves('P1') is context.pump_curves('P1')
+    assert context.motor_curves('M1')['amperaje']
+    assert calls == {
+        'get_pump_performance_curves': 1,
+        'get_motor_performance_curves': 1,
+        'get_motor_record': 1,
+    }
+    assert context.computed == {'pump_curves': 1, 'motor_curves': 1, 'motor_record': 1}
+
+    # Sin contexto explícito se obtiene el mismo reporte
+    assert engineering_validation.validate_full_design(well, equipment) == results
+    # Resistencia por defecto (0.2 ohm/km), también con cable_id: 44 A * 0.3 ohm / 2200 V
+    assert results['voltage_drop']['mensaje'] == 'Caída de voltaje estimada 0.6% (<5%).'
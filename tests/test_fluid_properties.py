@@ -0,0 +1,26 @@
+import dataclasses
+
+import pytest
+
+import hydraulic_calculations
+import well_performance
+from fluid_properties import FluidState
+
+
+WELL = {'grado_api': 28, 'agua_porcentaje': 40, 'gravedad_especifica_agua': 1.05, 'viscosidad': 3.0}
+
+
+def test_fluid_state_matches_legacy_helpers_and_is_immutable():
+    state = FluidState.from_well_data(WELL)
+    assert state.as_dict() == hydraulic_calculations.calculate_fluid_properties(WELL)
+    assert state.gradiente_bar_m == well_performance.calculate_fluid_gradient(28, 40, 1.05)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        state.gradiente_bar_m = 0.1
+    assert not hasattr(state, '__dict__')
+
+
+def test_shared_state_overrides_well_data_derivation():
+    state = FluidState.from_values(grado_api=10, agua_porcentaje=100, gravedad_especifica_agua=1.0)
+    ipr = well_performance.calculate_ipr(dict(WELL, method='linear'), state)
+    assert ipr['parameters']['gradiente'] == round(0.0981, 5)
+    assert hydraulic_calculations.calculate_tdh_basic(WELL, 0.0, state) == pytest.approx(1500 - 500 + 9 / 0.0981)
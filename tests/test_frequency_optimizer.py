@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import batch_evaluation
+import frequency_optimizer
+from sample_designs import CABLE, MOTOR, PUMP, WELL
+
+
+SCHEDULE = {
+    'periodos': [
+        {'nombre': 'inicial', 'caudal_requerido': 90, 'duracion_dias': 365},
+        {'nombre': 'declinado', 'caudal_requerido': 80, 'duracion_dias': 365,
+         'presion_reservorio': 125, 'agua_porcentaje': 60},
+        {'nombre': 'imposible', 'caudal_requerido': 1000},
+    ],
+    'freq_min': 30,
+    'freq_max': 70,
+}
+
+
+def test_optimizer_matches_fine_sweep(synthetic_catalogs):
+    result = frequency_optimizer.run_optimizer(WELL, PUMP, MOTOR, CABLE, {}, SCHEDULE)
+    periods = result['periodos']
+    assert [p['factible'] for p in periods] == [True, True, False] and result['n_infactibles'] == 1
+
+    context = batch_evaluation.build_batch_context(WELL, PUMP, MOTOR, CABLE, {})
+    schedule = frequency_optimizer.parse_schedule(SCHEDULE, WELL)[:2]
+    samples = frequency_optimizer._period_samples(schedule)
+    grid = np.tile(np.arange(30.0, 70.0 + 1e-9, 0.02), (2, 1))
+    sweep = frequency_optimizer.evaluate_candidates(context, samples, np.array([90.0, 80.0]), grid)
+    for idx in range(2):
+        assert periods[idx]['kwh_m3'] <= sweep['kwh_m3'][idx].min() + 1e-3
+        assert periods[idx]['q_m3d'] >= schedule[idx]['caudal_requerido'] - 1e-3
+        assert periods[idx]['Motor_Load_Percent'] <= 100.0
+
+    assert result['totales']['energia_kwh'] == pytest.approx(
+        sum(p['energia_kwh'] for p in periods[:2]), abs=0.5
+    )
+
+
+def test_invalid_schedule_raises(synthetic_catalogs):
+    with pytest.raises(frequency_optimizer.FrequencyOptimizationError):
+        frequency_optimizer.run_optimizer(WELL, PUMP, MOTOR, CABLE, {}, {'periodos': [{'caudal_requerido': -5}]})
+
+
+def test_infeasible_periods_are_not_refined(synthetic_catalogs):
+    context = batch_evaluation.build_batch_context(WELL, PUMP, MOTOR, CABLE, {})
+    schedule = frequency_optimizer.parse_schedule(SCHEDULE, WELL)
+    coarse = frequency_optimizer.optimize_frequencies(context, schedule[2:], 30.0, 70.0)
+    mixed = frequency_optimizer.optimize_frequencies(context, schedule, 30.0, 70.0)
+    feasible_only = frequency_optimizer.optimize_frequencies(context, schedule[:2], 30.0, 70.0)
+
+    assert not coarse['factible'][0] and coarse['n_evaluaciones'] == 41
+    assert mixed['n_evaluaciones'] == feasible_only['n_evaluaciones'] + 41
+    assert mixed['frequency_hz'][:2] == pytest.approx(feasible_only['frequency_hz'])
+
+
+def test_periods_without_an_override_keep_the_well_values(synthetic_catalogs):
+    periods = [
+        {'nombre': 'base', 'caudal_requerido': 90},
+        {'nombre': 'salmuera', 'caudal_requerido': 90, 'gravedad_especifica_agua': 1.05},
+    ]
+    result = frequency_optimizer.run_optimizer(WELL, PUMP, MOTOR, CABLE, {}, {'periodos': periods})
+    alone = frequency_optimizer.run_optimizer(WELL, PUMP, MOTOR, CABLE, {}, {'periodos': periods[:1]})
+
+    assert [p['factible'] for p in result['periodos']] == [True, True]
+    assert result['periodos'][0]['frequency_hz'] == alone['periodos'][0]['frequency_hz']
@@ -0,0 +1,38 @@
+import math
+
+import numpy as np
+
+import friction_factor
+import tubing_catalog
+
+
+def test_colebrook_solves_equation_for_whole_array():
+    reynolds = np.array([4e3, 1e4, 1e5, 1e6, 1e7])
+    eps = 0.046 / 62.0
+    f = friction_factor.colebrook_friction_factor(reynolds, eps)
+    residual = 1 / np.sqrt(f) + 2 * np.log10(eps / 3.7 + 2.51 / (reynolds * np.sqrt(f)))
+    assert np.all(np.abs(residual) < 1e-10)
+    # Valor de referencia del diagrama de Moody (Re = 1e5, ε/D = 1e-4)
+    assert math.isclose(float(friction_factor.colebrook_friction_factor(1e5, 1e-4)), 0.01852, rel_tol=2e-3)
+
+
+def test_table_matches_exact_solution_and_is_cached():
+    table = friction_factor.get_friction_table(62.0, 0.046)
+    assert friction_factor.get_friction_table(62.0, 0.046) is table
+
+    reynolds = np.logspace(0, 8, 500)
+    exact = friction_factor.colebrook_friction_factor(reynolds, 0.046 / 62.0)
+    assert np.allclose(table(reynolds), exact, rtol=2e-4)
+    # Laminar y sin flujo
+    assert math.isclose(float(table(1000.0)), 0.064)
+    assert float(table(0.0)) == 0.0
+
+
+def test_catalog_tables_are_precomputed_for_every_tubing_and_roughness():
+    tables = friction_factor.precompute_catalog_tables()
+    roughness = tubing_catalog.get_roughness_options()
+    assert len(tables) == len(tubing_catalog.get_tubing_catalog()) * len(roughness)
+    for tubing in tubing_catalog.get_tubing_catalog():
+        for key, roughness_mm in roughness.items():
+            # El cálculo reutiliza la tabla precalculada
+            assert friction_factor.get_friction_table(tubing['id_mm'], roughness_mm) is tables[(tubing['nombre'], key)]
@@ -0,0 +1,46 @@
+import math
+
+import hydraulic_calculations
+from well_performance import calculate_ipr
+
+
+WELL = {
+    'method': 'vogel',
+    'presion_reservorio': 150,
+    'presion_burbuja': 100,
+    'pi': 2.5,
+    'grado_api': 28,
+    'agua_porcentaje': 40,
+    'viscosidad': 3.0,
+    'profundidad_intake': 1500,
+    'presion_superficie': 12,
+    'presion_casing': 2,
+    'tubing_id_mm': 62.0,
+}
+
+
+def test_friction_array_matches_scalar():
+    caudales = [0.0, 5.0, 40.0, 150.0, 600.0]
+    losses = hydraulic_calculations.calculate_friction_loss_darcy_array(caudales, 1500, 62.0, 0.046, 900.0, 3.0)
+    for q, value in zip(caudales, losses):
+        expected = hydraulic_calculations.calculate_friction_loss_darcy(q, 1500, 62.0, 0.046, 900.0, 3.0)
+        assert math.isclose(value, expected, rel_tol=1e-12, abs_tol=1e-15)
+
+
+def test_pressure_demand_curve_follows_ipr_points():
+    ipr = calculate_ipr(dict(WELL))
+    demand = hydraulic_calculations.calculate_pressure_demand_curve(dict(WELL), ipr)
+    curve = demand['curve']
+    assert [p['caudal'] for p in curve] == [p['caudal'] for p in ipr['curve']]
+    assert curve[0]['pip'] == round(ipr['curve'][0]['pwf'] + WELL['presion_casing'], 2)
+    # La demanda es creciente con el caudal
+    assert all(b['tdh'] >= a['tdh'] for a, b in zip(curve, curve[1:]))
+
+
+def test_system_head_shares_ipr_grid_and_matches_pointwise_tdh():
+    ipr = calculate_ipr(dict(WELL))
+    system_head = hydraulic_calculations.calculate_system_head_curve(dict(WELL), ipr)
+    assert [p['caudal'] for p in system_head] == [p['caudal'] for p in ipr['curve']]
+    for point in system_head:
+        expected = hydraulic_calculations.calculate_tdh_basic(WELL, point['caudal'])
+        assert point['tdh'] == round(expected, 2)
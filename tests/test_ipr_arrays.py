@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import well_performance
+
+
+BASE = {
+    'presion_reservorio': 150,
+    'pi': 2.5,
+    'grado_api': 28,
+    'agua_porcentaje': 40,
+    'q_test': 120,
+    'pwf_test': 90,
+    'presion_burbuja': 100,
+    'n_exponent': 0.8,
+    'n_points': 40,
+}
+
+
+@pytest.mark.parametrize('method', well_performance.IPR_METHODS)
+def test_dict_output_is_adapter_over_array_core(method):
+    well = dict(BASE, method=method)
+    ipr = well_performance.calculate_ipr(dict(well))
+    arrays = well_performance.calculate_ipr_arrays(well)
+
+    assert [p['caudal'] for p in ipr['curve']] == [round(q, 2) for q in arrays['caudal'].tolist()]
+    assert [p['pwf'] for p in ipr['curve']] == [round(p, 2) for p in arrays['pwf'].tolist()]
+    assert np.allclose(arrays['model'].flow(arrays['pwf']), arrays['caudal'])
+
+
+def test_composite_vogel_is_linear_above_bubble_point():
+    model = well_performance.resolve_ipr_model(dict(BASE, method='vogel'))
+    assert not model.saturated
+    q = model.flow(np.array([150.0, 125.0, 100.0, 0.0]))
+    assert q[1] == pytest.approx(model.j * 25.0)
+    assert q[2] == pytest.approx(model.j * 50.0)
+    assert q[3] == pytest.approx(model.q_max)
+
+
+@pytest.mark.parametrize('well', [
+    dict(BASE, method='linear'),
+    dict(BASE, method='darcy'),
+    dict(BASE, method='vogel'),
+    dict(BASE, method='vogel', presion_burbuja=180),
+    dict(BASE, method='fetkovich'),
+])
+def test_pwf_at_inverts_flow(well):
+    model = well_performance.resolve_ipr_model(well)
+    pwf = np.linspace(0.0, model.pr, 61)[1:]
+    assert np.allclose(model.pwf_at(model.flow(pwf)), pwf, atol=1e-9)
+    assert model.pwf_at([0.0, model.q_max, 2 * model.q_max]).tolist() == [model.pr, 0.0, 0.0]
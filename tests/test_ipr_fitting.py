@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import ipr_fitting
+from well_performance import calculate_ipr
+
+
+def test_batch_fetkovich_recovers_c_and_n_with_padded_tests():
+    pr = np.array([150.0, 220.0, 180.0])
+    n_true = np.array([0.6, 0.75, 0.9])
+    c_true = np.array([0.4, 0.1, 0.25])
+    pwf = np.array([[30.0, 70.0, 110.0, 140.0], [20.0, 90.0, 150.0, np.nan], [50.0, 100.0, np.nan, np.nan]])
+    q = c_true[:, None] * (pr[:, None] ** n_true[:, None] - pwf ** n_true[:, None])
+
+    fit = ipr_fitting.fit_ipr_batch('fetkovich', pr, q, pwf)
+    assert fit.n_tests.tolist() == [4, 3, 2]
+    assert np.allclose(fit.n, n_true, atol=1e-3)
+    assert np.allclose(fit.c, c_true, rtol=1e-2)
+
+
+def test_fitted_vogel_feeds_calculate_ipr():
+    well = {'method': 'vogel', 'presion_reservorio': 150, 'presion_burbuja': 100}
+    tests = [{'q': 100, 'pwf': 120}, {'q': 180, 'pwf': 80, 'peso': 2.0}, {'q': 230, 'pwf': 40}]
+    model = ipr_fitting.fit_well_ipr(well, tests)
+    ipr = calculate_ipr(dict(well), model=model)
+
+    assert ipr['q_max'] == round(model.q_max, 2)
+    assert ipr['parameters']['productivity_index'] == round(model.j, 5)
+    with pytest.raises(ipr_fitting.IPRFittingError):
+        ipr_fitting.fit_well_ipr(well, tests, weights='desconocido')
@@ -0,0 +1,62 @@
+import json
+
+import live_updates
+from design_sessions import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _events(stream, n):
+    return [json.loads(next(stream).split('data: ', 1)[1]) for _ in range(n)]
+
+
+def test_burst_of_deltas_is_coalesced_into_one_computation():
+    store = SessionStore()
+    session = store.create({'pump_config': {'pump_id': 'P1', 'frequency_hz': 50}})
+    channel = live_updates.LiveChannel()
+    computed = []
+
+    def compute(payload, graph):
+        computed.append(payload['pump_config']['frequency_hz'])
+        return {'electrical_data': {'P_superficie_kW': payload['pump_config']['frequency_hz'] * 2.0}}
+
+    for freq in (51, 52, 53):
+        channel.push({'pump_config': {'frequency_hz': freq}})
+    channel.push({'pump_config': {'stages': 200}})
+
+    stream = live_updates.stream_updates(store, session.session_id, channel, compute, heartbeat_seconds=0.01)
+    initial, update = _events(stream, 2)
+
+    assert (initial['version'], initial['pending']) == (0, True)
+    assert (update['version'], update['pending']) == (4, False)
+    assert update['base']['electrical']['P_superficie_kW'] == 106.0
+    assert computed == [50, 53]  # Los estados intermedios no se calculan
+    assert channel.coalesced == 3
+    assert store.get(session.session_id).payload['pump_config'] == {'pump_id': 'P1', 'frequency_hz': 53, 'stages': 200}
+    assert next(stream) == ': keepalive\n\n'
+
+
+def test_expired_session_discards_channel_and_ends_single_stream():
+    clock = FakeClock()
+    channels = live_updates.LiveChannelRegistry()
+    store = SessionStore(ttl_seconds=60, clock=clock, on_discard=channels.discard)
+    session = store.create({})
+    channel = channels.get(session.session_id)
+
+    token = channel.attach()
+    assert token is not None and channel.attach() is None  # Un solo stream por sesión
+    stream = live_updates.stream_updates(store, session.session_id, channel, lambda payload, graph: {}, 0.01)
+    assert _events(stream, 1)[0]['version'] == 0
+    assert next(stream) == ': keepalive\n\n'
+
+    clock.now = 120.0
+    assert 'expirada' in _events(stream, 1)[0]['error']
+    assert channel.closed and channels.get(session.session_id) is not channel
+    channel.detach(token)
+    assert channel.attach() is not None
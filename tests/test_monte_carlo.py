@@ -0,0 +1,63 @@
+import io
+import contextlib
+
+import numpy as np
+import pytest
+
+import batch_evaluation
+import electrical_calculations
+import hydraulic_calculations
+import monte_carlo
+import well_performance
+from sample_designs import CABLE, MOTOR, PUMP, VOGEL_WELL as WELL
+
+
+def test_batch_matches_scalar_electrical_summary(synthetic_catalogs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        ipr = well_performance.calculate_ipr(dict(WELL))
+        demand = hydraulic_calculations.calculate_pressure_demand_curve(dict(WELL), ipr)
+        scalar = electrical_calculations.calculate_electrical_summary(WELL, demand, PUMP, MOTOR, CABLE, {}, 50.0, 'M1')
+
+    context = batch_evaluation.build_batch_context(WELL, PUMP, MOTOR, CABLE, {})
+    batch = batch_evaluation.evaluate_batch(context, {'presion_reservorio': np.array([150.0])}, 50.0)
+    assert batch['found'][0]
+    assert batch['P_superficie_kW'][0] == pytest.approx(scalar['P_superficie_kW'], rel=5e-3)
+    assert batch['Motor_Load_Percent'][0] == pytest.approx(scalar['Motor_Load_Percent'], rel=5e-3)
+
+
+def test_monte_carlo_percentiles_are_ordered_and_reproducible(synthetic_catalogs):
+    distributions = {
+        'presion_reservorio': {'tipo': 'normal', 'media': 150, 'desvio': 10},
+        'agua_porcentaje': {'tipo': 'uniforme', 'min': 30, 'max': 60},
+    }
+    first = monte_carlo.run_monte_carlo(WELL, PUMP, MOTOR, CABLE, {}, distributions, 500, seed=7, workers=1)
+    second = monte_carlo.run_monte_carlo(WELL, PUMP, MOTOR, CABLE, {}, distributions, 500, seed=7, workers=1)
+
+    flow = first['percentiles']['q_m3d']
+    assert first['n_converged'] == 500
+    assert flow['p10'] < flow['p50'] < flow['p90']
+    assert first == second
+    with pytest.raises(monte_carlo.MonteCarloError):
+        monte_carlo.run_monte_carlo(WELL, PUMP, MOTOR, CABLE, {}, {'tubing_id_mm': {'tipo': 'fijo', 'valor': 76}}, 10)
+
+
+def test_darcy_productivity_follows_sampled_viscosity(synthetic_catalogs):
+    darcy = dict(WELL, method='darcy', permeabilidad=20, espesor=10)
+    context = batch_evaluation.build_batch_context(darcy, PUMP, MOTOR, CABLE, {})
+    batch = batch_evaluation.batch_operating_points(context, {'viscosidad': np.array([3.0, 6.0, 3.0])}, 50.0)
+
+    for row, mu in enumerate((3.0, 6.0, 3.0)):
+        j = well_performance.resolve_ipr_model(dict(darcy, viscosidad=mu)).j
+        q, pwf = batch['q_m3d'][row], batch['pwf_bar'][row]
+        assert q == pytest.approx(j * (150 - pwf), rel=1e-6)
+    assert batch['q_m3d'][1] < batch['q_m3d'][0] == batch['q_m3d'][2]
+
+
+def test_sampled_pi_replaces_test_and_darcy_productivity(synthetic_catalogs):
+    for well in (WELL, dict(WELL, method='darcy', permeabilidad=20, espesor=10)):
+        context = batch_evaluation.build_batch_context(well, PUMP, MOTOR, CABLE, {})
+        batch = batch_evaluation.batch_operating_points(context, {'pi': np.array([1.0, 2.0, np.nan])}, 50.0)
+        base = batch_evaluation.batch_operating_points(context, {}, 50.0)
+        assert batch['q_m3d'][0] < batch['q_m3d'][1]
+        # Sin IP propio la fila conserva la prueba / el J de Darcy
+        assert batch['q_m3d'][2] == pytest.approx(base['q_m3d'][0], rel=1e-12)
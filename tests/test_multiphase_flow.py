@@ -0,0 +1,81 @@
+import dataclasses
+
+import numpy as np
+
+import hydraulic_calculations
+import multiphase_flow
+import well_performance
+import wellbore_traverse
+from calculation_graph import CalculationGraph
+from design_inputs import InstallationInput
+from fluid_properties import FluidState
+from scenario_executor import ScenarioTask
+
+
+WELL = {
+    'profundidad_intake': 1800,
+    'presion_superficie': 15,
+    'presion_casing': 1,
+    'grado_api': 32,
+    'agua_porcentaje': 40,
+    'gor': 120,
+    'gravedad_gas': 0.7,
+    'viscosidad': 3.0,
+    'presion_burbuja': 120,
+    'modelo_flujo': 'beggs_brill',
+}
+CAUDAL = np.linspace(0.0, 400.0, 21)
+PWF = np.linspace(180.0, 0.0, 21)
+
+
+def test_water_without_gas_is_hydrostatic_column():
+    pvt = multiphase_flow.pvt_from_well_data({'agua_porcentaje': 100, 'gor': 0})
+    segments = wellbore_traverse.build_segments(1000, max_segment_m=100)
+    result = multiphase_flow.multiphase_traverse(segments, np.array([0.0]), pvt, 10.0)
+    assert np.allclose(result['presion'][-1], 10.0 + 1000.0 * 9.81 * 1000 / 1e5)
+    assert np.all(result['holdup'] == 1.0)
+
+
+def test_free_gas_lightens_column_and_reuses_pvt_tables():
+    arrays = hydraulic_calculations.compute_pressure_demand_arrays(WELL, CAUDAL, PWF)
+    dead = hydraulic_calculations.compute_pressure_demand_arrays(dict(WELL, gor=0), CAUDAL, PWF)
+    assert arrays['segments'] is not None
+    # Con gas libre la presión de descarga (TDH + PIP) es menor para caudales moderados
+    assert arrays['tdh'][5] < dead['tdh'][5]
+
+    hits = multiphase_flow.pvt_table.cache_info().hits
+    hydraulic_calculations.compute_pressure_demand_arrays(WELL, CAUDAL, PWF)
+    assert multiphase_flow.pvt_table.cache_info().hits > hits
+
+
+def test_demand_uses_installation_temperature_profile():
+    hot = {'temp_superficie_grad': 40, 'gradiente_temp': 0.06}
+    graph = CalculationGraph()
+    task = ScenarioTask(
+        key='base', well_data=WELL, fluid_state=FluidState.from_well_data(WELL), freq_hz=50.0,
+        configuracion_pozo=hot
+    )
+    values, _ = graph.evaluate(task)
+    ipr = values['ipr']
+    default = hydraulic_calculations.calculate_pressure_demand_curve(WELL, ipr)
+    expected = hydraulic_calculations.calculate_pressure_demand_curve(
+        WELL, ipr, installation=InstallationInput.from_configs(configuracion_pozo=hot)
+    )
+    assert values['pressure_demand_curve']['curve'] == expected['curve']
+    assert expected['curve'][5]['tdh'] != default['curve'][5]['tdh']
+
+    # Cambiar el perfil de temperatura invalida la curva de demanda multifásica
+    cooler = dataclasses.replace(task, configuracion_pozo={'temp_superficie_grad': 20})
+    assert 'pressure_demand_curve' in graph.evaluate(cooler)[1]
+
+
+def test_demand_at_flow_honours_installation_temperature_profile():
+    hot = InstallationInput.from_configs(configuracion_pozo={'temp_superficie_grad': 40, 'gradiente_temp': 0.06})
+    model = well_performance.resolve_ipr_model(dict(WELL, method='linear', presion_reservorio=180, pi=2.0))
+    caudal = np.array([50.0, 150.0, 250.0])
+
+    at_flow = hydraulic_calculations.compute_demand_at_flow(WELL, model, caudal, installation=hot)
+    grid = hydraulic_calculations.compute_pressure_demand_arrays(WELL, caudal, model.pwf_at(caudal), installation=hot)
+    default = hydraulic_calculations.compute_demand_at_flow(WELL, model, caudal)
+    assert np.allclose(at_flow['tdh'], grid['tdh'])
+    assert not np.allclose(at_flow['tdh'], default['tdh'])
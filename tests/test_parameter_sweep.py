@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import batch_evaluation
+import parameter_sweep
+from sample_designs import CABLE, MOTOR, PUMP, VOGEL_WELL as WELL
+
+
+def test_grid_cells_match_single_batch_rows(synthetic_catalogs):
+    result = parameter_sweep.run_sweep(
+        WELL, PUMP, MOTOR, CABLE, {},
+        {'parametro': 'frequency_hz', 'min': 45, 'max': 60, 'n': 4},
+        {'parametro': 'stages', 'valores': [300, 200.4, 250]}
+    )
+    assert result['eje_y']['valores'] == [200.0, 250.0, 300.0]
+    assert np.shape(result['salidas']['q_m3d']) == (3, 4)
+
+    context = batch_evaluation.build_batch_context(WELL, PUMP, MOTOR, CABLE, {})
+    for j, stages in enumerate(result['eje_y']['valores']):
+        for i, freq in enumerate(result['eje_x']['valores']):
+            single = batch_evaluation.evaluate_batch(context, {'stages': np.array([stages])}, freq)
+            assert result['salidas']['q_m3d'][j][i] == pytest.approx(single['q_m3d'][0], abs=1e-3)
+            assert result['salidas']['P_superficie_kW'][j][i] == pytest.approx(single['P_superficie_kW'][0], abs=1e-3)
+
+
+@pytest.mark.parametrize('eje_y', [
+    {'parametro': 'frequency_hz', 'valores': [50]},
+    {'parametro': 'pi', 'min': 3, 'max': 1},
+    {'parametro': 'pi', 'min': 1, 'max': 3, 'n': parameter_sweep.MAX_AXIS_POINTS + 1},
+    {'parametro': 'presion_reservorio_', 'valores': [100, 200]},
+    {'parametro': 'method', 'valores': [1, 2]},
+])
+def test_invalid_axes_raise(eje_y):
+    with pytest.raises(parameter_sweep.SweepError):
+        parameter_sweep.run_sweep(WELL, PUMP, MOTOR, CABLE, {}, {'parametro': 'frequency_hz', 'valores': [50]}, eje_y)
+
+
+def test_sweeping_pi_overrides_the_test_point(synthetic_catalogs):
+    result = parameter_sweep.run_sweep(
+        WELL, PUMP, MOTOR, CABLE, {},
+        {'parametro': 'pi', 'valores': [1.0, 2.0, 3.0]},
+        {'parametro': 'presion_reservorio', 'valores': [130, 150]}
+    )
+    for row in result['salidas']['q_m3d']:
+        assert row[0] < row[1] < row[2]
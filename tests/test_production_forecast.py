@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import batch_evaluation
+import production_forecast
+from sample_designs import CABLE, MOTOR, PUMP, WELL
+
+
+SPEC = {
+    'meses': 120,
+    'declinacion': {'presion_pct_anual': 5, 'corte_agua_pp_anual': 3},
+    'tarifa_kwh': 0.1,
+    'disponibilidad': 0.9,
+}
+
+
+def test_fixed_frequency_steps_match_batch_rows(synthetic_catalogs):
+    result = production_forecast.run_forecast(WELL, PUMP, MOTOR, CABLE, {}, SPEC, freq_hz=55.0)
+    steps = result['pasos']
+    assert result['n_pasos'] == 120 and result['meses'][:2] == [0.5, 1.5]
+    assert steps['presion_reservorio'][0] > steps['presion_reservorio'][-1]
+    assert steps['agua_porcentaje'][-1] == pytest.approx(40 + 3 * 119.5 / 12, abs=1e-3)
+
+    context = batch_evaluation.build_batch_context(WELL, PUMP, MOTOR, CABLE, {})
+    single = batch_evaluation.evaluate_batch(
+        context,
+        {'presion_reservorio': np.array([steps['presion_reservorio'][60]]),
+         'agua_porcentaje': np.array([steps['agua_porcentaje'][60]])},
+        55.0
+    )
+    assert steps['P_superficie_kW'][60] == pytest.approx(single['P_superficie_kW'][0], abs=1e-2)
+
+    hours = production_forecast.HOURS_PER_MONTH * 0.9
+    energy = sum(p * hours for p in steps['P_superficie_kW'] if p is not None)
+    assert result['totales']['energia_kwh'] == pytest.approx(energy, rel=1e-4)
+    assert result['totales']['costo'] == pytest.approx(energy * 0.1, rel=1e-4)
+
+
+def test_vsd_holds_target_rate_with_rising_frequency(synthetic_catalogs):
+    target = 80.0
+    spec = dict(SPEC, control={'modo': 'vsd', 'caudal_objetivo': target, 'freq_min': 30, 'freq_max': 70})
+    result = production_forecast.run_forecast(WELL, PUMP, MOTOR, CABLE, {}, spec)
+    steps = result['pasos']
+    # A freq_min el caudal puede superar el objetivo; entre límites lo iguala
+    assert all(q >= target - 0.5 for q, f in zip(steps['q_m3d'], steps['frequency_hz']) if f < 70)
+    controlled = [q for q, f in zip(steps['q_m3d'], steps['frequency_hz']) if 30 < f < 70]
+    assert controlled and all(q == pytest.approx(target, abs=0.5) for q in controlled)
+    assert steps['frequency_hz'][-1] >= steps['frequency_hz'][0]
+
+    with pytest.raises(production_forecast.ForecastError):
+        production_forecast.run_forecast(WELL, PUMP, MOTOR, CABLE, {}, dict(SPEC, control={'modo': 'vsd'}))
+
+
+def test_tested_well_flow_never_rises_under_pressure_decline(synthetic_catalogs):
+    vogel = dict(WELL, method='vogel', presion_burbuja=100, q_test=120, pwf_test=90)
+    spec = {'meses': 120, 'declinacion': {'presion_pct_anual': 8}}
+    result = production_forecast.run_forecast(vogel, PUMP, MOTOR, CABLE, {}, spec, freq_hz=55.0)
+    steps = result['pasos']
+    assert steps['presion_reservorio'][-1] < 90 < 100 < steps['presion_reservorio'][0]
+    flow = [q for q in steps['q_m3d'] if q is not None]
+    assert len(flow) > 60
+    assert all(later <= earlier + 1e-6 for earlier, later in zip(flow, flow[1:]))
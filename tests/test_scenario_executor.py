@@ -0,0 +1,120 @@
+import pytest
+
+import scenario_executor
+from calculation_graph import NODES, CalculationGraph
+from fluid_properties import FluidState
+
+
+WELL = {
+    'method': 'vogel',
+    'presion_reservorio': 150,
+    'presion_burbuja': 100,
+    'pi': 2.5,
+    'grado_api': 28,
+    'agua_porcentaje': 40,
+    'profundidad_intake': 1500,
+    'presion_superficie': 12,
+    'presion_casing': 2,
+}
+
+
+def _tasks():
+    tasks = [scenario_executor.ScenarioTask(
+        key='base', well_data=WELL, fluid_state=FluidState.from_well_data(WELL), freq_hz=50.0,
+        include_system_head=True
+    )]
+    for key, q_test in (('optimistic', 160), ('conservative', None), ('pessimistic', 90)):
+        well = dict(WELL, q_test=q_test, pwf_test=110) if q_test else WELL
+        tasks.append(scenario_executor.ScenarioTask(
+            key=key, well_data=well, fluid_state=FluidState.from_well_data(well), freq_hz=50.0
+        ))
+    return tasks
+
+
+def test_pool_results_match_serial_and_keep_task_order():
+    serial = scenario_executor.run_scenarios(_tasks(), workers=1)
+    try:
+        pooled = scenario_executor.run_scenarios(_tasks(), workers=2)
+    finally:
+        scenario_executor.shutdown_pool()
+
+    assert list(pooled) == ['base', 'optimistic', 'conservative', 'pessimistic']
+    # 'recalculated' depende de qué proceso resolvió cada nodo
+    strip = lambda results: {k: {f: v for f, v in r.items() if f != 'recalculated'} for k, r in results.items()}
+    assert strip(pooled) == strip(serial)
+    assert 'system_head_curve' in pooled['base'] and 'system_head_curve' not in pooled['optimistic']
+    assert pooled['conservative']['ipr'] == pooled['base']['ipr']
+    assert pooled['optimistic']['ipr']['q_max'] > pooled['pessimistic']['ipr']['q_max']
+    # Etapas idénticas: un solo resultado compartido por referencia
+    assert serial['conservative']['ipr'] is serial['base']['ipr']
+    assert serial['conservative']['electrical_data'] is serial['base']['electrical_data']
+
+
+def test_stage_keys_include_frequency_and_ignore_key_order():
+    base = _tasks()[0]
+    reordered = scenario_executor.ScenarioTask(
+        key='other', well_data=dict(reversed(list(WELL.items()))), fluid_state=base.fluid_state, freq_hz=50.0
+    )
+    faster = scenario_executor.ScenarioTask(
+        key='faster', well_data=WELL, fluid_state=base.fluid_state, freq_hz=60.0
+    )
+    assert reordered.curves_key == base.curves_key
+    assert reordered.electrical_key == base.electrical_key
+    assert faster.curves_key == base.curves_key
+    assert faster.electrical_key != base.electrical_key
+    with pytest.raises(TypeError):
+        base.well_data['pi'] = 3.0
+
+
+def test_graph_recalculates_only_invalidated_nodes(synthetic_catalogs):
+    graph = CalculationGraph()
+    pump = {'pump_id': 'P1', 'stages': 250}
+    cable = {'mle_tipo_id': 'awg_4', 'mle_longitud': 30, 'fondo_tipo_id': 'awg_2',
+             'superficie_tipo_id': 'awg_2', 'superficie_longitud': 50}
+
+    def run(freq_hz, cable_config):
+        task = scenario_executor.ScenarioTask(
+            key='base', well_data=WELL, fluid_state=FluidState.from_well_data(WELL), freq_hz=freq_hz,
+            pump_config=pump, motor_config={'motor_id': 'M1'}, cable_config=cable_config, motor_id='M1',
+            include_system_head=True
+        )
+        return scenario_executor.run_scenarios([task], workers=1, graph=graph)['base']
+
+    first = run(50.0, cable)
+    assert first['recalculated'] == list(NODES)
+    assert first['electrical_data']['P_superficie_kW'] is not None
+    assert run(50.0, cable)['recalculated'] == []
+    assert run(55.0, cable)['recalculated'] == ['pump_curves', 'operating_point', 'electrical']
+    assert run(55.0, dict(cable, superficie_longitud=80))['recalculated'] == ['electrical']
+
+
+def test_pooled_workers_share_node_keys_with_own_catalog_copies(synthetic_catalogs, monkeypatch):
+    import equipment_selection
+
+    def reload_copies(*args, **kwargs):
+        # Como un worker 'spawn': catálogos equivalentes pero objetos distintos
+        equipment_selection.PUMP_CATALOG = equipment_selection.PUMP_CATALOG.copy()
+        equipment_selection.MOTOR_CATALOG = equipment_selection.MOTOR_CATALOG.copy()
+        equipment_selection.CABLE_CATALOG = list(equipment_selection.CABLE_CATALOG)
+
+    monkeypatch.setattr(equipment_selection, 'load_catalogs', reload_copies)
+    pump = {'pump_id': 'P1', 'stages': 250}
+    cable = {'mle_tipo_id': 'awg_4', 'mle_longitud': 30, 'fondo_tipo_id': 'awg_2',
+             'superficie_tipo_id': 'awg_2', 'superficie_longitud': 50}
+    tasks = [
+        scenario_executor.ScenarioTask(
+            key=key, well_data=dict(WELL, pi=pi), fluid_state=FluidState.from_well_data(WELL), freq_hz=50.0,
+            pump_config=pump, motor_config={'motor_id': 'M1'}, cable_config=cable, motor_id='M1'
+        )
+        for key, pi in (('base', 2.5), ('optimistic', 3.0))
+    ]
+    scenario_executor.shutdown_pool()
+    try:
+        pooled = scenario_executor.run_scenarios(tasks, workers=2, graph=CalculationGraph())
+    finally:
+        scenario_executor.shutdown_pool()
+
+    for result in pooled.values():
+        assert sorted(result['recalculated']) == sorted(set(result['recalculated']))
+        assert 'pump_curves' in result['recalculated']
+        assert result['electrical_data']['P_superficie_kW'] is not None
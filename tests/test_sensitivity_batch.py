@@ -0,0 +1,69 @@
+import pytest
+
+import sensitivity_batch
+from sample_designs import CABLE, MOTOR, PUMP, VOGEL_WELL as WELL
+
+
+def test_batched_scenarios_match_individual_runs(synthetic_catalogs):
+    spec = {'tornado': {
+        'presion_reservorio': [130, 170],
+        'frequency_hz': [45, 60],
+        'profundidad_intake': [1300, 1700],
+        'viscosidad': [1, 10],
+        'stages': [200, 300],
+    }}
+    scenarios = sensitivity_batch.build_scenarios(spec, WELL, PUMP, 50.0)
+    batched = sensitivity_batch.evaluate_scenarios(WELL, PUMP, MOTOR, CABLE, {}, scenarios, 50.0)
+    # profundidad_intake cambia el contexto (cable, longitud de tubing): 3 lotes
+    assert batched['n_grupos'] == 3
+
+    for idx, scenario in enumerate(scenarios, start=1):
+        well, pump, freq = dict(WELL), dict(PUMP), 50.0
+        for key, value in scenario['overrides'].items():
+            if key == 'frequency_hz':
+                freq = value
+            elif key == 'stages':
+                pump['stages'] = value
+            else:
+                well[key] = value
+        single = sensitivity_batch.evaluate_scenarios(well, pump, MOTOR, CABLE, {}, [], freq)
+        for name in sensitivity_batch.OUTPUTS:
+            assert batched[name][idx] == pytest.approx(single[name][0], rel=1e-12)
+
+
+def test_run_sensitivity_returns_compact_table_and_chart_summaries(synthetic_catalogs):
+    spec = {
+        'tornado': {'frequency_hz': {'bajo': 45, 'alto': 60}, 'agua_porcentaje': [20, 60]},
+        'spider': {'parametros': ['presion_superficie'], 'variaciones_pct': [-10, 10]},
+    }
+    result = sensitivity_batch.run_sensitivity(WELL, PUMP, MOTOR, CABLE, {}, spec)
+
+    assert result['n_escenarios'] == 6
+    assert len(result['rows']) == 7 and result['rows'][0][0] == 'base'
+    assert all(len(row) == len(result['columns']) for row in result['rows'])
+    assert [entry['parametro'] for entry in result['tornado']] == ['frequency_hz', 'agua_porcentaje']
+    assert result['tornado'][0]['salida_alto'] > result['base']['q_m3d'] > result['tornado'][0]['salida_bajo']
+    spider = result['spider']['presion_superficie']
+    assert [point['variacion_pct'] for point in spider] == [-10.0, 0.0, 10.0]
+    assert spider[0]['salida'] > spider[1]['salida'] > spider[2]['salida']
+    with pytest.raises(sensitivity_batch.SensitivityError):
+        sensitivity_batch.run_sensitivity(WELL, PUMP, MOTOR, CABLE, {}, {})
+    for typo in ({'tornado': {'presion_reservorio_': [100, 200]}},
+                 {'escenarios': [{'overrides': {'presion_reservorio': 120, 'etapas': 200}}]},
+                 {'spider': {'parametros': ['indice_productividad']}}):
+        with pytest.raises(sensitivity_batch.SensitivityError, match='desconocido'):
+            sensitivity_batch.run_sensitivity(WELL, PUMP, MOTOR, CABLE, {}, typo)
+
+
+def test_rows_without_the_override_use_the_default(synthetic_catalogs):
+    well = {key: value for key, value in WELL.items() if key != 'presion_superficie'}
+    scenarios = [
+        {'nombre': 'agua_salada', 'overrides': {'gravedad_especifica_agua': 1.1}},
+        {'nombre': 'superficie', 'overrides': {'presion_superficie': 20}},
+    ]
+    batched = sensitivity_batch.evaluate_scenarios(well, PUMP, MOTOR, CABLE, {}, scenarios, 50.0)
+    single = sensitivity_batch.evaluate_scenarios(well, PUMP, MOTOR, CABLE, {}, [], 50.0)
+
+    assert batched['found'].all()
+    for name in sensitivity_batch.OUTPUTS:
+        assert batched[name][0] == pytest.approx(single[name][0], rel=1e-12)
@@ -0,0 +1,98 @@
+import copy
+
+import pytest
+
+import equipment_selection
+import surface_design
+
+
+DISENO = {
+    'motor_placa': {'v_nom': 2300.0, 'i_nom': 40.0, 'pf_nom': 0.85, 'f_nom': 60.0},
+    'cable_seleccionado': {'r_total_ohms': 12.5},
+    'config_diseno_usuario': {
+        'tipo_accionamiento': 'vsd', 'f_max_operativa': 62.0, 'v_vsd_out_configurada': 460.0,
+        'f_red': 50.0, 'margen_tension_tablero': 10.0,
+    },
+}
+
+
+def test_ranking_matches_single_design_for_every_shortlisted_combination():
+    catalogo = equipment_selection.get_surface_equipment_catalog()
+    result = surface_design.rankear_equipos_superficie(DISENO, catalogo, max_resultados=25)
+    ranking = result['ranking']
+    assert len(ranking) == 25 and result['n_combinaciones'] == 12 * 6 * 18
+    installed = [entry['potencia_instalada_kva'] for entry in ranking]
+    assert installed == sorted(installed)
+
+    for entry in ranking:
+        equipos = {
+            'transformador': equipment_selection.get_surface_equipment_specs('transformadores', entry['transformador']['id']),
+            'filtro_lc': equipment_selection.get_surface_equipment_specs('filtros_lc', entry['filtro_lc']['id']),
+            'vsd': equipment_selection.get_surface_equipment_specs('vsds', entry['vsd']['id']),
+        }
+        single = surface_design.calcular_diseno_superficie(dict(DISENO, catalogo_equipos=equipos))
+        assert entry['tap_porcentaje_calculado'] == pytest.approx(single['transformador_calculado']['tap_porcentaje_calculado'])
+        assert entry['kva_vsd_req'] == pytest.approx(single['vsd_calculado']['kva_vsd_req'])
+        assert equipos['transformador']['tap_min_porc'] <= entry['tap_porcentaje_calculado'] <= equipos['transformador']['tap_max_porc']
+        assert entry['kva_vsd_req'] <= equipos['vsd']['kva_nom']
+
+
+def test_tablero_ranks_transformers_only_and_reports_discards():
+    diseno = copy.deepcopy(DISENO)
+    diseno['config_diseno_usuario']['tipo_accionamiento'] = 'tablero'
+    catalogo = {'transformadores': [
+        {'id': 'chico', 'kva_nom': 100, 'v_primario_nom': 480, 'v_secundario_nom': 3811, 'tap_min_porc': 29, 'tap_max_porc': 100},
+        {'id': 'justo', 'kva_nom': 200, 'v_primario_nom': 480, 'v_secundario_nom': 3811, 'tap_min_porc': 29, 'tap_max_porc': 100},
+        {'id': 'sin_tap', 'kva_nom': 300, 'v_primario_nom': 480, 'v_secundario_nom': 2400, 'tap_min_porc': 90, 'tap_max_porc': 110},
+    ]}
+    result = surface_design.rankear_equipos_superficie(diseno, catalogo)
+    assert [entry['transformador']['id'] for entry in result['ranking']] == ['justo']
+    assert result['descartes'] == {'tap_fuera_de_rango': 1, 'kva_transformador': 1}
+    assert result['diseno_recomendado']['vsd_calculado']['kva_vsd_req'] is None
+
+    with pytest.raises(surface_design.SurfaceDesignError):
+        surface_design.rankear_equipos_superficie(DISENO, {'transformadores': catalogo['transformadores']})
+
+
+def test_frequency_sweep_matches_single_design_and_finds_limits():
+    equipos = {
+        'vsd': {'eficiencia': 0.97, 'pf_entrada': 0.96, 'kva_nom': 230.0},
+        'filtro_lc': {'resistencia_r': 0.005, 'inductancia_l': 0.0001},
+        'transformador': {'v_primario_nom': 480.0, 'v_secundario_nom': 2400.0},
+    }
+    diseno = copy.deepcopy(DISENO)
+    diseno['config_diseno_usuario']['barrido_frecuencia'] = {'frecuencias': [0, 2.5, 30, 60, 62, 70]}
+    result = surface_design.calcular_diseno_superficie(dict(diseno, catalogo_equipos=equipos))
+    barrido = result['barrido_frecuencia']
+
+    idx = barrido['frecuencia_hz'].index(62.0)
+    assert barrido['tap_porcentaje_requerido'][idx] == pytest.approx(result['transformador_calculado']['tap_porcentaje_calculado'])
+    assert barrido['v_drop_filtro_v'][idx] == pytest.approx(result['calculos_suministro_superficie']['v_drop_filtro_v'])
+    assert barrido['margen_tension_v'][idx] == pytest.approx(0.0, abs=1e-6)
+    assert barrido['v_vsd_out_v'][:2] == [0.0, pytest.approx(460.0 * 0.10 * 0.5)]
+    assert barrido['tap_porcentaje_requerido'][0] is None
+
+    assert barrido['kva_vsd_req'][idx] == result['vsd_calculado']['kva_vsd_req']
+    assert barrido['kva_vsd_req'][3] < barrido['kva_vsd_req'][idx] < barrido['kva_vsd_req'][5]
+
+    assert barrido['f_min_factible_hz'] == 62.0 and barrido['f_max_factible_hz'] == 62.0
+    assert barrido['limitante_inferior'] == {'frecuencia_hz': 60.0, 'motivo': 'tension'}
+    assert barrido['limitante_superior'] == {'frecuencia_hz': 70.0, 'motivo': 'kva_vsd'}
+    assert 62.0 < barrido['f_max_kva_vsd_hz'] < 70.0
+
+
+def test_frequency_sweep_row_at_operating_frequency_reproduces_design():
+    equipos = {
+        'vsd': {'eficiencia': 0.97, 'pf_entrada': 0.96, 'kva_nom': 160.0},
+        'filtro_lc': {'resistencia_r': 0.005, 'inductancia_l': 0.0001},
+        'transformador': {'v_primario_nom': 480.0, 'v_secundario_nom': 2400.0},
+    }
+    diseno = copy.deepcopy(DISENO)
+    diseno['motor_placa']['f_nom'] = 50.0
+    diseno['config_diseno_usuario'].update(f_max_operativa=60.0, barrido_frecuencia={'frecuencias': [50, 60]})
+    result = surface_design.calcular_diseno_superficie(dict(diseno, catalogo_equipos=equipos))
+    barrido = result['barrido_frecuencia']
+
+    assert barrido['kva_vsd_req'][1] == result['vsd_calculado']['kva_vsd_req']
+    assert barrido['v_superficie_req_v'][1] == result['calculos_demanda_pozo']['v_superficie_req_v']
+    assert barrido['factible'][1] == (result['vsd_calculado']['kva_vsd_req'] <= 160.0)
@@ -0,0 +1,41 @@
+import math
+
+import numpy as np
+
+import hydraulic_calculations
+import wellbore_traverse
+
+
+BASE = {
+    'profundidad_intake': 1500,
+    'tubing_id_mm': 62.0,
+    'presion_superficie': 12,
+    'presion_casing': 2,
+    'grado_api': 28,
+    'agua_porcentaje': 40,
+    'viscosidad': 3.0,
+}
+CAUDAL = np.linspace(0.0, 400.0, 21)
+PWF = np.linspace(150.0, 0.0, 21)
+
+
+def test_vertical_survey_matches_single_tubing_model():
+    plain = hydraulic_calculations.compute_pressure_demand_arrays(BASE, CAUDAL, PWF)
+    vertical = dict(BASE, survey=[{'md': 0, 'tvd': 0}, {'md': 1500, 'tvd': 1500}])
+    traversed = hydraulic_calculations.compute_pressure_demand_arrays(vertical, CAUDAL, PWF)
+    assert np.allclose(plain['tdh'], traversed['tdh'])
+
+
+def test_deviated_tapered_string_uses_tvd_and_segment_ids():
+    segments = wellbore_traverse.build_segments(
+        1500,
+        survey=[{'md': 500, 'inclinacion': 0}, {'md': 1500, 'inclinacion': 60}],
+        tubing_string=[{'md_base': 800, 'tubing': 'Tbg 3-1/2"'}, {'md_base': 1500, 'tubing': 'Tbg 2-7/8"'}],
+    )
+    assert segments.id_mm.tolist() == [76.2, 76.2, 62.0]
+    assert math.isclose(segments.profundidad_tvd, 500 + 1000 * math.cos(math.radians(30)))
+
+    result = wellbore_traverse.single_phase_traverse(segments, CAUDAL, 900.0, 3.0, 0.088, presion_superficie_bar=12.0)
+    assert result['presion'].shape == (segments.md_top.size + 1, CAUDAL.size)
+    # Sin flujo, la presión de descarga es puramente hidrostática
+    assert math.isclose(result['presion'][-1, 0], 12.0 + 0.088 * segments.profundidad_tvd)
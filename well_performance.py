@@ -10,6 +10,12 @@
 
 import math
 from copy import deepcopy
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from fluid_properties import FluidState, resolve_fluid_state
 
 def calculate_fluid_gradient(grado_api, agua_porcentaje, gravedad_especifica_agua=1.0):
     """
@@ -29,23 +35,7 @@ def calculate_fluid_gradient(grado_api, agua_porcentaje, gravedad_especifica_agu
         - Densidad mezcla = densidad_oil * (1 - fw) + densidad_water * fw
         - Gradiente (bar/m) = densidad_mezcla * 9.81 / 100000
     """
-    # Densidad del petróleo según API
-    densidad_oil = 141.5 / (131.5 + grado_api)  # g/cm³
-    
-    # Densidad del agua (basada en gravedad específica)
-    densidad_water = gravedad_especifica_agua  # g/cm³
-    
-    # Fracción de agua (0 a 1)
-    fraccion_agua = agua_porcentaje / 100.0
-    
-    # Densidad de la mezcla
-    densidad_mezcla = densidad_oil * (1 - fraccion_agua) + densidad_water * fraccion_agua  # g/cm³
-    
-    # Gradiente en bar/m
-    # 1 g/cm³ * 9.81 m/s² = 9810 Pa/m = 0.0981 bar/m
-    gradiente = densidad_mezcla * 0.0981  # bar/m
-    
-    return gradiente
+    return FluidState.from_values(grado_api, agua_porcentaje, gravedad_especifica_agua).gradiente_bar_m
 
 
 def pressure_to_level(presion_bar, presion_referencia_bar, gradiente_bar_per_m):
@@ -68,7 +58,7 @@ def pressure_to_level(presion_bar, presion_referencia_bar, gradiente_bar_per_m):
     
     return nivel_m
 
-def calculate_ipr(well_data):
+def calculate_ipr(well_data, fluid_state=None, model=None):
     """
     Calcula los puntos de la curva de IPR (Inflow Performance Relationship)
     basado en los datos del pozo y el método seleccionado.
@@ -89,6 +79,9 @@ def calculate_ipr(well_data):
                           - skin: Factor de daño (para Darcy)
                           - q_test (m³/d): Caudal de prueba (para Vogel/Fetkovich)
                           - pwf_test (bar): Presión de fondo fluyente de prueba (para Vogel/Fetkovich)
+        fluid_state (FluidState): Propiedades del fluido ya resueltas (opcional)
+        model (IPRModel): Parámetros ya resueltos, p. ej. de `ipr_fitting` (opcional);
+                          si se pasa, su método prevalece sobre well_data['method']
     
     Returns:
         dict: {
@@ -100,96 +93,149 @@ def calculate_ipr(well_data):
     """
     print("Calculando IPR...")
     
-    method = well_data.get('method', 'linear').lower()
+    method = model.method if model is not None else well_data.get('method', 'linear').lower()
     pr = well_data.get('presion_reservorio', 150)  # bar
     
     if method == 'vogel':
-        return calculate_ipr_vogel(well_data)
+        return calculate_ipr_vogel(well_data, fluid_state, model)
     elif method == 'fetkovich':
-        return calculate_ipr_fetkovich(well_data)
+        return calculate_ipr_fetkovich(well_data, fluid_state, model)
     elif method == 'darcy':
-        return calculate_ipr_darcy(well_data)
+        return calculate_ipr_darcy(well_data, fluid_state, model)
     else:  # linear por defecto
-        return calculate_ipr_linear(well_data)
+        return calculate_ipr_linear(well_data, fluid_state, model)
+
+
+# ---------------------------------------------------------------------------
+# Núcleo vectorizado del IPR
+# ---------------------------------------------------------------------------
+# Cada método se resuelve primero a un IPRModel (parámetros ya derivados de los
+# datos de prueba) y la curva se evalúa sobre arreglos completos de Pwf. Las
+# funciones calculate_ipr_* sólo adaptan los arreglos al formato de la API.
+
+IPR_METHODS = ('linear', 'vogel', 'fetkovich', 'darcy')
 
 
-def calculate_ipr_linear(well_data):
+@dataclass(frozen=True)
+class IPRModel:
     """
-    IPR Lineal: Pwf = Pr - (Q / PI)
-    Válido para flujo monofásico sobre presión de burbuja.
-    UNIDADES: Pr(bar), PI(m³/d/bar), Q(m³/d)
+    Parámetros resueltos de un IPR.
+
+    - linear / darcy: q = j * (pr - pwf)
+    - vogel saturado: q = q_max * (1 - 0.2 r - 0.8 r²), r = pwf / pr
+    - vogel compuesto: lineal sobre pb, Vogel desplazado bajo pb
+    - fetkovich: q = c * (pr^n - pwf^n)
     """
+
+    method: str
+    label: str
+    pr: float
+    q_max: float
+    j: Optional[float] = None
+    pb: Optional[float] = None
+    c: Optional[float] = None
+    n: Optional[float] = None
+    saturated: bool = False
+
+    def flow(self, pwf):
+        """
+        Caudal (m³/d) para uno o varios valores de Pwf (bar).
+
+        Los parámetros pueden ser escalares o arreglos (modelos por lote de
+        `resolve_ipr_model_batch`); se combinan con Pwf por broadcasting.
+        """
+        pwf = np.asarray(pwf, dtype=float)
+
+        if self.method == 'vogel':
+            q = _vogel_flow(pwf, self.pr, self.pb, self.j, self.q_max, self.saturated)
+        elif self.method == 'fetkovich':
+            q = self.c * ((self.pr ** self.n) - (pwf ** self.n))
+        else:
+            q = self.j * (self.pr - pwf)
+
+        return np.where(q < 0, 0.0, q)
+
+    def q_at(self, pwf):
+        """Alias de `flow`: caudal (m³/d) a Pwf (bar)."""
+        return self.flow(pwf)
+
+    def pwf_at(self, q):
+        """
+        Inversa cerrada del IPR: Pwf (bar) para uno o varios caudales (m³/d).
+
+        El caudal se acota a [0, q_max]: q <= 0 devuelve pr y q >= q_max
+        devuelve 0. Admite parámetros arreglo igual que `flow`.
+        """
+        q = np.asarray(q, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.method == 'vogel':
+                pwf = _vogel_pwf(q, self.pr, self.pb, self.j, self.q_max, self.saturated)
+            elif self.method == 'fetkovich':
+                # pwf = (pr^n - q/c)^(1/n)
+                base = np.maximum((self.pr ** self.n) - q / self.c, 0.0)
+                pwf = base ** (1.0 / self.n)
+            else:
+                pwf = self.pr - q / self.j
+
+        pwf = np.clip(pwf, 0.0, self.pr)
+        pwf = np.where(q <= 0, self.pr, pwf)
+        return np.where(q >= self.q_max, 0.0, pwf)
+
+
+def _vogel_ratio(fraction):
+    """Raíz positiva de 1 - 0.2 r - 0.8 r² = fraction (r = pwf / p_ref)."""
+    fraction = np.clip(fraction, 0.0, 1.0)
+    return (-0.2 + np.sqrt(0.04 + 3.2 * (1 - fraction))) / 1.6
+
+
+def _vogel_pwf(q, pr, pb, j, q_max, saturated):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Saturado: q / q_max = 1 - 0.2 r - 0.8 r², r = pwf / pr
+        pwf_saturated = pr * _vogel_ratio(np.where(q_max > 0, q / q_max, 1.0))
+
+        # Compuesto: lineal hasta q_bubble, Vogel desplazado bajo pb
+        pb_safe = np.where(pb > 0, pb, 1e-6)
+        q_bubble = j * (pr - pb)
+        pwf_linear = pr - q / j
+        fraction = (q - q_bubble) / (j * pb_safe / 1.8)
+        pwf_vogel_part = pb_safe * _vogel_ratio(fraction)
+        pwf_composite = np.where(q <= q_bubble, pwf_linear, pwf_vogel_part)
+
+    return np.where(saturated, pwf_saturated, pwf_composite)
+
+
+def _vogel_flow(pwf, pr, pb, j, q_max, saturated):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Saturado: Vogel sobre pr
+        ratio = np.where(pr != 0, pwf / pr, 0.0)
+        q_saturated = q_max * (1 - 0.2 * ratio - 0.8 * (ratio ** 2))
+
+        # Compuesto: lineal sobre pb, Vogel desplazado bajo pb
+        pb_safe = np.where(pb > 0, pb, 1e-6)
+        q_bubble = j * (pr - pb)
+        ratio = pwf / pb_safe
+        q_vogel_part = (j * pb_safe / 1.8) * (1 - 0.2 * ratio - 0.8 * (ratio ** 2))
+        q_composite = np.where(pwf >= pb, j * (pr - pwf), q_bubble + q_vogel_part)
+
+    return np.where(saturated, q_saturated, q_composite)
+
+
+def _linear_model(well_data):
     pr = well_data.get('presion_reservorio', 150)  # bar
     pi = well_data.get('pi', 5.0)  # m³/d/bar
-    n_points = well_data.get('n_points', 50)
-    
-    # Parámetros del fluido
-    grado_api = well_data.get('grado_api', 30)  # °API
-    agua_porcentaje = well_data.get('agua_porcentaje', 0)  # %
-    gravedad_especifica_agua = well_data.get('gravedad_especifica_agua', 1.0)  # SG
-    
-    # Calcular gradiente del fluido
-    gradiente = calculate_fluid_gradient(grado_api, agua_porcentaje, gravedad_especifica_agua)  # bar/m
-    
-    q_max = pr * pi  # m³/d
-    
-    ipr_curve = []
-    for i in range(n_points + 1):
-        q = (q_max / n_points) * i
-        pwf = pr - (q / pi)
-        
-        if pwf < 0:
-            pwf = 0
-        
-        # Calcular nivel de fluido
-        nivel = pressure_to_level(pwf, pr, gradiente)
-            
-        ipr_curve.append({
-            "caudal": round(q, 2), 
-            "pwf": round(pwf, 2),
-            "nivel": round(nivel, 2)
-        })
-        
-        if pwf == 0:
-            break
-    
-    return {
-        'method': 'Linear (Darcy)',
-        'curve': ipr_curve,
-        'q_max': round(q_max, 2),
-        'parameters': {
-            'pi': pi,
-            'pr': pr,
-            'gradiente': round(gradiente, 5),
-            'grado_api': grado_api,
-            'agua_porcentaje': agua_porcentaje
-        }
-    }
+    return IPRModel(method='linear', label='Linear (Darcy)', pr=pr, q_max=pr * pi, j=pi)
 
 
-def calculate_ipr_vogel(well_data):
-    """
-    IPR de Vogel compuesta (Standing) con soporte para reservorios saturados y sub-saturados.
-    UNIDADES: Pr(bar), Pb(bar), Q(m³/d)
-    """
+def _vogel_model(well_data):
     pr = well_data.get('presion_reservorio', 150)
     pb = well_data.get('presion_burbuja', pr * 0.8)
     q_test = well_data.get('q_test', None)
     pwf_test = well_data.get('pwf_test', None)
-    n_points = well_data.get('n_points', 50)
-
-    grado_api = well_data.get('grado_api', 30)
-    agua_porcentaje = well_data.get('agua_porcentaje', 0)
-    gravedad_especifica_agua = well_data.get('gravedad_especifica_agua', 1.0)
-
-    gradiente = calculate_fluid_gradient(grado_api, agua_porcentaje, gravedad_especifica_agua)
     pi_default = well_data.get('pi', 5.0)
 
-    saturated_reservoir = pr <= pb
-    ipr_curve = []
-    productivity_index = pi_default
-
-    if saturated_reservoir:
+    if pr <= pb:
+        productivity_index = pi_default
         if q_test is not None and pwf_test is not None:
             ratio = pwf_test / pr if pr else 0
             productivity_ratio = 1 - 0.2 * ratio - 0.8 * (ratio ** 2)
@@ -203,164 +249,287 @@ def calculate_ipr_vogel(well_data):
         else:
             q_max = pr * pi_default * 0.8
 
-        for i in range(n_points + 1):
-            pwf = pr * (1 - i / n_points)
-            if pwf < 0:
-                pwf = 0
-
-            ratio = pwf / pr if pr else 0
-            q = q_max * (1 - 0.2 * ratio - 0.8 * (ratio ** 2))
-            if q < 0:
-                q = 0
-
-            nivel = pressure_to_level(pwf, pr, gradiente)
-            ipr_curve.append({
-                "caudal": round(q, 2),
-                "pwf": round(pwf, 2),
-                "nivel": round(nivel, 2)
-            })
-
-        method_label = 'Vogel (Bifásico - Saturado)'
-        q_max_output = q_max
+        return IPRModel(
+            method='vogel',
+            label='Vogel (Bifásico - Saturado)',
+            pr=pr,
+            q_max=max(q_max, 0),
+            j=productivity_index,
+            pb=pb,
+            saturated=True
+        )
+
+    j_value = None
+    if q_test is not None and pwf_test is not None:
+        if pwf_test >= pb:
+            denom = pr - pwf_test
+            if denom > 0:
+                j_value = q_test / denom
+        else:
+            denom = (pr - pb) + (pb / 1.8) * (
+                1 - 0.2 * (pwf_test / pb) - 0.8 * ((pwf_test / pb) ** 2)
+            ) if pb else None
+            if denom and denom > 0:
+                j_value = q_test / denom
+
+    if j_value is None or j_value <= 0:
+        j_value = pi_default
+
+    pb_safe = pb if pb > 0 else 1e-6
+    q_bubble = j_value * (pr - pb)
+    q_vogel_aof = (j_value * pb_safe / 1.8)
+
+    return IPRModel(
+        method='vogel',
+        label='Vogel (Bifásico - Compuesta)',
+        pr=pr,
+        q_max=max(q_bubble + q_vogel_aof, 0),
+        j=j_value,
+        pb=pb
+    )
+
+
+def _fetkovich_model(well_data):
+    pr = well_data.get('presion_reservorio', 150)  # bar
+    q_test = well_data.get('q_test', None)  # m³/d
+    pwf_test = well_data.get('pwf_test', None)  # bar
+    n = well_data.get('n_exponent', 1.0)  # Exponente (típicamente 0.5 a 1.0)
+
+    # Calcular constante C de datos de prueba
+    if q_test and pwf_test:
+        c = q_test / ((pr ** n) - (pwf_test ** n)) if (pr ** n - pwf_test ** n) > 0 else 0.001
     else:
-        j_value = None
-        if q_test is not None and pwf_test is not None:
-            if pwf_test >= pb:
-                denom = pr - pwf_test
-                if denom > 0:
-                    j_value = q_test / denom
-            else:
-                denom = (pr - pb) + (pb / 1.8) * (
-                    1 - 0.2 * (pwf_test / pb) - 0.8 * ((pwf_test / pb) ** 2)
-                ) if pb else None
-                if denom and denom > 0:
-                    j_value = q_test / denom
-
-        if j_value is None or j_value <= 0:
-            j_value = pi_default
-
-        productivity_index = j_value
-        pb_safe = pb if pb > 0 else 1e-6
-        q_bubble = j_value * (pr - pb)
-
-        for i in range(n_points + 1):
-            pwf = pr * (1 - i / n_points)
-            if pwf < 0:
-                pwf = 0
-
-            if pwf >= pb:
-                q = j_value * (pr - pwf)
-            else:
-                ratio = pwf / pb_safe
-                q_vogel_part = (j_value * pb_safe / 1.8) * (
-                    1 - 0.2 * ratio - 0.8 * (ratio ** 2)
-                )
-                q = q_bubble + q_vogel_part
+        # Estimación si no hay datos
+        pi_estimate = well_data.get('pi', 5.0)  # m³/d/bar
+        c = pi_estimate / pr
+
+    return IPRModel(method='fetkovich', label='Fetkovich (Empírico)', pr=pr, q_max=c * (pr ** n), c=c, n=n)
+
+
+def _darcy_model(well_data):
+    pr = well_data.get('presion_reservorio', 150)  # bar
+    k = well_data.get('permeabilidad', 100)  # mD
+    h = well_data.get('espesor', 15)  # m (equiv. ~50 ft)
+    re = well_data.get('radio_drenaje', 300)  # m (equiv. ~1000 ft)
+    rw = well_data.get('radio_pozo', 0.15)  # m (equiv. ~0.5 ft)
+    mu = well_data.get('viscosidad', 1.0)  # cp
+    bo = well_data.get('factor_volumen', 1.2)  # m³/m³
+    skin = well_data.get('skin', 0)
+
+    # Constante de la ecuación de Darcy (sistema métrico)
+    # Q(m³/d) = 0.543 * k(mD) * h(m) * ΔP(bar) / [μ(cp) * Bo(m³/m³) * (ln(re/rw) + S)]
+    const = (0.543 * k * h) / (mu * bo * (math.log(re / rw) + skin))
+
+    return IPRModel(method='darcy', label='Darcy (Radial)', pr=pr, q_max=const * pr, j=const)
+
+
+_MODEL_BUILDERS = {
+    'linear': _linear_model,
+    'vogel': _vogel_model,
+    'fetkovich': _fetkovich_model,
+    'darcy': _darcy_model,
+}
+
+
+def resolve_ipr_model(well_data, method=None):
+    """Resuelve los parámetros del IPR (método de `well_data` o el indicado)."""
+    method = (method or well_data.get('method', 'linear')).lower()
+    builder = _MODEL_BUILDERS.get(method, _linear_model)
+    return builder(well_data)
+
+
+def resolve_ipr_model_batch(method, pr, pi=5.0, pb=None, q_test=None, pwf_test=None, n_exponent=1.0):
+    """
+    Versión por lote de `resolve_ipr_model`: mismos criterios que los métodos
+    escalares, con parámetros como arreglos (NaN en q_test/pwf_test = sin prueba).
+
+    Returns:
+        IPRModel: Modelo con campos arreglo (forma común por broadcasting)
+    """
+    method = (method or 'linear').lower()
+    pr = np.asarray(pr, dtype=float)
+    pi = np.asarray(pi, dtype=float)
+    nan = np.full(np.broadcast(pr, pi).shape, np.nan)
+    q_test = nan if q_test is None else np.asarray(q_test, dtype=float)
+    pwf_test = nan if pwf_test is None else np.asarray(pwf_test, dtype=float)
+    has_test = np.isfinite(q_test) & np.isfinite(pwf_test)
+    q_t = np.where(has_test, q_test, 0.0)
+    pwf_t = np.where(has_test, pwf_test, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if method == 'vogel':
+            pb = pr * 0.8 if pb is None else np.asarray(pb, dtype=float)
+            saturated = pr <= pb
+
+            # Saturado
+            ratio = np.where(pr != 0, pwf_t / pr, 0.0)
+            productivity_ratio = 1 - 0.2 * ratio - 0.8 * (ratio ** 2)
+            q_max_test = np.where(productivity_ratio > 0, q_t / productivity_ratio, q_t * 2)
+            q_max_sat = np.where(has_test, q_max_test, pr * pi * 0.8)
+            j_sat = np.where(has_test & (pr - pwf_t > 0), q_t / (pr - pwf_t), pi)
+
+            # Compuesto
+            ratio_b = np.where(pb != 0, pwf_t / pb, 0.0)
+            denom = np.where(
+                pwf_t >= pb,
+                pr - pwf_t,
+                (pr - pb) + (pb / 1.8) * (1 - 0.2 * ratio_b - 0.8 * (ratio_b ** 2))
+            )
+            j_comp = np.where(has_test & (denom > 0), q_t / denom, np.nan)
+            j_comp = np.where(np.isfinite(j_comp) & (j_comp > 0), j_comp, pi)
+            pb_safe = np.where(pb > 0, pb, 1e-6)
+            q_max_comp = j_comp * (pr - pb) + (j_comp * pb_safe / 1.8)
+
+            return IPRModel(
+                method='vogel',
+                label='Vogel (lote)',
+                pr=pr,
+                q_max=np.maximum(np.where(saturated, q_max_sat, q_max_comp), 0),
+                j=np.where(saturated, j_sat, j_comp),
+                pb=pb,
+                saturated=saturated
+            )
+
+        if method == 'fetkovich':
+            n = np.asarray(n_exponent, dtype=float)
+            span = pr ** n - pwf_t ** n
+            has_c_test = has_test & (q_t != 0) & (pwf_t != 0)
+            c = np.where(has_c_test, np.where(span > 0, q_t / span, 0.001), pi / pr)
+            return IPRModel(method='fetkovich', label='Fetkovich (lote)', pr=pr, q_max=c * (pr ** n), c=c, n=n)
+
+    # linear (y darcy expresado como J constante)
+    return IPRModel(method='linear', label='Linear (lote)', pr=pr, q_max=pr * pi, j=pi * np.ones_like(pr))
+
+
+def ipr_curve_arrays(model, gradiente, n_points=50):
+    """
+    Evalúa la curva IPR sobre arreglos.
+
+    Linear discretiza el caudal (0..q_max) y corta en el primer Pwf = 0; el
+    resto discretiza Pwf de pr a 0.
 
-            if q < 0:
-                q = 0
+    Returns:
+        dict: Arreglos 'caudal', 'pwf' y 'nivel' (nivel relativo a pr)
+    """
+    steps = np.arange(n_points + 1)
+
+    if model.method == 'linear':
+        caudal = (model.q_max / n_points) * steps
+        pwf = model.pr - (caudal / model.j)
+        pwf = np.where(pwf < 0, 0.0, pwf)
+        zero = np.flatnonzero(pwf == 0)
+        if zero.size:
+            caudal = caudal[:zero[0] + 1]
+            pwf = pwf[:zero[0] + 1]
+    else:
+        pwf = model.pr * (1 - steps / n_points)
+        pwf = np.where(pwf < 0, 0.0, pwf)
+        caudal = model.flow(pwf)
+
+    if gradiente == 0:
+        nivel = np.zeros_like(pwf)
+    else:
+        nivel = (model.pr - pwf) / gradiente
 
-            nivel = pressure_to_level(pwf, pr, gradiente)
-            ipr_curve.append({
-                "caudal": round(q, 2),
-                "pwf": round(pwf, 2),
-                "nivel": round(nivel, 2)
-            })
+    return {'caudal': caudal, 'pwf': pwf, 'nivel': nivel}
 
-        q_vogel_aof = (j_value * pb_safe / 1.8)
-        q_max_output = q_bubble + q_vogel_aof
-        method_label = 'Vogel (Bifásico - Compuesta)'
 
-    q_max_output = max(q_max_output, 0)
+def calculate_ipr_arrays(well_data, fluid_state=None, model=None):
+    """Atajo: resuelve modelo y fluido y devuelve los arreglos de la curva IPR."""
+    model = model or resolve_ipr_model(well_data)
+    gradiente = resolve_fluid_state(well_data, fluid_state).gradiente_bar_m
+    arrays = ipr_curve_arrays(model, gradiente, well_data.get('n_points', 50))
+    arrays['model'] = model
+    return arrays
+
+
+def _curve_points(arrays):
+    """Adaptador de salida: arreglos -> lista de puntos redondeados."""
+    return [
+        {"caudal": round(q, 2), "pwf": round(pwf, 2), "nivel": round(nivel, 2)}
+        for q, pwf, nivel in zip(arrays['caudal'].tolist(), arrays['pwf'].tolist(), arrays['nivel'].tolist())
+    ]
+
+
+def calculate_ipr_linear(well_data, fluid_state=None, model=None):
+    """
+    IPR Lineal: Pwf = Pr - (Q / PI)
+    Válido para flujo monofásico sobre presión de burbuja.
+    UNIDADES: Pr(bar), PI(m³/d/bar), Q(m³/d)
+    """
+    model = model or _linear_model(well_data)
+    fluid = resolve_fluid_state(well_data, fluid_state)
+    arrays = ipr_curve_arrays(model, fluid.gradiente_bar_m, well_data.get('n_points', 50))
 
     return {
-        'method': method_label,
-        'curve': ipr_curve,
-        'q_max': round(q_max_output, 2),
+        'method': model.label,
+        'curve': _curve_points(arrays),
+        'q_max': round(model.q_max, 2),
         'parameters': {
-            'pr': pr,
-            'pb': pb,
-            'q_test': q_test,
-            'pwf_test': pwf_test,
-            'gradiente': round(gradiente, 5),
-            'grado_api': grado_api,
-            'agua_porcentaje': agua_porcentaje,
-            'productivity_index': round(productivity_index, 5)
+            'pi': model.j,
+            'pr': model.pr,
+            'gradiente': round(fluid.gradiente_bar_m, 5),
+            'grado_api': fluid.grado_api,
+            'agua_porcentaje': fluid.agua_porcentaje
         }
     }
 
 
-def calculate_ipr_fetkovich(well_data):
+def calculate_ipr_vogel(well_data, fluid_state=None, model=None):
+    """
+    IPR de Vogel compuesta (Standing) con soporte para reservorios saturados y sub-saturados.
+    UNIDADES: Pr(bar), Pb(bar), Q(m³/d)
+    """
+    model = model or _vogel_model(well_data)
+    fluid = resolve_fluid_state(well_data, fluid_state)
+    arrays = ipr_curve_arrays(model, fluid.gradiente_bar_m, well_data.get('n_points', 50))
+
+    return {
+        'method': model.label,
+        'curve': _curve_points(arrays),
+        'q_max': round(model.q_max, 2),
+        'parameters': {
+            'pr': model.pr,
+            'pb': model.pb,
+            'q_test': well_data.get('q_test', None),
+            'pwf_test': well_data.get('pwf_test', None),
+            'gradiente': round(fluid.gradiente_bar_m, 5),
+            'grado_api': fluid.grado_api,
+            'agua_porcentaje': fluid.agua_porcentaje,
+            'productivity_index': round(model.j, 5)
+        }
+    }
+
+
+def calculate_ipr_fetkovich(well_data, fluid_state=None, model=None):
     """
     IPR de Fetkovich: Q = C * (Pr^n - Pwf^n)
     Donde C y n son constantes empíricas.
     Válido para flujo en yacimientos con baja permeabilidad.
     UNIDADES: Pr(bar), Q(m³/d)
     """
-    pr = well_data.get('presion_reservorio', 150)  # bar
-    q_test = well_data.get('q_test', None)  # m³/d
-    pwf_test = well_data.get('pwf_test', None)  # bar
-    n = well_data.get('n_exponent', 1.0)  # Exponente (típicamente 0.5 a 1.0)
-    n_points = well_data.get('n_points', 50)
-    
-    # Parámetros del fluido
-    grado_api = well_data.get('grado_api', 30)  # °API
-    agua_porcentaje = well_data.get('agua_porcentaje', 0)  # %
-    gravedad_especifica_agua = well_data.get('gravedad_especifica_agua', 1.0)  # SG
-    
-    # Calcular gradiente del fluido
-    gradiente = calculate_fluid_gradient(grado_api, agua_porcentaje, gravedad_especifica_agua)  # bar/m
-    
-    # Calcular constante C de datos de prueba
-    if q_test and pwf_test:
-        c = q_test / ((pr ** n) - (pwf_test ** n)) if (pr ** n - pwf_test ** n) > 0 else 0.001
-    else:
-        # Estimación si no hay datos
-        pi_estimate = well_data.get('pi', 5.0)  # m³/d/bar
-        c = pi_estimate / pr
-    
-    ipr_curve = []
-    for i in range(n_points + 1):
-        pwf = pr * (1 - i / n_points)
-        
-        if pwf < 0:
-            pwf = 0
-        
-        # Ecuación de Fetkovich
-        q = c * ((pr ** n) - (pwf ** n))
-        
-        if q < 0:
-            q = 0
-        
-        # Calcular nivel de fluido
-        nivel = pressure_to_level(pwf, pr, gradiente)
-            
-        ipr_curve.append({
-            "caudal": round(q, 2), 
-            "pwf": round(pwf, 2),
-            "nivel": round(nivel, 2)
-        })
-    
-    q_max = c * (pr ** n)
-    
+    model = model or _fetkovich_model(well_data)
+    fluid = resolve_fluid_state(well_data, fluid_state)
+    arrays = ipr_curve_arrays(model, fluid.gradiente_bar_m, well_data.get('n_points', 50))
+
     return {
-        'method': 'Fetkovich (Empírico)',
-        'curve': ipr_curve,
-        'q_max': round(q_max, 2),
+        'method': model.label,
+        'curve': _curve_points(arrays),
+        'q_max': round(model.q_max, 2),
         'parameters': {
-            'c': c,
-            'n': n,
-            'pr': pr,
-            'q_test': q_test,
-            'pwf_test': pwf_test,
-            'gradiente': round(gradiente, 5),
-            'grado_api': grado_api,
-            'agua_porcentaje': agua_porcentaje
+            'c': model.c,
+            'n': model.n,
+            'pr': model.pr,
+            'q_test': well_data.get('q_test', None),
+            'pwf_test': well_data.get('pwf_test', None),
+            'gradiente': round(fluid.gradiente_bar_m, 5),
+            'grado_api': fluid.grado_api,
+            'agua_porcentaje': fluid.agua_porcentaje
         }
     }
 
 
-def calculate_ipr_darcy(well_data):
+def calculate_ipr_darcy(well_data, fluid_state=None, model=None):
     """
     IPR basado en Ecuación de Darcy (flujo radial estacionario):
     Q = (0.543 * k * h * (Pr - Pwf)) / (μ * Bo * (ln(re/rw) + S))
@@ -368,70 +537,26 @@ def calculate_ipr_darcy(well_data):
     UNIDADES: Q(m³/d), k(mD), h(m), re(m), rw(m), Pr(bar), μ(cp), Bo(m³/m³)
     Constante 0.543 para unidades métricas (vs 7.08 para campo)
     """
-    pr = well_data.get('presion_reservorio', 150)  # bar
-    k = well_data.get('permeabilidad', 100)  # mD
-    h = well_data.get('espesor', 15)  # m (equiv. ~50 ft)
-    re = well_data.get('radio_drenaje', 300)  # m (equiv. ~1000 ft)
-    rw = well_data.get('radio_pozo', 0.15)  # m (equiv. ~0.5 ft)
-    mu = well_data.get('viscosidad', 1.0)  # cp
-    bo = well_data.get('factor_volumen', 1.2)  # m³/m³
-    skin = well_data.get('skin', 0)
-    n_points = well_data.get('n_points', 50)
-    
-    # Parámetros del fluido
-    grado_api = well_data.get('grado_api', 30)  # °API
-    agua_porcentaje = well_data.get('agua_porcentaje', 0)  # %
-    gravedad_especifica_agua = well_data.get('gravedad_especifica_agua', 1.0)  # SG
-    
-    # Calcular gradiente del fluido
-    gradiente = calculate_fluid_gradient(grado_api, agua_porcentaje, gravedad_especifica_agua)  # bar/m
-    
-    # Constante de la ecuación de Darcy (sistema métrico)
-    # Q(m³/d) = 0.543 * k(mD) * h(m) * ΔP(bar) / [μ(cp) * Bo(m³/m³) * (ln(re/rw) + S)]
-    const = (0.543 * k * h) / (mu * bo * (math.log(re / rw) + skin))
-    
-    q_max = const * pr
-    
-    ipr_curve = []
-    for i in range(n_points + 1):
-        pwf = pr * (1 - i / n_points)
-        
-        if pwf < 0:
-            pwf = 0
-        
-        q = const * (pr - pwf)
-        
-        if q < 0:
-            q = 0
-        
-        # Calcular nivel de fluido
-        nivel = pressure_to_level(pwf, pr, gradiente)
-            
-        ipr_curve.append({
-            "caudal": round(q, 2), 
-            "pwf": round(pwf, 2),
-            "nivel": round(nivel, 2)
-        })
-    
-    # Calcular PI
-    pi = const
-    
+    model = model or _darcy_model(well_data)
+    fluid = resolve_fluid_state(well_data, fluid_state)
+    arrays = ipr_curve_arrays(model, fluid.gradiente_bar_m, well_data.get('n_points', 50))
+
     return {
-        'method': 'Darcy (Radial)',
-        'curve': ipr_curve,
-        'q_max': round(q_max, 2),
+        'method': model.label,
+        'curve': _curve_points(arrays),
+        'q_max': round(model.q_max, 2),
         'parameters': {
-            'pi': round(pi, 4),
-            'k': k,
-            'h': h,
-            're': re,
-            'rw': rw,
-            'mu': mu,
-            'bo': bo,
-            'skin': skin,
-            'gradiente': round(gradiente, 5),
-            'grado_api': grado_api,
-            'agua_porcentaje': agua_porcentaje
+            'pi': round(model.j, 4),
+            'k': well_data.get('permeabilidad', 100),
+            'h': well_data.get('espesor', 15),
+            're': well_data.get('radio_drenaje', 300),
+            'rw': well_data.get('radio_pozo', 0.15),
+            'mu': well_data.get('viscosidad', 1.0),
+            'bo': well_data.get('factor_volumen', 1.2),
+            'skin': well_data.get('skin', 0),
+            'gradiente': round(fluid.gradiente_bar_m, 5),
+            'grado_api': fluid.grado_api,
+            'agua_porcentaje': fluid.agua_porcentaje
         }
     }
 
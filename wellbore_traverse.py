@@ -0,0 +1,305 @@
+"""Traverse de presión segmentado para pozos desviados.
+
+Integra la presión a lo largo de la trayectoria del pozo (survey MD/TVD/
+inclinación) con diámetros de tubing por tramo (sartas combinadas tomadas
+de `tubing_catalog`). Todos los caudales de la curva de demanda se avanzan a
+la vez: un traverse de N segmentos es una sola operación sobre una matriz
+(segmentos × caudales), no N × caudales iteraciones en Python.
+
+Formatos de entrada en ``well_data``:
+
+- ``survey``: lista de estaciones ``{"md": m, "tvd": m}`` o
+  ``{"md": m, "inclinacion": grados}`` (ángulo promedio entre estaciones).
+- ``tubing_string``: tramos desde superficie hacia abajo
+  ``{"md_base": m, "tubing": 'Tbg 3-1/2"'}`` o ``{"md_base": m, "id_mm": 76.2}``;
+  opcionalmente ``rugosidad_mm`` o ``tubing_roughness`` por tramo.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+import friction_factor
+import tubing_catalog
+
+
+class TraverseError(ValueError):
+    """Error de validación de survey o sarta de tubing."""
+
+
+@dataclass(frozen=True)
+class WellboreSegments:
+    """Segmentos de cálculo desde superficie hasta la profundidad de la bomba."""
+
+    md_top: np.ndarray
+    md_base: np.ndarray
+    tvd_top: np.ndarray
+    tvd_base: np.ndarray
+    id_mm: np.ndarray
+    rugosidad_mm: np.ndarray
+
+    @property
+    def longitud_m(self) -> np.ndarray:
+        return self.md_base - self.md_top
+
+    @property
+    def delta_tvd_m(self) -> np.ndarray:
+        return self.tvd_base - self.tvd_top
+
+    @property
+    def profundidad_md(self) -> float:
+        return float(self.md_base[-1]) if self.md_base.size else 0.0
+
+    @property
+    def profundidad_tvd(self) -> float:
+        return float(self.tvd_base[-1]) if self.tvd_base.size else 0.0
+
+    def summary(self) -> List[Dict[str, float]]:
+        """Resumen por tramo (para la respuesta de la API)."""
+        return [
+            {
+                'md_top': round(float(a), 2),
+                'md_base': round(float(b), 2),
+                'tvd_top': round(float(c), 2),
+                'tvd_base': round(float(d), 2),
+                'id_mm': round(float(e), 2)
+            }
+            for a, b, c, d, e in zip(self.md_top, self.md_base, self.tvd_top, self.tvd_base, self.id_mm)
+        ]
+
+
+def _to_float(value: Any, name: str) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError) as exc:
+        raise TraverseError(f"El valor '{name}' debe ser numérico.") from exc
+
+
+def parse_survey(survey: Optional[Iterable[Dict[str, Any]]]) -> Optional[tuple]:
+    """
+    Normaliza el survey a arreglos (md, tvd) ordenados desde superficie.
+
+    Returns:
+        tuple | None: (md, tvd) como np.ndarray, o None si no hay survey
+    """
+    if not survey:
+        return None
+
+    stations = sorted(survey, key=lambda s: _to_float(s.get('md'), 'survey.md'))
+    md: List[float] = []
+    tvd: List[float] = []
+    prev_md, prev_tvd, prev_inc = 0.0, 0.0, 0.0
+
+    for station in stations:
+        md_value = _to_float(station.get('md'), 'survey.md')
+        if md_value < prev_md:
+            raise TraverseError('Las estaciones del survey deben tener MD creciente.')
+
+        if station.get('tvd') is not None:
+            tvd_value = _to_float(station.get('tvd'), 'survey.tvd')
+            inc_value = prev_inc
+        elif station.get('inclinacion') is not None:
+            inc_value = _to_float(station.get('inclinacion'), 'survey.inclinacion')
+            avg_inc = math.radians((prev_inc + inc_value) / 2.0)
+            tvd_value = prev_tvd + (md_value - prev_md) * math.cos(avg_inc)
+        else:
+            raise TraverseError("Cada estación del survey requiere 'tvd' o 'inclinacion'.")
+
+        if tvd_value - prev_tvd > (md_value - prev_md) + 1e-6:
+            raise TraverseError('El TVD no puede aumentar más que el MD entre estaciones.')
+
+        md.append(md_value)
+        tvd.append(tvd_value)
+        prev_md, prev_tvd, prev_inc = md_value, tvd_value, inc_value
+
+    if md[0] > 0:
+        md.insert(0, 0.0)
+        tvd.insert(0, 0.0)
+
+    return np.asarray(md, dtype=float), np.asarray(tvd, dtype=float)
+
+
+def _resolve_tubing_section(section: Dict[str, Any], default_roughness_mm: float) -> tuple:
+    if section.get('id_mm') is not None:
+        id_mm = _to_float(section.get('id_mm'), 'tubing_string.id_mm')
+    else:
+        nombre = section.get('tubing') or section.get('nombre')
+        tubing = tubing_catalog.get_tubing_by_name(nombre) if nombre else None
+        if not tubing:
+            raise TraverseError(f"Tubing '{nombre}' no encontrado en el catálogo.")
+        id_mm = float(tubing['id_mm'])
+
+    if id_mm <= 0:
+        raise TraverseError('El diámetro interno del tubing debe ser mayor a cero.')
+
+    if section.get('rugosidad_mm') is not None:
+        roughness = _to_float(section.get('rugosidad_mm'), 'tubing_string.rugosidad_mm')
+    elif section.get('tubing_roughness') is not None:
+        roughness = tubing_catalog.get_roughness_options().get(section['tubing_roughness'], default_roughness_mm)
+    else:
+        roughness = default_roughness_mm
+
+    return id_mm, roughness
+
+
+def build_segments(
+    profundidad_md: float,
+    survey: Optional[Iterable[Dict[str, Any]]] = None,
+    tubing_string: Optional[Sequence[Dict[str, Any]]] = None,
+    default_id_mm: float = 62.0,
+    default_roughness_mm: float = 0.046,
+    max_segment_m: Optional[float] = None
+) -> WellboreSegments:
+    """
+    Construye los segmentos de cálculo entre superficie y la bomba.
+
+    Los nodos son la unión de estaciones del survey, cambios de sarta y la
+    profundidad de la bomba; ``max_segment_m`` subdivide tramos largos.
+    """
+    profundidad_md = _to_float(profundidad_md, 'profundidad_intake')
+    if profundidad_md <= 0:
+        raise TraverseError('La profundidad de la bomba debe ser mayor a cero.')
+
+    parsed = parse_survey(survey)
+    if parsed is None:
+        survey_md = np.array([0.0, profundidad_md])
+        survey_tvd = survey_md.copy()
+    else:
+        survey_md, survey_tvd = parsed
+        if survey_md[-1] < profundidad_md:
+            # Extrapolar con la última inclinación conocida
+            if survey_md.size >= 2 and survey_md[-1] > survey_md[-2]:
+                slope = (survey_tvd[-1] - survey_tvd[-2]) / (survey_md[-1] - survey_md[-2])
+            else:
+                slope = 1.0
+            survey_tvd = np.append(survey_tvd, survey_tvd[-1] + slope * (profundidad_md - survey_md[-1]))
+            survey_md = np.append(survey_md, profundidad_md)
+
+    sections = []
+    for section in tubing_string or []:
+        md_base = _to_float(section.get('md_base'), 'tubing_string.md_base')
+        sections.append((md_base, *_resolve_tubing_section(section, default_roughness_mm)))
+    sections.sort(key=lambda item: item[0])
+
+    nodes = set(survey_md[survey_md < profundidad_md].tolist())
+    nodes.update(md for md, _, _ in sections if 0 < md < profundidad_md)
+    nodes.update((0.0, profundidad_md))
+    nodes = np.array(sorted(nodes))
+
+    if max_segment_m and max_segment_m > 0:
+        refined = [nodes[:1]]
+        for top, base in zip(nodes[:-1], nodes[1:]):
+            n_sub = max(int(math.ceil((base - top) / max_segment_m)), 1)
+            refined.append(np.linspace(top, base, n_sub + 1)[1:])
+        nodes = np.concatenate(refined)
+
+    md_top, md_base = nodes[:-1], nodes[1:]
+    tvd_nodes = np.interp(nodes, survey_md, survey_tvd)
+
+    id_mm = np.full(md_top.shape, float(default_id_mm))
+    roughness = np.full(md_top.shape, float(default_roughness_mm))
+    if sections:
+        bases = np.array([s[0] for s in sections])
+        midpoints = (md_top + md_base) / 2.0
+        idx = np.minimum(np.searchsorted(bases, midpoints), len(sections) - 1)
+        id_mm = np.array([sections[i][1] for i in idx], dtype=float)
+        roughness = np.array([sections[i][2] for i in idx], dtype=float)
+
+    return WellboreSegments(
+        md_top=md_top,
+        md_base=md_base,
+        tvd_top=tvd_nodes[:-1],
+        tvd_base=tvd_nodes[1:],
+        id_mm=id_mm,
+        rugosidad_mm=roughness
+    )
+
+
+def segments_from_well_data(well_data: Dict[str, Any], max_segment_m: Optional[float] = None) -> Optional[WellboreSegments]:
+    """Segmentos a partir de ``well_data``; None si el pozo no define survey ni sarta."""
+    survey = well_data.get('survey')
+    tubing_string = well_data.get('tubing_string')
+    if not survey and not tubing_string:
+        return None
+
+    return build_segments(
+        well_data.get('profundidad_intake', 1500),
+        survey=survey,
+        tubing_string=tubing_string,
+        default_id_mm=well_data.get('tubing_id_mm', 62.0),
+        default_roughness_mm=well_data.get('tubing_roughness_mm', 0.046),
+        max_segment_m=max_segment_m
+    )
+
+
+def friction_gradient_matrix(
+    segments: WellboreSegments,
+    caudales_m3d,
+    densidad_kg_m3,
+    viscosidad_cp,
+    modelo_friccion: Optional[str] = None
+) -> np.ndarray:
+    """
+    Pérdida por fricción de cada segmento para cada caudal (bar), forma (S, N).
+
+    ``densidad_kg_m3`` y ``viscosidad_cp`` pueden ser escalares o matrices
+    (S, N) cuando las propiedades varían con la presión (flujo multifásico).
+    """
+    q = np.asarray(caudales_m3d, dtype=float)[np.newaxis, :]
+    d_m = (segments.id_mm / 1000.0)[:, np.newaxis]
+    area_m2 = math.pi * d_m ** 2 / 4.0
+    velocidad = (q / 86400.0) / area_m2
+
+    mu_pas = np.asarray(viscosidad_cp, dtype=float) * 0.001
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reynolds = np.where(mu_pas > 0, densidad_kg_m3 * velocidad * d_m / mu_pas, 0.0)
+    reynolds = np.broadcast_to(reynolds, velocidad.shape)
+
+    # Un lookup vectorizado por combinación (ID, rugosidad) distinta de la sarta
+    f = np.empty(velocidad.shape)
+    combos = np.stack([segments.id_mm, segments.rugosidad_mm], axis=1)
+    for id_mm, roughness in np.unique(combos, axis=0):
+        mask = (segments.id_mm == id_mm) & (segments.rugosidad_mm == roughness)
+        f[mask] = friction_factor.darcy_friction_factor(reynolds[mask], id_mm, roughness, modelo_friccion)
+
+    longitud = segments.longitud_m[:, np.newaxis]
+    delta_p_pa = f * (longitud / d_m) * (densidad_kg_m3 * velocidad ** 2 / 2.0)
+    return np.where(q > 0, delta_p_pa / 100000.0, 0.0)
+
+
+def single_phase_traverse(
+    segments: WellboreSegments,
+    caudales_m3d,
+    densidad_kg_m3: float,
+    viscosidad_cp: float,
+    gradiente_bar_m: float,
+    presion_superficie_bar: float = 0.0,
+    modelo_friccion: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Traverse monofásico desde el cabezal hasta la descarga de la bomba.
+
+    Returns:
+        dict: 'presion' (S+1, N) por nodo y caudal, 'friccion_bar' (N,),
+              'hidrostatica_bar' (escalar), 'md' y 'tvd' de los nodos
+    """
+    dp_friccion = friction_gradient_matrix(segments, caudales_m3d, densidad_kg_m3, viscosidad_cp, modelo_friccion)
+    dp_hidrostatica = (gradiente_bar_m * segments.delta_tvd_m)[:, np.newaxis]
+
+    n_flows = dp_friccion.shape[1]
+    presion = np.empty((segments.md_top.size + 1, n_flows))
+    presion[0] = presion_superficie_bar
+    np.cumsum(dp_hidrostatica + dp_friccion, axis=0, out=presion[1:])
+    presion[1:] += presion_superficie_bar
+
+    return {
+        'presion': presion,
+        'friccion_bar': dp_friccion.sum(axis=0),
+        'hidrostatica_bar': float(dp_hidrostatica.sum()),
+        'md': np.append(segments.md_top, segments.profundidad_md),
+        'tvd': np.append(segments.tvd_top, segments.profundidad_tvd)
+    }